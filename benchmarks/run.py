@@ -0,0 +1,183 @@
+from benchmarks.workloads import WORKLOADS
+from classes.python.input_reader import InputReader
+from classes.python.ipp_parser import IPPParser
+from classes.python.profiler import CallTreeProfiler
+from classes.python.program import Program
+from classes.python.transpiler import Transpiler
+import argparse
+import io
+import json
+import statistics
+import sys
+import time
+
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+ENGINES = ('interpret', 'python')
+
+
+def count_instructions(analysis: tuple, program_input: bytes) -> int:
+    """
+    Count instructions executed by analyzed program
+    :param analysis: result of Program.get_analysis
+    :param program_input: program input bytes
+    :return: number of executed instructions
+    """
+    program = _prepare(analysis, program_input)
+    call_profiler = CallTreeProfiler()
+    program.interpret(call_profiler=call_profiler)
+    return call_profiler.functions[CallTreeProfiler.MAIN_NAME]['inclusive_count']
+
+
+def _prepare(analysis: tuple, program_input: bytes) -> Program:
+    """
+    Create fresh program from analysis with given input and discarded output
+    :param analysis: result of Program.get_analysis
+    :param program_input: program input bytes
+    :return: Program ready for interpretation
+    """
+    program = Program.from_analysis(analysis)
+    program.set_input(InputReader(io.BytesIO(program_input)))
+    program.set_output(io.StringIO())
+    return program
+
+
+def _stats(samples: list) -> dict:
+    """
+    Basic statistics of measured times
+    :param samples: times in seconds
+    :return: dictionary with min, median, mean and stdev keys
+    """
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.mean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0
+    }
+
+
+def run_workload(workload, engine: str, repeat: int, optimize: bool) -> dict:
+    """
+    Measure workload, program is loaded and analyzed once per repetition and then run
+    :param workload: Workload instance
+    :param engine: 'interpret' or 'python'
+    :param repeat: number of repetitions
+    :param optimize: analyze program with optimizations
+    :return: dictionary with measured statistics
+    """
+    xml = workload.xml()
+    program_input = workload.input()
+    parser = IPPParser()
+    load_times, analyze_times, compile_times, run_times = list(), list(), list(), list()
+    analysis = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        program = Program.from_instructions(parser.load_from_string(xml))
+        load_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        program.analyze(optimize)
+        analyze_times.append(time.perf_counter() - start)
+        analysis = program.get_analysis()
+
+        program = _prepare(analysis, program_input)
+        run = program.interpret
+        if engine == 'python':
+            start = time.perf_counter()
+            run = Transpiler(program).compile()
+            compile_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        run()
+        run_times.append(time.perf_counter() - start)
+
+    instructions = count_instructions(analysis, program_input)
+    run_stats = _stats(run_times)
+    return {
+        'workload': workload.name,
+        'engine': engine,
+        'load': _stats(load_times),
+        'analyze': _stats(analyze_times),
+        'compile': _stats(compile_times) if compile_times else None,
+        'run': run_stats,
+        'instructions': instructions,
+        'ips': instructions / run_stats['median'] if run_stats['median'] > 0 else 0.0
+    }
+
+
+def write_table(results: list, stream, baseline: dict = None):
+    """
+    Write results as text table, times are medians in seconds
+    :param results: list of dictionaries returned by run_workload
+    :param stream: text stream
+    :param baseline: previous results by (workload, engine) key, ips change against them is shown if given
+    """
+    header = '{:<10} {:<9} {:>9} {:>9} {:>9} {:>9} {:>8} {:>12} {:>12}'.format(
+        'workload', 'engine', 'load', 'analyze', 'compile', 'run', 'stdev %', 'instructions', 'ips')
+    stream.write(header + (' {:>8}\n'.format('change') if baseline is not None else '\n'))
+    for result in results:
+        run = result['run']
+        compile_time = result['compile']['median'] if result['compile'] is not None else 0.0
+        stream.write('{:<10} {:<9} {:>9.4f} {:>9.4f} {:>9.4f} {:>9.4f} {:>8.1f} {:>12} {:>12.0f}'.format(
+            result['workload'], result['engine'], result['load']['median'], result['analyze']['median'],
+            compile_time, run['median'], 100 * run['stdev'] / run['mean'] if run['mean'] > 0 else 0.0,
+            result['instructions'], result['ips']))
+        if baseline is not None:
+            previous = baseline.get((result['workload'], result['engine']))
+            if previous is not None and previous['ips'] > 0:
+                stream.write(' {:>+7.1f}%'.format(100 * (result['ips'] / previous['ips'] - 1)))
+            else:
+                stream.write(' {:>8}'.format('-'))
+        stream.write('\n')
+
+
+def main(argv: list = None) -> int:
+    """
+    Run benchmarks given by command line arguments
+    :param argv: arguments without program name
+    :return: exit code
+    """
+    names = [workload.name for workload in WORKLOADS]
+    argparser = argparse.ArgumentParser(
+        prog='python -m benchmarks.run',
+        description='Measures load, analysis and run time and instructions per second of IPPcode18 workloads.')
+    argparser.add_argument('workloads', nargs='*', metavar='workload',
+                           help='Workloads to run ({}), all by default'.format(', '.join(names)))
+    argparser.add_argument('--engine', action='append', choices=ENGINES,
+                           help='Engine to measure, can be repeated (interpret by default)')
+    argparser.add_argument('--repeat', type=int, default=5, help='Number of repetitions (5 by default)')
+    argparser.add_argument('--optimize', action='store_true', help='Analyze programs with optimizations')
+    argparser.add_argument('--json', help='File to write results as JSON to')
+    argparser.add_argument('--baseline', help='JSON file with previous results to compare instructions per second with')
+    args = argparser.parse_args(argv)
+
+    unknown = [name for name in args.workloads if name not in names]
+    if unknown or args.repeat < 1:
+        argparser.error('unknown workload {}'.format(unknown[0]) if unknown else 'repeat has to be positive')
+
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = {(result['workload'], result['engine']): result for result in json.load(file)['results']}
+
+    results = list()
+    for workload in WORKLOADS:
+        if args.workloads and workload.name not in args.workloads:
+            continue
+        for engine in args.engine or ['interpret']:
+            results.append(run_workload(workload, engine, args.repeat, args.optimize))
+
+    write_table(results, sys.stdout, baseline)
+    if args.json is not None:
+        with open(args.json, 'w') as file:
+            json.dump({'python': sys.version.split()[0], 'optimize': args.optimize, 'repeat': args.repeat,
+                       'results': results}, file, indent=2)
+            file.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
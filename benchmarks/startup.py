@@ -0,0 +1,176 @@
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+INTERPRET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'interpret.py')
+
+# Smallest program, its run time is negligible compared to interpreter startup
+SOURCE = ('<?xml version="1.0" encoding="UTF-8"?>\n<program language="IPPcode18">\n'
+          '<instruction order="1" opcode="WRITE"><arg1 type="string">ok</arg1></instruction>\n</program>\n')
+
+# Modules no run of interpret.py needs, their import on startup is a regression
+NEVER_IMPORTED = ('argparse', 'subprocess', 'socket', 'json')
+
+
+class Scenario:
+    """
+    Interpreter invocation measured from process start to its exit
+    """
+    def __init__(self, name: str, args: list, forbidden: tuple = ()):
+        """
+        Initialize scenario
+        :param name: scenario name
+        :param args: interpret.py arguments, {source} and {cache} are replaced by file paths
+        :param forbidden: modules which must not be imported in addition to NEVER_IMPORTED
+        """
+        self.name = name
+        self.args = args
+        self.forbidden = NEVER_IMPORTED + forbidden
+
+    def command(self, source: str, cache: str) -> list:
+        """
+        Get command running the scenario
+        :param source: XML source file path
+        :param cache: cache directory path
+        :return: command arguments
+        """
+        return [sys.executable, INTERPRET] + [arg.format(source=source, cache=cache) for arg in self.args]
+
+
+SCENARIOS = [
+    Scenario('help', ['--help'], ('classes.python.program', 'xml.etree.ElementTree')),
+    Scenario('bad-args', ['--unknown'], ('classes.python.program', 'xml.etree.ElementTree')),
+    Scenario('cached', ['--source={source}', '--cache-dir={cache}'],
+             ('xml.etree.ElementTree', 'classes.python.ipp_parser', 'classes.python.type_inference',
+              'classes.python.optimizer', 'classes.python.peephole', 'classes.python.transpiler')),
+    Scenario('no-cache', ['--source={source}', '--no-cache'], ('classes.python.transpiler', 'hashlib'))
+]
+
+
+def imported_modules(stderr: str) -> dict:
+    """
+    Parse output of -X importtime
+    :param stderr: standard error output of the process
+    :return: dictionary of module name to its self import time in microseconds
+    """
+    modules = dict()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_time, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(self_time)
+    return modules
+
+
+def run_scenario(scenario: Scenario, source: str, cache: str, repeat: int) -> dict:
+    """
+    Measure scenario, the first run is a warm-up which fills the cache and is not measured
+    :param scenario: Scenario instance
+    :param source: XML source file path
+    :param cache: cache directory path
+    :param repeat: number of measured runs
+    :return: dictionary with wall times, import statistics and forbidden imported modules
+    """
+    command = scenario.command(source, cache)
+    subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    times = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+
+    process = subprocess.run([command[0], '-X', 'importtime'] + command[1:], stdout=subprocess.DEVNULL,
+                             stderr=subprocess.PIPE, universal_newlines=True)
+    modules = imported_modules(process.stderr)
+    return {
+        'scenario': scenario.name,
+        'wall': {'min': min(times), 'median': statistics.median(times)},
+        'modules': len(modules),
+        'import_time': sum(modules.values()) / 1e6,
+        'forbidden': sorted(name for name in scenario.forbidden if name in modules)
+    }
+
+
+def write_table(results: list, stream, baseline: dict = None):
+    """
+    Write results as text table, times are in milliseconds
+    :param results: list of dictionaries returned by run_scenario
+    :param stream: text stream
+    :param baseline: previous results by scenario name, median wall time change is shown if given
+    """
+    stream.write('{:<10} {:>8} {:>8} {:>8} {:>8}'.format('scenario', 'min', 'median', 'imports', 'modules'))
+    stream.write(' {:>8}\n'.format('change') if baseline is not None else '\n')
+    for result in results:
+        stream.write('{:<10} {:>8.1f} {:>8.1f} {:>8.1f} {:>8}'.format(
+            result['scenario'], 1000 * result['wall']['min'], 1000 * result['wall']['median'],
+            1000 * result['import_time'], result['modules']))
+        if baseline is not None:
+            previous = baseline.get(result['scenario'])
+            if previous is not None:
+                stream.write(' {:>+7.1f}%'.format(100 * (result['wall']['median'] / previous['wall']['median'] - 1)))
+            else:
+                stream.write(' {:>8}'.format('-'))
+        stream.write('\n')
+    for result in results:
+        if result['forbidden']:
+            stream.write('{}: imported {}\n'.format(result['scenario'], ', '.join(result['forbidden'])))
+
+
+def main(argv: list = None) -> int:
+    """
+    Run startup benchmarks given by command line arguments
+    :param argv: arguments without program name
+    :return: exit code, 1 if some scenario imported forbidden module
+    """
+    names = [scenario.name for scenario in SCENARIOS]
+    argparser = argparse.ArgumentParser(
+        prog='python -m benchmarks.startup',
+        description='Measures wall time and imports of interpret.py from process start to exit.')
+    argparser.add_argument('scenarios', nargs='*', metavar='scenario',
+                           help='Scenarios to run ({}), all by default'.format(', '.join(names)))
+    argparser.add_argument('--repeat', type=int, default=20, help='Number of measured runs (20 by default)')
+    argparser.add_argument('--json', help='File to write results as JSON to')
+    argparser.add_argument('--baseline', help='JSON file with previous results to compare wall time with')
+    args = argparser.parse_args(argv)
+
+    unknown = [name for name in args.scenarios if name not in names]
+    if unknown or args.repeat < 1:
+        argparser.error('unknown scenario {}'.format(unknown[0]) if unknown else 'repeat has to be positive')
+
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = {result['scenario']: result for result in json.load(file)['results']}
+
+    directory = tempfile.mkdtemp()
+    try:
+        source = os.path.join(directory, 'source.xml')
+        with open(source, 'w') as file:
+            file.write(SOURCE)
+        results = [run_scenario(scenario, source, os.path.join(directory, 'cache'), args.repeat)
+                   for scenario in SCENARIOS if not args.scenarios or scenario.name in args.scenarios]
+    finally:
+        shutil.rmtree(directory)
+
+    write_table(results, sys.stdout, baseline)
+    if args.json is not None:
+        with open(args.json, 'w') as file:
+            json.dump({'python': sys.version.split()[0], 'repeat': args.repeat, 'results': results}, file, indent=2)
+            file.write('\n')
+    return 1 if any(result['forbidden'] for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
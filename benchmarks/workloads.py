@@ -0,0 +1,106 @@
+import os
+
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+WORKLOAD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'workloads')
+
+
+class Workload:
+    """
+    Benchmark workload, XML source of IPPcode18 program with optional input
+    """
+    def __init__(self, name: str, description: str, xml: callable, program_input: callable = None):
+        """
+        Initialize workload
+        :param name: workload name
+        :param description: short description
+        :param xml: function returning XML source bytes
+        :param program_input: function returning program input bytes, None if program reads nothing
+        """
+        self.name = name
+        self.description = description
+        self._xml = xml
+        self._input = program_input
+
+    def xml(self) -> bytes:
+        """
+        Get XML source of workload program
+        :return: XML bytes
+        """
+        return self._xml()
+
+    def input(self) -> bytes:
+        """
+        Get program input
+        :return: input bytes
+        """
+        return self._input() if self._input is not None else b''
+
+
+def _file(name: str) -> callable:
+    """
+    Get function reading workload XML file
+    :param name: file name in workload directory
+    :return: function returning file content
+    """
+    def read():
+        with open(os.path.join(WORKLOAD_DIR, name), 'rb') as file:
+            return file.read()
+    return read
+
+
+def io_input(lines: int = 20000) -> bytes:
+    """
+    Generate input of io workload, pairs of number and text lines
+    :param lines: number of pairs
+    :return: input bytes
+    """
+    return ''.join('{}\nline{}\n'.format(i * 7 % 1000, i) for i in range(lines)).encode()
+
+
+def large_program(blocks: int = 10000, variables: int = 50) -> bytes:
+    """
+    Generate large straight program of labeled blocks for measuring load and analysis,
+    each block computes with one of global variables and conditionally jumps to the next block
+    :param blocks: number of blocks, block has 6 instructions
+    :param variables: number of global variables
+    :return: XML bytes
+    """
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<program language="IPPcode18">\n']
+    order = 0
+    instruction = '    <instruction order="{}" opcode="{}">\n{}    </instruction>\n'
+    arg = '        <arg{} type="{}">{}</arg{}>\n'
+
+    def add(opcode, *args):
+        nonlocal order
+        order += 1
+        parts.append(instruction.format(order, opcode, ''.join(
+            arg.format(i, arg_type, value, i) for i, (arg_type, value) in enumerate(args, 1))))
+
+    add('DEFVAR', ('var', 'GF@c'))
+    for i in range(variables):
+        add('DEFVAR', ('var', 'GF@v{}'.format(i)))
+    for i in range(blocks):
+        var = 'GF@v{}'.format(i % variables)
+        add('LABEL', ('label', 'b{}'.format(i)))
+        add('MOVE', ('var', var), ('int', i))
+        add('ADD', ('var', var), ('var', var), ('int', 1))
+        add('MUL', ('var', var), ('var', var), ('int', 3))
+        add('LT', ('var', 'GF@c'), ('var', var), ('int', 0))
+        add('JUMPIFEQ', ('label', 'b{}'.format(i + 1)), ('var', 'GF@c'), ('bool', 'false'))
+    add('LABEL', ('label', 'b{}'.format(blocks)))
+    parts.append('</program>\n')
+    return ''.join(parts).encode()
+
+
+WORKLOADS = [
+    Workload('loop', 'tight integer loop', _file('loop.xml')),
+    Workload('recursion', 'recursive CALL/RETURN with PUSHFRAME and POPFRAME', _file('recursion.xml')),
+    Workload('strings', 'string building with CONCAT and rewriting with SETCHAR', _file('strings.xml')),
+    Workload('stack', 'data stack heavy PUSHS/POPS', _file('stack.xml')),
+    Workload('io', 'READ/WRITE heavy I/O', _file('io.xml'), io_input),
+    Workload('large', 'large program, dominated by load and analysis', large_program)
+]
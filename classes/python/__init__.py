@@ -1,3 +1,17 @@
-from .program import Program
-from .instruction import Instruction
+__version__ = "1.4.0"
 
+import sys
+
+if sys.version_info >= (3, 7):
+    # Submodules are imported on first access, so scripts importing only a part of the package start faster
+    def __getattr__(name: str):
+        if name == 'Program':
+            from .program import Program
+            return Program
+        if name == 'Instruction':
+            from .instruction import Instruction
+            return Instruction
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+else:
+    from .program import Program
+    from .instruction import Instruction
@@ -1,6 +1,5 @@
 from classes.python.frame import Frame
 from classes.python.exceptions import InternalError, OperandTypeError, MissingValue, UndefinedVar
-from copy import copy
 import re
 
 __author__ = "Martin Omacht"
@@ -12,7 +11,7 @@ class Arg:
     """
     Class representing instruction argument
     """
-    _esc_seq_re = None  # Compiled regex for escape sequences
+    _esc_seq_re = re.compile(r"\\(\d{3})")  # Compiled regex for escape sequences
 
     def __init__(self, arg_type: str, value: str):
         """
@@ -20,15 +19,15 @@ class Arg:
         :param arg_type: argument type
         :param value: value in string
         """
-        if Arg._esc_seq_re is None:  # Compile regex the first time
-            Arg._esc_seq_re = re.compile(r"(?<=\\)\d{3}")
-
         # Convert value based on type
         self.type = arg_type
         if arg_type == 'var':
-            parts = value.split('@')
-            self.frame = Frame.str_to_frame(parts[0])
-            self.value = parts[1]
+            frame, _, self.value = value.partition('@')
+            self.frame = Frame.str_to_frame(frame)
+            self.slot = None  # Frame slot, resolved by Program.analyze
+        elif arg_type == 'label':
+            self.value = value
+            self.target = None  # Label address, resolved by Program.analyze
         elif arg_type == 'int':
             self.value = int(value)
         elif arg_type == 'bool':
@@ -37,7 +36,7 @@ class Arg:
             else:
                 self.value = False
         elif arg_type == 'string':
-            self.value = self._convert_escapes(value)
+            self.value = self._convert_escapes(value) if '\\' in value else value
         else:
             self.value = value
 
@@ -47,14 +46,7 @@ class Arg:
         :param string: string to convert
         :return: converted string
         """
-        matches = self._esc_seq_re.findall(string)
-        converted = dict()
-        for match in matches:
-            converted[match] = chr(int(match))
-
-        for seq, char in converted.items():
-            string = string.replace("\\" + seq, char)
-        return string
+        return self._esc_seq_re.sub(lambda match: chr(int(match.group(1))), string)
 
     def get_data_type(self, context):
         """
@@ -62,8 +54,8 @@ class Arg:
         :param context: Program context
         :return: type string or empty string if type is None
         """
-        if self.is_var():
-            t = context.get_var(self.frame, self.value).type
+        if self.type == 'var':
+            t = context.get_var(self).type
             if t is None:
                 return ''
             return t
@@ -79,24 +71,29 @@ class Arg:
         :param value: value to set (Arg or int, bool, str)
         """
         assert self.is_var()
-        frame = context.get_frame(self.frame)
-        if self.value not in frame:
+        try:
+            var = context.get_frame(self.frame)[self.slot]
+        except IndexError:  # Local frames grow on definition of variable
+            var = None
+        if var is None:
             raise UndefinedVar("Pokus o zápis do nedefinované proměnné")
-        
+
         if type(value) is Arg:
             if value.type == 'var':
-                frame[self.value] = copy(context.get_var(value.frame, value.value))
+                src = context.get_var(value)
+                var.value = src.value
+                var.type = src.type
             else:
-                frame[self.value].value = value.value
-                frame[self.value].type = value.type
+                var.value = value.value
+                var.type = value.type
         else:
-            frame[self.value].value = value
+            var.value = value
             if type(value) is int:
-                frame[self.value].type = 'int'
+                var.type = 'int'
             elif type(value) is bool:
-                frame[self.value].type = 'bool'
+                var.type = 'bool'
             elif type(value) is str:
-                frame[self.value].type = 'string'
+                var.type = 'string'
             else:
                 raise InternalError("Neznámý typ {}".format(type(value)))
 
@@ -106,8 +103,8 @@ class Arg:
         :param context: Program context
         :return: argument value
         """
-        if self.is_var():
-            return context.get_var(self.frame, self.value).value
+        if self.type == 'var':
+            return context.get_var(self).value
         else:
             return self.value
 
@@ -145,9 +142,10 @@ class ArgType:
         :param context: Program context
         :param arg: instruction argument
         """
-        ArgType._check_if_initialized(context, arg)
-        if arg.get_data_type(context) != 'int':
-            ArgType._raise_type_error(context, 'int', arg.get_data_type(context))
+        data_type = arg.get_data_type(context)
+        ArgType._check_if_initialized(data_type)
+        if data_type != 'int':
+            ArgType._raise_type_error(context, 'int', data_type)
 
     @staticmethod
     def arg_bool(context, arg: Arg):
@@ -156,9 +154,10 @@ class ArgType:
         :param context: Program context
         :param arg: instruction argument
         """
-        ArgType._check_if_initialized(context, arg)
-        if arg.get_data_type(context) != 'bool':
-            ArgType._raise_type_error(context, 'bool', arg.get_data_type(context))
+        data_type = arg.get_data_type(context)
+        ArgType._check_if_initialized(data_type)
+        if data_type != 'bool':
+            ArgType._raise_type_error(context, 'bool', data_type)
 
     @staticmethod
     def arg_string(context, arg: Arg):
@@ -167,9 +166,10 @@ class ArgType:
         :param context: Program context
         :param arg: instruction argument
         """
-        ArgType._check_if_initialized(context, arg)
-        if arg.get_data_type(context) != 'string':
-            ArgType._raise_type_error(context, 'string', arg.get_data_type(context))
+        data_type = arg.get_data_type(context)
+        ArgType._check_if_initialized(data_type)
+        if data_type != 'string':
+            ArgType._raise_type_error(context, 'string', data_type)
 
     @staticmethod
     def arg_type(context, arg: Arg):
@@ -208,9 +208,10 @@ class ArgType:
         :param context: Program context
         :param arg: instruction argument
         """
-        ArgType._check_if_initialized(context, arg)
-        if arg.get_data_type(context) not in ['int', 'bool', 'string']:
-            ArgType._raise_type_error(context, '[int, bool, string]', arg.get_data_type(context))
+        data_type = arg.get_data_type(context)
+        ArgType._check_if_initialized(data_type)
+        if data_type not in ('int', 'bool', 'string'):
+            ArgType._raise_type_error(context, '[int, bool, string]', data_type)
 
     @staticmethod
     def arg_dest_or_any(context, arg: Arg):
@@ -237,11 +238,38 @@ class ArgType:
         )
 
     @staticmethod
-    def _check_if_initialized(context, arg: Arg):
+    def _check_if_initialized(data_type: str):
         """
-        Check if given argument is initialized, raises MissingValue otherwise
-        :param context: Program context
-        :param arg: instruction argument
+        Check if argument with given data type is initialized, raises MissingValue otherwise
+        :param data_type: argument data type
         """
-        if arg.get_data_type(context) == '':
+        if data_type == '':
             raise MissingValue("Pokus o čtení neinicializované proměnné")
+
+    @staticmethod
+    def is_statically_valid(checker, arg: Arg) -> bool:
+        """
+        Check if given argument checker always passes for given argument, regardless of program state
+        :param checker: ArgType checking method
+        :param arg: instruction argument
+        :return: True if check can be left out at runtime, False otherwise
+        """
+        if arg.is_var() and checker in ArgType.VALUE_CHECKERS:
+            return False
+        return arg.type in ArgType.ACCEPTED_TYPES[checker]
+
+
+# Checkers which depend on variable contents
+ArgType.VALUE_CHECKERS = (ArgType.arg_int, ArgType.arg_bool, ArgType.arg_string, ArgType.arg_any)
+
+# Argument types accepted by each checker
+ArgType.ACCEPTED_TYPES = {
+    ArgType.arg_int: ('int',),
+    ArgType.arg_bool: ('bool',),
+    ArgType.arg_string: ('string',),
+    ArgType.arg_any: ('int', 'bool', 'string'),
+    ArgType.arg_type: ('type',),
+    ArgType.arg_label: ('label',),
+    ArgType.arg_dest: ('var',),
+    ArgType.arg_dest_or_any: ('var', 'int', 'bool', 'string')
+}
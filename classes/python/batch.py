@@ -0,0 +1,232 @@
+from classes.python.exceptions import ApplicationError
+from classes.python.exit_codes import EXIT_SUCCESS, INPUT_FILE_ERROR
+from classes.python.ipp_parser import IPPParser
+from classes.python.runner import RunResult, analyze, execute
+import json
+import os
+
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+class BatchJob:
+    """
+    Job of batch manifest, program source with optional input and expected results
+    """
+    def __init__(self, source: str, input_file: str = None, expected: str = None, rc: int = None):
+        """
+        Initialize job
+        :param source: file with XML source code
+        :param input_file: file with program input, empty input if None
+        :param expected: file with expected program output, output is not checked if None
+        :param rc: expected exit code, EXIT_SUCCESS if None and expected output is given
+        """
+        self.source = source
+        self.input_file = input_file
+        self.expected = expected
+        self.rc = rc if rc is not None or expected is None else EXIT_SUCCESS
+
+    def check(self, result: RunResult):
+        """
+        Check run result against expectations, output is checked only if the expected exit code is EXIT_SUCCESS
+        :param result: run result
+        :return: None if job has no expectations, True if they are met, False otherwise
+        """
+        if self.rc is None:
+            return None
+        if result.exit_code != self.rc:
+            return False
+        if self.expected is None or self.rc != EXIT_SUCCESS:
+            return True
+        try:
+            return result.stdout == _read(self.expected)
+        except ApplicationError:
+            return False
+
+
+def load_manifest(path: str) -> list:
+    """
+    Load batch manifest, JSON list of jobs or object with such list under jobs key.
+    Job is an object with source and optional input, expected (output file) and rc keys,
+    paths are relative to the manifest directory
+    :param path: manifest file path
+    :return: list of BatchJob instances
+    """
+    try:
+        with open(path) as file:
+            manifest = json.load(file)
+    except OSError:
+        raise ApplicationError("Nepodařilo se otevřít soubor dávky '{}'".format(path), INPUT_FILE_ERROR)
+    except ValueError:
+        raise ApplicationError("Soubor dávky '{}' není platný JSON".format(path), INPUT_FILE_ERROR)
+
+    if isinstance(manifest, dict):
+        manifest = manifest.get('jobs')
+    if not isinstance(manifest, list):
+        raise ApplicationError("Soubor dávky '{}' neobsahuje seznam úloh".format(path), INPUT_FILE_ERROR)
+
+    base = os.path.dirname(os.path.abspath(path))
+    jobs = list()
+    for job in manifest:
+        if not isinstance(job, dict) or not isinstance(job.get('source'), str) \
+                or not isinstance(job.get('rc', 0), int):
+            raise ApplicationError("Neplatná úloha v souboru dávky '{}'".format(path), INPUT_FILE_ERROR)
+        paths = [os.path.join(base, job[key]) if isinstance(job.get(key), str) else None
+                 for key in ('source', 'input', 'expected')]
+        jobs.append(BatchJob(*paths, rc=job.get('rc')))
+    return jobs
+
+
+def run_batch(jobs: list, optimize: bool = False, engine: str = 'interpret') -> list:
+    """
+    Run jobs one after another in this process, each run gets fresh program, isolated input and outputs.
+    Every source is loaded and analyzed only once
+    :param jobs: list of BatchJob instances
+    :param optimize: analyze programs with optimizations
+    :param engine: 'interpret' or 'python'
+    :return: list of (job, RunResult) pairs
+    """
+    parser = IPPParser()
+    analyses = dict()  # Source path to analysis or RunResult of failed load
+    results = list()
+    for job in jobs:
+        if job.source not in analyses:
+            try:
+                analyses[job.source] = analyze(parser, _read(job.source), optimize)
+            except ApplicationError as err:
+                analyses[job.source] = RunResult.from_error(err)
+        analysis = analyses[job.source]
+        if isinstance(analysis, RunResult):
+            results.append((job, analysis))
+            continue
+
+        try:
+            stdin = _read(job.input_file) if job.input_file is not None else b''
+        except ApplicationError as err:
+            results.append((job, RunResult.from_error(err)))
+            continue
+        results.append((job, execute(analysis, stdin, engine)))
+    return results
+
+
+def list_inputs(directory: str) -> list:
+    """
+    List input files of directory, subdirectories and hidden files are skipped
+    :param directory: directory path
+    :return: sorted list of file paths
+    """
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        raise ApplicationError("Nepodařilo se otevřít adresář vstupů '{}'".format(directory), INPUT_FILE_ERROR)
+    paths = [os.path.join(directory, name) for name in sorted(names) if not name.startswith('.')]
+    return [path for path in paths if os.path.isfile(path)]
+
+
+_shared_analysis = None  # Analysis inherited by forked workers of run_inputs
+_shared_engine = None
+
+
+def _run_input(input_file: str) -> RunResult:
+    """
+    Run shared analysis against one input file in worker process
+    :param input_file: file with program input
+    :return: run result
+    """
+    try:
+        stdin = _read(input_file)
+    except ApplicationError as err:
+        return RunResult.from_error(err)
+    return execute(_shared_analysis, stdin, _shared_engine)
+
+
+def run_inputs(analysis: tuple, input_files: list, jobs: int = None, engine: str = 'interpret') -> list:
+    """
+    Run one analyzed program against many inputs, each run gets fresh program, isolated input and outputs.
+    Runs are distributed to a pool of forked processes which inherit the analysis instead of receiving it,
+    so the per-input cost is only the run itself
+    :param analysis: result of Program.get_analysis
+    :param input_files: list of files with program input
+    :param jobs: number of worker processes, number of CPUs if None, runs in this process if 1
+    :param engine: 'interpret' or 'python'
+    :return: list of (input file, RunResult) pairs in order of input files
+    """
+    global _shared_analysis, _shared_engine
+    jobs = min(jobs or os.cpu_count() or 1, len(input_files))
+    _shared_analysis, _shared_engine = analysis, engine
+    try:
+        if jobs <= 1 or not hasattr(os, 'fork'):
+            return list(zip(input_files, map(_run_input, input_files)))
+
+        import gc
+        import multiprocessing
+        freeze = hasattr(gc, 'freeze')
+        if freeze:  # Keep the analysis out of collections, so workers share its pages
+            gc.freeze()
+        try:
+            chunk_size = max(1, min(64, len(input_files) // (4 * jobs)))
+            with multiprocessing.get_context('fork').Pool(jobs) as pool:
+                return list(zip(input_files, pool.imap(_run_input, input_files, chunk_size)))
+        finally:
+            if freeze:
+                gc.unfreeze()
+    finally:
+        _shared_analysis = _shared_engine = None
+
+
+def write_inputs_report(source: str, results: list, stream):
+    """
+    Write results of run_inputs as JSON manifest, outputs are decoded as UTF-8
+    :param source: program source file
+    :param results: list of (input file, RunResult) pairs
+    :param stream: text stream
+    """
+    report = [{
+        'input': input_file,
+        'exit_code': result.exit_code,
+        'stdout': result.stdout.decode(errors='replace'),
+        'stderr': result.stderr.decode(errors='replace')
+    } for input_file, result in results]
+    json.dump({
+        'source': source,
+        'results': report,
+        'failed': sum(1 for item in report if item['exit_code'] != EXIT_SUCCESS)
+    }, stream, indent=2)
+    stream.write('\n')
+
+
+def write_report(results: list, stream):
+    """
+    Write batch results as JSON, outputs are decoded as UTF-8
+    :param results: list of (job, RunResult) pairs
+    :param stream: text stream
+    """
+    report = list()
+    for job, result in results:
+        report.append({
+            'source': job.source,
+            'exit_code': result.exit_code,
+            'stdout': result.stdout.decode(errors='replace'),
+            'stderr': result.stderr.decode(errors='replace'),
+            'passed': job.check(result)
+        })
+    json.dump({
+        'results': report,
+        'passed': sum(1 for item in report if item['passed'] is True),
+        'failed': sum(1 for item in report if item['passed'] is False)
+    }, stream, indent=2)
+    stream.write('\n')
+
+
+def _read(path: str) -> bytes:
+    """
+    Read whole file
+    :param path: file path
+    :return: file content
+    """
+    try:
+        with open(path, 'rb') as file:
+            return file.read()
+    except OSError:
+        raise ApplicationError("Nepodařilo se otevřít vstupní soubor '{}'".format(path), INPUT_FILE_ERROR)
@@ -0,0 +1,133 @@
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+# Opcodes which always leave the sequential flow of instructions
+UNCONDITIONAL_JUMPS = ('JUMP', 'CALL', 'RETURN')
+# Opcodes which may leave the sequential flow of instructions
+CONDITIONAL_JUMPS = ('JUMPIFEQ', 'JUMPIFNEQ')
+
+
+class BasicBlock:
+    """
+    Class representing sequence of instructions executed without a jump in between
+    """
+    def __init__(self, start: int, end: int):
+        """
+        Initialize block
+        :param start: address of first instruction
+        :param end: address after last instruction
+        """
+        self.start = start
+        self.end = end
+        self.successors = list()
+
+    def __repr__(self):
+        """
+        Block representation
+        :return: block representation
+        """
+        return '<BasicBlock {}-{} -> {}>'.format(self.start, self.end, self.successors)
+
+
+class ControlFlowGraph:
+    """
+    Control flow graph of analyzed instruction list.
+    RETURN is approximated by jumps to all instructions following some CALL.
+    """
+    def __init__(self, inst_list: list):
+        """
+        Build control flow graph
+        :param inst_list: list of instructions with resolved jump targets
+        """
+        self._inst_list = inst_list
+        self._return_sites = [addr + 1 for addr, inst in enumerate(inst_list)
+                              if inst.opcode == 'CALL' and addr + 1 < len(inst_list)]
+        self.blocks = list()
+        self.block_at = dict()  # Block index by address of its first instruction
+        self._build_blocks()
+
+    def inst_successors(self, addr: int) -> list:
+        """
+        Get addresses of instructions which may be executed after given one
+        :param addr: instruction address
+        :return: list of addresses
+        """
+        inst = self._inst_list[addr]
+        succ = list()
+        if inst.opcode == 'RETURN':
+            return list(self._return_sites)
+        if inst.opcode not in UNCONDITIONAL_JUMPS and addr + 1 < len(self._inst_list):
+            succ.append(addr + 1)
+        if inst.opcode in ('JUMP', 'CALL') or inst.opcode in CONDITIONAL_JUMPS:
+            target = inst.args[0].target
+            if target is not None and target not in succ:
+                succ.append(target)
+        return succ
+
+    def reachable(self) -> list:
+        """
+        Find blocks reachable from program start
+        :return: list of booleans indexed by block
+        """
+        reached = [False] * len(self.blocks)
+        if len(self.blocks) == 0:
+            return reached
+        stack = [0]
+        reached[0] = True
+        while stack:
+            for succ in self.blocks[stack.pop()].successors:
+                if not reached[succ]:
+                    reached[succ] = True
+                    stack.append(succ)
+        return reached
+
+    def function_bodies(self) -> dict:
+        """
+        Find instructions of program body and of each called function, CALL continues with the following
+        instruction within the caller and RETURN leaves the function
+        :return: dictionary of entry address (0 for program body) to sorted list of instruction addresses
+        """
+        inst_count = len(self._inst_list)
+        entries = {0} if inst_count > 0 else set()
+        entries.update(inst.args[0].target for inst in self._inst_list
+                       if inst.opcode == 'CALL' and inst.args[0].target is not None)
+        bodies = dict()
+        for entry in entries:
+            body = {entry}
+            stack = [entry]
+            while stack:
+                addr = stack.pop()
+                opcode = self._inst_list[addr].opcode
+                if opcode == 'RETURN':
+                    continue
+                succ = [addr + 1] if opcode == 'CALL' and addr + 1 < inst_count else self.inst_successors(addr)
+                for succ_addr in succ:
+                    if succ_addr not in body:
+                        body.add(succ_addr)
+                        stack.append(succ_addr)
+            bodies[entry] = sorted(body)
+        return bodies
+
+    def _build_blocks(self):
+        """
+        Split instruction list to basic blocks and connect them
+        """
+        inst_count = len(self._inst_list)
+        leaders = {0} if inst_count > 0 else set()
+        for addr, inst in enumerate(self._inst_list):
+            if inst.opcode == 'LABEL':
+                leaders.add(addr)
+            elif inst.opcode in UNCONDITIONAL_JUMPS or inst.opcode in CONDITIONAL_JUMPS:
+                if addr + 1 < inst_count:
+                    leaders.add(addr + 1)
+
+        starts = sorted(leaders)
+        for i, start in enumerate(starts):
+            end = starts[i + 1] if i + 1 < len(starts) else inst_count
+            self.block_at[start] = len(self.blocks)
+            self.blocks.append(BasicBlock(start, end))
+
+        for block in self.blocks:
+            block.successors = [self.block_at[addr] for addr in self.inst_successors(block.end - 1)]
@@ -45,6 +45,12 @@ class SrcSyntaxError(ApplicationError):
         super().__init__(message, SYNTAX_ERROR)
 
 
+class SourceError(ApplicationError):
+
+    def __init__(self, message: str):
+        super().__init__(message, SOURCE_ERROR)
+
+
 class XMLFormatError(ApplicationError):
 
     def __init__(self, message: str):
@@ -9,6 +9,10 @@ ARGUMENT_ERROR = 10
 INPUT_FILE_ERROR = 11
 OUTPUT_FILE_ERROR = 12
 
+SOURCE_ERROR = 21  # Lexical or syntax error of IPPcode18 source, same as parse.php
+
+SCRIPT_NOT_FOUND_ERROR = 41
+
 XML_FORMAT_ERROR = 31
 LEXICAL_ERROR = 32
 SYNTAX_ERROR = 32
@@ -0,0 +1,88 @@
+import mmap
+import os
+import stat
+import sys
+
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+DEFAULT_CHUNK_SIZE = 1 << 16  # Number of bytes read from stream at once
+
+
+class InputReader:
+    """
+    Reads program input (READ) line by line from binary stream read in large chunks
+    or from memory mapped regular file
+    """
+    def __init__(self, stream=None, chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = 'utf-8'):
+        """
+        Initialize reader
+        :param stream: binary stream, standard input is used if None
+        :param chunk_size: number of bytes read at once
+        :param encoding: input encoding
+        """
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._encoding = encoding
+        self._buffer = b''
+        self._pos = 0
+        self._eof = False
+
+    @staticmethod
+    def from_file(file: str):
+        """
+        Create reader of given file, regular files are memory mapped
+        :param file: file path
+        :return: new InputReader instance
+        """
+        stream = open(file, 'rb')
+        info = os.fstat(stream.fileno())
+        if not stat.S_ISREG(info.st_mode) or info.st_size == 0:
+            return InputReader(stream)
+
+        reader = InputReader(stream)
+        reader._buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        reader._eof = True
+        return reader
+
+    def read_line(self) -> str:
+        """
+        Read one line without line ending, behaves like builtin input()
+        :return: line
+        """
+        end = self._buffer.find(b'\n', self._pos)
+        while end < 0 and not self._eof:
+            searched = len(self._buffer) - self._pos
+            self._fill()
+            end = self._buffer.find(b'\n', self._pos + searched)
+
+        if end < 0:  # Last line without line ending
+            if self._pos >= len(self._buffer):
+                raise EOFError()
+            end = len(self._buffer)
+            next_pos = end
+        else:
+            next_pos = end + 1
+
+        if end > self._pos and self._buffer[end - 1] == 13:  # Strip \r of \r\n line ending
+            line = self._buffer[self._pos:end - 1]
+        else:
+            line = self._buffer[self._pos:end]
+        self._pos = next_pos
+        return line.decode(self._encoding, 'replace')
+
+    def _fill(self):
+        """
+        Read next chunk from stream, unread data are kept
+        """
+        if self._stream is None:
+            self._stream = sys.stdin.buffer
+        read = getattr(self._stream, 'read1', self._stream.read)
+        chunk = read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
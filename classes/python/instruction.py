@@ -1,9 +1,8 @@
 from classes.python.exceptions import XMLFormatError, DivisionByZeroError, OperandTypeError, StringOperationError
 from classes.python.arg import Arg, ArgType
 from classes.python import lexical_analyzer
-from xml.etree.ElementTree import Element
+from functools import partial
 import operator
-import sys
 
 __author__ = "Martin Omacht"
 __copyright__ = "Copyright 2018"
@@ -52,32 +51,102 @@ class Instruction:
         'BREAK': []
     }
 
+    # Instructions produced by optimizations, they are not part of IPPcode18
+    INTERNAL_ARGS = {
+        'NOP': []
+    }
+
     _inst_mapping = dict()  # Here is saved opcode to function mapping
 
-    def __init__(self, opcode: str, args: list):
+    def __init__(self, opcode: str, args: list, order: int = None):
         """
         Initialize Instruction object with opcode and arguments
         :param opcode:
         :param args:
+        :param order: order from source XML
         """
         self.opcode = opcode
         self.args = args
+        self.order = order
+        self.proven_args = frozenset()  # Indexes of arguments whose check always passes
+        self.fused = None  # SuperInstruction starting with this instruction, executed in its place
+        self.origin = None  # Instruction from source replaced by this one, used for diagnostics
 
-    def run(self, context):
+    def bind(self, context):
         """
-        Run instruction
+        Bind instruction to program context, handler, arguments and required argument checks are resolved
+        once so executing the instruction is a single call
         :param context: Program context
+        :return: callable executing the instruction
+        """
+        handler = self._handler()
+        args = self.args
+        checks = self._runtime_checks()
+
+        if len(checks) == 0:
+            return partial(handler, context, *args)
+
+        if len(checks) == 1 and len(args) <= 3:
+            check, checked = checks[0]
+            if len(args) == 1:
+                arg1 = args[0]
+
+                def run():
+                    check(context, checked)
+                    handler(context, arg1)
+            elif len(args) == 2:
+                arg1, arg2 = args
+
+                def run():
+                    check(context, checked)
+                    handler(context, arg1, arg2)
+            else:
+                arg1, arg2, arg3 = args
+
+                def run():
+                    check(context, checked)
+                    handler(context, arg1, arg2, arg3)
+            return run
+
+        if len(checks) == 2 and len(args) <= 3:
+            (check1, checked1), (check2, checked2) = checks
+            if len(args) == 2:
+                arg1, arg2 = args
+
+                def run():
+                    check1(context, checked1)
+                    check2(context, checked2)
+                    handler(context, arg1, arg2)
+            else:
+                arg1, arg2, arg3 = args
+
+                def run():
+                    check1(context, checked1)
+                    check2(context, checked2)
+                    handler(context, arg1, arg2, arg3)
+            return run
+
+        def run():
+            for check, checked in checks:
+                check(context, checked)
+            handler(context, *args)
+        return run
+
+    def _handler(self) -> callable:
         """
-        self._check_arguments(context)  # Check instruction arguments
-        Instruction._inst_mapping[self.opcode](context, *self.args)  # Get instruction function and invoke it
+        Get function executing the instruction
+        :return: function taking context and instruction arguments
+        """
+        return Instruction._inst_mapping[self.opcode]
 
-    def _check_arguments(self, context):
+    def _runtime_checks(self):
         """
-        Check if instruction arguments are valid
-        :param context: Program context
+        Get argument checks which have to be done at runtime, checks which always pass are left out
+        :return: list of (checker, argument) tuples in argument order
         """
-        for i in range(0, len(self.args)):
-            Instruction.INSTRUCTION_ARGS[self.opcode][i](context, self.args[i])
+        checkers = Instruction.get_arg_checkers(self.opcode)
+        return [(checkers[i], arg) for i, arg in enumerate(self.args)
+                if i not in self.proven_args and not ArgType.is_statically_valid(checkers[i], arg)]
 
     @staticmethod
     def run_func(func: callable):
@@ -93,7 +162,7 @@ class Instruction:
         return func
 
     @staticmethod
-    def from_xml_dom(inst_dom: Element):
+    def from_xml_dom(inst_dom: 'Element'):
         """
         Parse instruction from XML DOM element
         :param inst_dom: instruction XML DOM element
@@ -107,27 +176,46 @@ class Instruction:
                 arg.text = ''
             args.append(Arg(arg.attrib['type'], arg.text))
 
-        return Instruction(opcode, args)
+        return Instruction(opcode, args, int(inst_dom.attrib['order']))
 
     @staticmethod
-    def is_valid_arg(opcode: str, nth_arg: int, arg: Element):
+    def arg_from_xml(opcode: str, nth_arg: int, arg: 'Element') -> Arg:
         """
-        Check if given argument in XML DOM element form is valid
+        Check if given argument in XML DOM element form is valid and build Arg from it
         :param opcode: instruction opcode (expects a valid opcode)
         :param nth_arg: argument position
         :param arg: XML DOM element
+        :return: new Arg instance
         """
         assert opcode in Instruction.INSTRUCTION_ARGS
 
         if not (1 <= nth_arg <= len(Instruction.INSTRUCTION_ARGS[opcode])):
             raise XMLFormatError('Neplatný argument arg{}'.format(nth_arg, opcode))
 
-        if 'type' not in arg.attrib:
+        attrib = arg.attrib
+        if 'type' not in attrib:
             raise XMLFormatError('Chybí atribut "type" argumentu arg{} instrukce {}'.format(nth_arg, opcode))
-        if len(arg.attrib) != 1:
+        if len(attrib) != 1:
             raise XMLFormatError('Neplatný počet atributů argumentu arg{} instrukce {}'.format(nth_arg, opcode))
 
-        lexical_analyzer.check_validity(arg.attrib['type'], arg.text)
+        arg_type = attrib['type']
+        text = arg.text
+        if text is None:
+            text = ''
+        lexical_analyzer.check_validity(arg_type, text)
+        return Arg(arg_type, text)
+
+    @staticmethod
+    def get_arg_checkers(opcode: str) -> list:
+        """
+        Get argument checkers of opcode, including internal opcodes
+        :param opcode: instruction opcode (expects valid or internal opcode)
+        :return: list of ArgType checking methods
+        """
+        checkers = Instruction.INSTRUCTION_ARGS.get(opcode)
+        if checkers is None:
+            return Instruction.INTERNAL_ARGS[opcode]
+        return checkers
 
     @staticmethod
     def get_opcode_arg_num(opcode: str) -> int:
@@ -140,6 +228,54 @@ class Instruction:
         return len(Instruction.INSTRUCTION_ARGS[opcode])
 
 
+class SuperInstruction(Instruction):
+    """
+    Instruction fused from two adjacent instructions by peephole optimizer. It is executed in place of
+    the first one and advances context to the second one before executing its part,
+    so errors are reported with number of the instruction which caused them
+    """
+    _fused_mapping = dict()  # Here is saved superinstruction name to function mapping
+
+    def __init__(self, name: str, parts: list, **params):
+        """
+        Initialize superinstruction
+        :param name: superinstruction name
+        :param parts: fused instructions, argument checks of the second one have to always pass
+        :param params: additional keyword arguments of superinstruction function
+        """
+        super().__init__(name, parts[0].args + parts[1].args, parts[0].order)
+        self.parts = parts
+        self.params = params
+
+    def _handler(self) -> callable:
+        """
+        Get function executing the superinstruction
+        :return: function taking context and arguments of all fused instructions
+        """
+        handler = SuperInstruction._fused_mapping[self.opcode]
+        if self.params:
+            return partial(handler, **self.params)
+        return handler
+
+    def _runtime_checks(self):
+        """
+        Get argument checks of the first fused instruction which have to be done at runtime
+        :return: list of (checker, argument) tuples in argument order
+        """
+        return self.parts[0]._runtime_checks()
+
+    @staticmethod
+    def fused_func(func: callable):
+        """
+        Used as decorator to map functions to superinstruction names,
+        function has to have same name as superinstruction with leading underscore.
+        :param func: Function to map
+        :return: unchanged function
+        """
+        SuperInstruction._fused_mapping[func.__name__[1:].upper()] = func
+        return func
+
+
 #############################
 #   INSTRUCTION FUNCTIONS   #
 #############################
@@ -177,12 +313,12 @@ def _popframe(context):
 
 @Instruction.run_func
 def _defvar(context, var: Arg):
-    context.create_var(var.frame, var.value)
+    context.create_var(var.frame, var.slot)
 
 
 @Instruction.run_func
 def _call(context, label: Arg):
-    context.call(label.value)
+    context.call(label)
 
 
 @Instruction.run_func
@@ -273,8 +409,10 @@ def _stri2int(context, dest: Arg, src_str: Arg, idx: Arg):
 
 @Instruction.run_func
 def _read(context, var: Arg, in_type: Arg):
+    if context.interactive_input:  # Show pending output before waiting for user
+        context.flush_output()
     try:
-        read = input()
+        read = context.input.read_line()
     except EOFError:
         if in_type.value == 'int':
             var.set_value(context, 0)
@@ -300,7 +438,7 @@ def _read(context, var: Arg, in_type: Arg):
 
 @Instruction.run_func
 def _write(context, symb: Arg):
-    print(symb.to_str(context))
+    context.output.write(symb.to_str(context) + '\n')
 
 
 @Instruction.run_func
@@ -346,28 +484,69 @@ def _label(context, label: Arg):
 
 @Instruction.run_func
 def _jump(context, label: Arg):
-    context.jump_to_label(label.get_value(context))
+    context.jump_to_label(label)
 
 
 @Instruction.run_func
 def _jumpifeq(context, label: Arg, op1: Arg, op2: Arg):
     _check_if_same_type(context, op1, op2)
     if op1.get_value(context) == op2.get_value(context):
-        context.jump_to_label(label.get_value(context))
+        context.jump_to_label(label)
 
 
 @Instruction.run_func
 def _jumpifneq(context, label: Arg, op1: Arg, op2: Arg):
     _check_if_same_type(context, op1, op2)
     if op1.get_value(context) != op2.get_value(context):
-        context.jump_to_label(label.get_value(context))
+        context.jump_to_label(label)
 
 
 @Instruction.run_func
 def _dprint(context, symb: Arg):
-    print(symb.to_str(context), file=sys.stderr)
+    context.debug_output.write(symb.to_str(context) + '\n')
 
 
 @Instruction.run_func
 def _break(context):
     context.print_debug()
+
+
+@Instruction.run_func
+def _nop(context):
+    pass
+
+
+##################################
+#   SUPERINSTRUCTION FUNCTIONS   #
+##################################
+
+@SuperInstruction.fused_func
+def _compare_jump(context, dest: Arg, op1: Arg, op2: Arg, label: Arg, result: Arg, cond: Arg,
+                  compare, jump_if_equal: bool):
+    _check_if_same_type(context, op1, op2)
+    value = compare(op1.get_value(context), op2.get_value(context))
+    dest.set_value(context, value)
+    context.advance()
+    if (value == cond.value) == jump_if_equal:
+        context.jump_to_label(label)
+
+
+@SuperInstruction.fused_func
+def _pushs_pops(context, symb: Arg, var: Arg):
+    value = symb.get_value(context)
+    context.advance()
+    var.set_value(context, value)
+
+
+@SuperInstruction.fused_func
+def _defvar_move(context, var: Arg, dest: Arg, src: Arg):
+    context.create_var(var.frame, var.slot)
+    context.advance()
+    dest.set_value(context, src)
+
+
+@SuperInstruction.fused_func
+def _createframe_pushframe(context):
+    context.create_tmp_frame()
+    context.advance()
+    context.push_tmp_frame()
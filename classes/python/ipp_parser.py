@@ -1,5 +1,5 @@
 from classes.python.exceptions import XMLFormatError, SrcSyntaxError, LexicalError, ApplicationError
-from classes.python.exit_codes import INPUT_FILE_ERROR
+from classes.python.exit_codes import INPUT_FILE_ERROR, SCRIPT_NOT_FOUND_ERROR
 from classes.python.instruction import Instruction
 from xml.etree import ElementTree
 import re
@@ -13,6 +13,7 @@ class IPPParser:
     """
     Parse XML IPPcode18 representation to element tree and check it's validity
     """
+    _ARG_TAGS = {'arg1': 1, 'arg2': 2, 'arg3': 3}  # Usual argument tags, others are matched by regex
 
     def __init__(self):
         """
@@ -29,7 +30,7 @@ class IPPParser:
         try:
             xml_dom = ElementTree.parse(file).getroot()
         except ElementTree.ParseError:
-            raise XMLFormatError("Vstupní XML nemá správný formát'")
+            raise XMLFormatError("Vstupní XML nemá správný formát")
         except FileNotFoundError:
             raise ApplicationError("Nepodařilo se otevřít vstupní soubor '{}'".format(file), INPUT_FILE_ERROR)
 
@@ -45,10 +46,131 @@ class IPPParser:
         try:
             xml_dom = ElementTree.fromstring(xml_string)
         except ElementTree.ParseError:
-            raise XMLFormatError("Vstupní XML nemá správný formát'")
+            raise XMLFormatError("Vstupní XML nemá správný formát")
         self._check_xml_structure(xml_dom)
         return xml_dom
 
+    def load_from_file(self, file: str) -> list:
+        """
+        Load instructions from given XML file in single streaming pass
+        :param file: file with xml
+        :return: list of Instruction instances ordered by their order
+        """
+        try:
+            events = ElementTree.iterparse(file, events=('start',))
+        except FileNotFoundError:
+            raise ApplicationError("Nepodařilo se otevřít vstupní soubor '{}'".format(file), INPUT_FILE_ERROR)
+        return self._load_events(events)
+
+    def load_from_string(self, xml_string) -> list:
+        """
+        Load instructions from given XML string
+        :param xml_string: string or bytes with xml
+        :return: list of Instruction instances ordered by their order
+        """
+        return self._load_events(self._pull_events([xml_string]))
+
+    def load_from_stream(self, stream, chunk_size: int = 1 << 16) -> list:
+        """
+        Load instructions from binary stream, each chunk is parsed as soon as it is read
+        :param stream: binary stream with xml, read1 is used if available to not wait for full chunks
+        :param chunk_size: maximal chunk size
+        :return: list of Instruction instances ordered by their order
+        """
+        read = getattr(stream, 'read1', stream.read)
+        return self._load_events(self._pull_events(iter(lambda: read(chunk_size), b'')))
+
+    def load_from_command(self, command: list, stdin) -> list:
+        """
+        Run command producing xml (e.g. parse.php) and load instructions from its output while it is running,
+        so the whole document is never held in memory. Error of the command takes precedence over xml errors
+        :param command: command arguments
+        :param stdin: file object passed to command as standard input
+        :return: list of Instruction instances ordered by their order
+        """
+        import subprocess
+        try:
+            process = subprocess.Popen(command, stdin=stdin, stdout=subprocess.PIPE)
+        except OSError:
+            raise ApplicationError("Nepodařilo se spustit '{}'".format(' '.join(command)), SCRIPT_NOT_FOUND_ERROR)
+
+        error = None
+        instructions = None
+        with process.stdout:
+            try:
+                instructions = self.load_from_stream(process.stdout)
+            except ApplicationError as err:
+                error = err
+                process.kill()  # Rest of the output is not needed, unless the command failed on its own
+        returncode = process.wait()
+        if returncode > 0:
+            raise ApplicationError("Příkaz '{}' skončil s chybou".format(' '.join(command)), returncode)
+        if error is not None:
+            raise error
+        return instructions
+
+    @staticmethod
+    def _pull_events(chunks):
+        """
+        Generate element start events from XML data chunks
+        :param chunks: iterable of XML string or bytes chunks
+        :return: generator of ('start', element) tuples
+        """
+        parser = ElementTree.XMLPullParser(events=('start',))
+        for chunk in chunks:
+            parser.feed(chunk)
+            yield from parser.read_events()
+        parser.close()
+        yield from parser.read_events()
+
+    def _load_events(self, events) -> list:
+        """
+        Check XML structure and build instructions while the document is being parsed.
+        Start of an element means all previous instruction elements are complete,
+        so each of them is processed and released as soon as the next element starts.
+        First structure error is raised after whole input is parsed, so malformed XML takes precedence.
+        :param events: iterable of ('start', element) tuples
+        :return: list of Instruction instances ordered by their order
+        """
+        instructions = list()
+        error = None
+        root = None
+        try:
+            for event, elem in events:
+                if root is None:
+                    root = elem
+                    try:
+                        self._check_root_elem(root)
+                    except ApplicationError as err:
+                        error = err
+                elif len(root) > 1:
+                    if error is None:
+                        error = self._load_instruction(root[0], instructions)
+                    del root[0]
+        except ElementTree.ParseError:
+            raise XMLFormatError("Vstupní XML nemá správný formát")
+
+        for elem in root:
+            if error is None:
+                error = self._load_instruction(elem, instructions)
+        if error is not None:
+            raise error
+        instructions.sort(key=lambda inst: inst.order)
+        return instructions
+
+    def _load_instruction(self, elem: ElementTree.Element, instructions: list):
+        """
+        Check instruction element and append built Instruction to list
+        :param elem: XML DOM instruction element
+        :param instructions: list of loaded instructions
+        :return: ApplicationError if instruction is not valid, None otherwise
+        """
+        try:
+            instructions.append(self._build_instruction(elem))
+        except ApplicationError as err:
+            return err
+        return None
+
     def _check_xml_structure(self, xml_dom: ElementTree.Element):
         """
         Check if XML structure is valid
@@ -84,53 +206,64 @@ class IPPParser:
         :param root_elem: XML DOM root element
         """
         for instruction in root_elem:
-            if instruction.tag != "instruction":
-                raise XMLFormatError("Neočekávaný element {}".format(instruction.tag))
+            self._build_instruction(instruction)
+
+    def _build_instruction(self, instruction: ElementTree.Element) -> Instruction:
+        """
+        Check instruction element and build Instruction from it in one pass
+        :param instruction: XML DOM instruction element
+        :return: new Instruction instance
+        """
+        if instruction.tag != "instruction":
+            raise XMLFormatError("Neočekávaný element {}".format(instruction.tag))
 
-            self._check_instruction_attribs(instruction)
+        order, opcode = self._check_instruction_attribs(instruction)
 
-            self._check_instruction_args(instruction)
+        return Instruction(opcode, self._build_instruction_args(instruction, opcode), order)
 
-    def _check_instruction_attribs(self, instruction: ElementTree.Element):
+    def _check_instruction_attribs(self, instruction: ElementTree.Element) -> tuple:
         """
         Check instruction attributes
         :param instruction: XML DOM instruction element
+        :return: (order, opcode) tuple
         """
-        has_opcode = has_order = False
+        order = opcode = None
         for attrib, value in instruction.attrib.items():
             if attrib == "order":
                 try:
-                    int(value)
-                    has_order = True
+                    order = int(value)
                 except ValueError:
                     raise LexicalError("Atribut 'order' neobsahuje číselnou hodnotu")
             elif attrib == "opcode":
                 if value not in Instruction.INSTRUCTION_ARGS:
                     raise SrcSyntaxError("Neplatný operační kód '{}'".format(value))
                 else:
-                    has_opcode = True
+                    opcode = value
             else:
                 raise XMLFormatError("Neznámý atribut '{}'".format(attrib))
 
-        if not has_order or not has_opcode:
+        if order is None or opcode is None:
             raise XMLFormatError("Chybí atribut 'order' nebo 'opcode' v elementu <instruction>")
+        return order, opcode
 
-    def _check_instruction_args(self, instruction: ElementTree.Element):
+    def _build_instruction_args(self, instruction: ElementTree.Element, opcode: str) -> list:
         """
-        Check instruction arguments
+        Check instruction arguments and build them
         :param instruction: XML DOM instruction element
+        :param opcode: valid instruction opcode
+        :return: list of Arg instances ordered by argument number
         """
-        args = list()
-        opcode = instruction.attrib['opcode']
+        args = dict()
         order = instruction.attrib['order']
         for arg in instruction:
-            matches = self.arg_regex.match(arg.tag)
+            nth = self._ARG_TAGS.get(arg.tag)
+            matches = nth is not None or self.arg_regex.match(arg.tag)
             if matches:
-                nth = int(matches.group(1))
+                if nth is None:
+                    nth = int(matches.group(1))
                 if nth in args:
                     raise XMLFormatError("Duplikátní argument {} instrukce {}".format(arg.tag, order))
-                args.append(nth)
-                Instruction.is_valid_arg(opcode, nth, arg)
+                args[nth] = Instruction.arg_from_xml(opcode, nth, arg)
             else:
                 raise XMLFormatError("Neplatný agrument {} instrukce {}".format(arg.tag, order))
 
@@ -140,3 +273,4 @@ class IPPParser:
         for i in range(1, len(args) + 1):
             if i not in args:
                 raise XMLFormatError("Chybí argument 'arg{}' v instrukci {}".format(i, order))
+        return [args[i] for i in range(1, len(args) + 1)]
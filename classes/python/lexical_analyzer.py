@@ -29,3 +29,12 @@ def check_validity(val_type: str, value: str):
     if not _TYPE_REGEX[val_type].match(value):
         raise LexicalError('Typ {} obsahuje nesprávnou hodnotu "{}"'.format(val_type, value))
 
+
+def is_valid(val_type: str, value: str) -> bool:
+    """
+    Check if value is valid for given type
+    :param val_type: valid value type
+    :param value: value
+    :return: True if value is valid
+    """
+    return _TYPE_REGEX[val_type].match(value) is not None
@@ -0,0 +1,270 @@
+from classes.python.arg import Arg, ArgType
+from classes.python.control_flow import ControlFlowGraph
+from classes.python.frame import Frame
+from classes.python.instruction import Instruction
+from classes.python.type_inference import var_key
+import operator
+
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+# Checkers of arguments which are read by instruction
+READ_CHECKERS = (ArgType.arg_int, ArgType.arg_bool, ArgType.arg_string, ArgType.arg_any, ArgType.arg_dest_or_any)
+
+# Opcodes which change frames, known facts about LF and TF variables are lost
+FRAME_OPCODES = ('CREATEFRAME', 'PUSHFRAME', 'POPFRAME')
+
+
+def _idiv(op1: int, op2: int) -> int:
+    if op2 == 0:
+        raise ZeroDivisionError()
+    return op1 // op2
+
+
+def _compare(op):
+    def compare(op1, op2):
+        if type(op1) is not type(op2):
+            raise TypeError()
+        return op(op1, op2)
+    return compare
+
+
+# Functions computing results of foldable instructions from literal operand values,
+# errors are raised exactly when the instruction would fail at runtime
+FOLD_OPS = {
+    'ADD': operator.add,
+    'SUB': operator.sub,
+    'MUL': operator.mul,
+    'IDIV': _idiv,
+    'LT': _compare(operator.lt),
+    'GT': _compare(operator.gt),
+    'EQ': _compare(operator.eq),
+    'AND': operator.and_,
+    'OR': operator.or_,
+    'NOT': operator.not_,
+    'INT2CHAR': chr,
+    'STRI2INT': lambda string, idx: ord(string[idx]),
+    'CONCAT': operator.add,
+    'STRLEN': len,
+    'GETCHAR': lambda string, idx: string[idx]
+}
+
+
+def literal(value) -> Arg:
+    """
+    Create literal argument holding given value
+    :param value: int, bool or str value
+    :return: new Arg instance
+    """
+    if type(value) is bool:
+        arg = Arg('bool', '')
+    elif type(value) is int:
+        arg = Arg('int', '0')
+    else:
+        arg = Arg('string', '')
+    arg.value = value
+    return arg
+
+
+def storage_key(arg: Arg) -> tuple:
+    """
+    Get key identifying variable storage, TF and LF variables of the same name share it as TF becomes LF
+    :param arg: variable argument
+    :return: (is global, name) tuple
+    """
+    return arg.frame is Frame.GF, arg.value
+
+
+class DataflowOptimizer:
+    """
+    Optimization of analyzed instruction list within basic blocks: copy propagation,
+    constant folding and removal of dead stores. Instructions keep their addresses,
+    replacement instruction references the replaced one in Instruction.origin, so diagnostics are unchanged.
+    Only rewrites which can not change output or errors of the program are done.
+    """
+    def __init__(self, inst_list: list):
+        """
+        Initialize optimizer
+        :param inst_list: list of instructions with resolved jump targets, rewritten in place
+        """
+        self._inst_list = inst_list
+        self._read = None
+
+    def run(self):
+        """
+        Run optimization
+        """
+        self._read = self._read_storage()
+        for block in ControlFlowGraph(self._inst_list).blocks:
+            self._optimize_block(block.start, block.end)
+
+    def _read_storage(self):
+        """
+        Find variables read anywhere in program
+        :return: set of storage keys or None if all variables may be read (program contains BREAK)
+        """
+        read = set()
+        for inst in self._inst_list:
+            if inst.opcode == 'BREAK':
+                return None
+            indexes = self._read_indexes(inst)
+            if inst.opcode == 'SETCHAR':  # Modified string is read too
+                indexes = [0] + indexes
+            for i in indexes:
+                if inst.args[i].is_var():
+                    read.add(storage_key(inst.args[i]))
+        return read
+
+    def _optimize_block(self, start: int, end: int):
+        """
+        Optimize basic block
+        :param start: address of first instruction
+        :param end: address after last instruction
+        """
+        copies = dict()  # Variable key to argument whose value the variable holds
+        defined = set()  # Keys of variables known to be defined
+        initialized = set()  # Keys of variables known to hold value
+        for addr in range(start, end):
+            inst = self._propagate(self._inst_list[addr], copies)
+            inst = self._fold(inst)
+            if self._is_dead_store(inst, defined, initialized):
+                inst = self._replace(inst, 'NOP', [])
+            self._inst_list[addr] = inst
+            self._update(inst, copies, defined, initialized)
+
+    def _propagate(self, inst: Instruction, copies: dict) -> Instruction:
+        """
+        Replace read variables holding copy of other argument by the argument
+        :param inst: instruction
+        :param copies: known copies
+        :return: rewritten or unchanged instruction
+        """
+        args = inst.args
+        for i in self._read_indexes(inst):
+            if args[i].is_var() and var_key(args[i]) in copies:
+                if args is inst.args:
+                    args = list(args)
+                args[i] = copies[var_key(args[i])]
+        if args is inst.args:
+            return inst
+        return self._replace(inst, inst.opcode, args)
+
+    def _fold(self, inst: Instruction) -> Instruction:
+        """
+        Replace instruction with only literal operands by MOVE of its result
+        :param inst: instruction
+        :return: rewritten or unchanged instruction
+        """
+        operands = inst.args[1:]
+        if inst.opcode != 'TYPE' and inst.opcode not in FOLD_OPS:
+            return inst
+        if not inst.args[0].is_var():  # Literal destination fails its runtime check
+            return inst
+        if inst.opcode == 'TYPE':
+            if operands[0].is_var() or not ArgType.is_statically_valid(ArgType.arg_dest_or_any, operands[0]):
+                return inst
+            return self._replace(inst, 'MOVE', [inst.args[0], literal(operands[0].type)])
+
+        checkers = Instruction.get_arg_checkers(inst.opcode)[1:]
+        for checker, arg in zip(checkers, operands):
+            if not ArgType.is_statically_valid(checker, arg):
+                return inst
+        try:
+            result = FOLD_OPS[inst.opcode](*[arg.value for arg in operands])
+        except (ArithmeticError, ValueError, TypeError, IndexError):
+            return inst  # Instruction fails at runtime
+        return self._replace(inst, 'MOVE', [inst.args[0], literal(result)])
+
+    def _is_dead_store(self, inst: Instruction, defined: set, initialized: set) -> bool:
+        """
+        Check if instruction is a store which can be left out, stored variable is never read
+        and the store can not fail
+        :param inst: instruction
+        :param defined: keys of variables known to be defined
+        :param initialized: keys of variables known to hold value
+        :return: True if instruction can be removed
+        """
+        if inst.opcode != 'MOVE' or self._read is None:
+            return False
+        dest, src = inst.args
+        if not dest.is_var() or storage_key(dest) in self._read or var_key(dest) not in defined:
+            return False
+        return not src.is_var() or var_key(src) in initialized
+
+    def _update(self, inst: Instruction, copies: dict, defined: set, initialized: set):
+        """
+        Apply instruction effect on known facts about variables
+        :param inst: executed instruction
+        :param copies: known copies, modified in place
+        :param defined: keys of variables known to be defined, modified in place
+        :param initialized: keys of variables known to hold value, modified in place
+        """
+        opcode = inst.opcode
+        if opcode in FRAME_OPCODES:
+            for key, src in list(copies.items()):
+                if key[0] is not Frame.GF or (src.is_var() and src.frame is not Frame.GF):
+                    del copies[key]
+            for facts in (defined, initialized):
+                facts.difference_update([key for key in facts if key[0] is not Frame.GF])
+            return
+
+        checkers = Instruction.get_arg_checkers(opcode)
+        for checker, arg in zip(checkers, inst.args):
+            if arg.is_var() and checker in ArgType.VALUE_CHECKERS:  # Successful check proves value
+                defined.add(var_key(arg))
+                initialized.add(var_key(arg))
+
+        written = self._written_var(inst)
+        if written is None:
+            return
+        key = var_key(written)
+        copies.pop(key, None)
+        for copy, src in list(copies.items()):
+            if src.is_var() and var_key(src) == key:
+                del copies[copy]
+        defined.add(key)
+        if opcode == 'DEFVAR':
+            initialized.discard(key)
+        else:
+            initialized.add(key)
+        if opcode == 'MOVE' and not (inst.args[1].is_var() and var_key(inst.args[1]) == key):
+            copies[key] = inst.args[1]
+
+    @staticmethod
+    def _read_indexes(inst: Instruction) -> list:
+        """
+        Get indexes of arguments read by instruction
+        :param inst: instruction
+        :return: list of argument indexes
+        """
+        if inst.opcode == 'SETCHAR':  # First argument is modified, it can not be replaced
+            return [1, 2]
+        return [i for i, checker in enumerate(Instruction.get_arg_checkers(inst.opcode)) if checker in READ_CHECKERS]
+
+    @staticmethod
+    def _written_var(inst: Instruction):
+        """
+        Get variable written by instruction
+        :param inst: instruction
+        :return: variable Arg or None
+        """
+        checkers = Instruction.get_arg_checkers(inst.opcode)
+        if (inst.opcode == 'SETCHAR' or (len(checkers) > 0 and checkers[0] is ArgType.arg_dest)) \
+                and inst.args[0].is_var():
+            return inst.args[0]
+        return None
+
+    @staticmethod
+    def _replace(inst: Instruction, opcode: str, args: list) -> Instruction:
+        """
+        Create instruction replacing given one
+        :param inst: replaced instruction
+        :param opcode: opcode of new instruction
+        :param args: arguments of new instruction
+        :return: new Instruction instance
+        """
+        replacement = Instruction(opcode, args, inst.order)
+        replacement.origin = inst if inst.origin is None else inst.origin
+        return replacement
@@ -0,0 +1,144 @@
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+class Option:
+    """
+    Command line option in --name=value or --name value form, flags have no value
+    """
+    def __init__(self, name: str, help_text: str, flag: bool = False, value_type: type = str,
+                 choices: tuple = None, default=None, metavar: str = None):
+        """
+        Initialize option
+        :param name: option name without leading dashes
+        :param help_text: option description
+        :param flag: option has no value, its value is True if given
+        :param value_type: function converting value string, ValueError means invalid value
+        :param choices: allowed values
+        :param default: value of option which is not given
+        :param metavar: value name in help
+        """
+        self.name = name
+        self.help = help_text
+        self.flag = flag
+        self.value_type = value_type
+        self.choices = choices
+        self.default = False if flag else default
+        self.metavar = metavar or name.upper().replace('-', '_')
+        self.dest = name.replace('-', '_')
+
+
+class Options:
+    """
+    Parsed option values accessible as attributes
+    """
+
+
+class OptionParser:
+    """
+    Minimal parser of long options, lighter replacement of argparse for scripts which have to start fast.
+    Options can be abbreviated to unique prefix, later occurrence of option overrides the earlier one
+    """
+    def __init__(self, description: str, options: list):
+        """
+        Initialize parser
+        :param description: program description shown in help
+        :param options: list of Option instances
+        """
+        self.description = description
+        self.options = {option.name: option for option in options}
+
+    def parse(self, argv: list) -> Options:
+        """
+        Parse command line arguments
+        :param argv: arguments without program name
+        :return: Options with attribute for every option
+        :raise ValueError: on invalid arguments, message describes the problem
+        """
+        values = Options()
+        for option in self.options.values():
+            setattr(values, option.dest, option.default)
+
+        args = iter(argv)
+        for arg in args:
+            if not arg.startswith('--'):
+                raise ValueError('unrecognized argument: {}'.format(arg))
+            name, sep, value = arg[2:].partition('=')
+            option = self._find(name)
+            if option.flag:
+                if sep:
+                    raise ValueError('option --{} takes no value'.format(option.name))
+                setattr(values, option.dest, True)
+                continue
+            if not sep:
+                value = next(args, None)
+                if value is None:
+                    raise ValueError('option --{} requires value'.format(option.name))
+            setattr(values, option.dest, self._convert(option, value))
+        return values
+
+    def help(self, prog: str) -> str:
+        """
+        Get help text
+        :param prog: program name
+        :return: help text
+        """
+        labels = [(option, self._label(option)) for option in self.options.values()]
+        prefix = 'usage: {} '.format(prog)
+        lines = [prefix]
+        for option, label in labels:  # Usage is wrapped like argparse does it
+            if len(lines[-1]) + len(label) + 3 > 100 and lines[-1] != prefix:
+                lines.append(' ' * len(prefix))
+            lines[-1] += '[{}] '.format(label)
+        lines = [line.rstrip() for line in lines]
+        lines.extend(['', self.description, '', 'options:'])
+        for option, label in labels:
+            if len(label) > 24:  # Long label has its help on the next line
+                lines.extend(['  ' + label, '  {:<24} {}'.format('', option.help)])
+            else:
+                lines.append('  {:<24} {}'.format(label, option.help))
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _label(option: Option) -> str:
+        """
+        Get option with its value as shown in help
+        :param option: option
+        :return: label
+        """
+        if option.flag:
+            return '--' + option.name
+        if option.choices is not None:
+            return '--{} {{{}}}'.format(option.name, ','.join(option.choices))
+        return '--{} {}'.format(option.name, option.metavar)
+
+    def _find(self, name: str) -> Option:
+        """
+        Find option by name or its unique prefix
+        :param name: name without leading dashes
+        :return: Option instance
+        """
+        if name in self.options:
+            return self.options[name]
+        candidates = [option for option_name, option in self.options.items() if option_name.startswith(name)]
+        if len(candidates) != 1 or not name:
+            raise ValueError('{} option: --{}'.format('ambiguous' if candidates and name else 'unrecognized', name))
+        return candidates[0]
+
+    @staticmethod
+    def _convert(option: Option, value: str):
+        """
+        Convert and check option value
+        :param option: option
+        :param value: value string
+        :return: converted value
+        """
+        try:
+            value = option.value_type(value)
+        except ValueError:
+            raise ValueError('invalid value of option --{}: {}'.format(option.name, value))
+        if option.choices is not None and value not in option.choices:
+            raise ValueError('invalid choice of option --{}: {} (choose from {})'.format(
+                option.name, value, ', '.join(option.choices)))
+        return value
@@ -0,0 +1,42 @@
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+DEFAULT_BUFFER_SIZE = 1 << 18  # Number of characters gathered before writing to the stream
+
+
+class OutputBuffer:
+    """
+    Gathers program output and writes it to the underlying stream in large chunks
+    """
+    def __init__(self, stream, size: int = DEFAULT_BUFFER_SIZE):
+        """
+        Initialize buffer
+        :param stream: text stream to write to
+        :param size: number of characters after which buffer is flushed
+        """
+        self.stream = stream
+        self._size = size
+        self._parts = list()
+        self._length = 0
+
+    def write(self, text: str):
+        """
+        Write text to buffer, flushes buffer when full
+        :param text: text to write
+        """
+        self._parts.append(text)
+        self._length += len(text)
+        if self._length >= self._size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write gathered text to stream
+        """
+        if self._parts:
+            self.stream.write(''.join(self._parts))
+            self._parts = list()
+            self._length = 0
+        self.stream.flush()
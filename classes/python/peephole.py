@@ -0,0 +1,81 @@
+from classes.python.arg import Arg
+from classes.python.instruction import Instruction, SuperInstruction
+import operator
+
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+# Comparison opcodes which can be fused with following conditional jump
+COMPARE_OPS = {
+    'LT': operator.lt,
+    'GT': operator.gt,
+    'EQ': operator.eq
+}
+
+
+def same_var(arg1: Arg, arg2: Arg) -> bool:
+    """
+    Check if both arguments are the same variable
+    :param arg1: argument
+    :param arg2: argument
+    :return: True if both arguments are variables with the same frame and name
+    """
+    return arg1.is_var() and arg2.is_var() and arg1.frame is arg2.frame and arg1.value == arg2.value
+
+
+class PeepholeOptimizer:
+    """
+    Fuses common pairs of adjacent instructions into superinstructions.
+    Instruction list is left unchanged, superinstruction is stored in Instruction.fused of the first
+    instruction of the pair. Second instruction of the pair is never a jump target as labels are
+    separate instructions, so it is reached only through the first one.
+    Requires proven arguments from type inference, pair is fused only if checks of the second instruction
+    always pass, so they can be left out.
+    """
+    def __init__(self, inst_list: list):
+        """
+        Initialize optimizer
+        :param inst_list: list of analyzed instructions
+        """
+        self._inst_list = inst_list
+
+    def run(self):
+        """
+        Find fusable pairs and set superinstructions to their first instructions
+        """
+        inst_list = self._inst_list
+        addr = 0
+        while addr + 1 < len(inst_list):
+            first = inst_list[addr]
+            first.fused = self._fuse(first, inst_list[addr + 1])
+            addr += 2 if first.fused is not None else 1
+
+    @staticmethod
+    def _fuse(first: Instruction, second: Instruction):
+        """
+        Fuse pair of instructions
+        :param first: instruction
+        :param second: instruction following the first one
+        :return: SuperInstruction or None if the pair can not be fused
+        """
+        if len(second._runtime_checks()) != 0:
+            return None
+
+        opcode = first.opcode
+        if opcode in COMPARE_OPS:
+            if second.opcode in ('JUMPIFEQ', 'JUMPIFNEQ') and same_var(first.args[0], second.args[1]) \
+                    and second.args[2].type == 'bool':
+                return SuperInstruction('COMPARE_JUMP', [first, second], compare=COMPARE_OPS[opcode],
+                                        jump_if_equal=second.opcode == 'JUMPIFEQ')
+        elif opcode == 'PUSHS':
+            if second.opcode == 'POPS':
+                return SuperInstruction('PUSHS_POPS', [first, second])
+        elif opcode == 'DEFVAR':
+            if second.opcode == 'MOVE' and same_var(first.args[0], second.args[0]):
+                return SuperInstruction('DEFVAR_MOVE', [first, second])
+        elif opcode == 'CREATEFRAME':
+            if second.opcode == 'PUSHFRAME':
+                return SuperInstruction('CREATEFRAME_PUSHFRAME', [first, second])
+        return None
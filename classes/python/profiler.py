@@ -0,0 +1,181 @@
+from classes.python.instruction import Instruction
+import json
+import time
+
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+class Profiler:
+    """
+    Collects execution count and cumulative wall time of each instruction.
+    Program.interpret runs separate dispatch loop when profiler is given, so profiling costs nothing otherwise
+    """
+    def __init__(self, clock: callable = time.perf_counter):
+        """
+        Initialize profiler
+        :param clock: function returning time in seconds
+        """
+        self.clock = clock
+        self.counts = list()  # Execution counts indexed by instruction address
+        self.times = list()  # Cumulative times indexed by instruction address
+        self._inst_list = list()
+
+    def start(self, inst_list: list):
+        """
+        Prepare counters for program run
+        :param inst_list: analyzed instruction list of profiled program
+        """
+        self._inst_list = inst_list
+        self.counts = [0] * len(inst_list)
+        self.times = [0.0] * len(inst_list)
+
+    def report(self) -> dict:
+        """
+        Summarize collected data by opcode and by instruction
+        :return: dictionary with total, opcodes and instructions keys
+        """
+        opcodes = {opcode: {'count': 0, 'time': 0.0} for opcode in Instruction.INSTRUCTION_ARGS}
+        instructions = list()
+        for inst, count, spent in zip(self._inst_list, self.counts, self.times):
+            if inst.origin is not None:
+                inst = inst.origin
+            if inst.order is None:  # Pruned or internal instruction
+                continue
+            opcodes[inst.opcode]['count'] += count
+            opcodes[inst.opcode]['time'] += spent
+            instructions.append({'order': inst.order, 'opcode': inst.opcode, 'count': count, 'time': spent})
+
+        return {
+            'total': {'count': sum(self.counts), 'time': sum(self.times)},
+            'opcodes': opcodes,
+            'instructions': instructions
+        }
+
+    def write_json(self, stream):
+        """
+        Write report as JSON
+        :param stream: text stream
+        """
+        json.dump(self.report(), stream, indent=2)
+        stream.write('\n')
+
+    def write_table(self, stream):
+        """
+        Write report as text tables sorted by time
+        :param stream: text stream
+        """
+        report = self.report()
+        total_time = report['total']['time'] or 1.0
+        stream.write('{:<12} {:>12} {:>12} {:>7}\n'.format('opcode', 'count', 'time [s]', 'time %'))
+        for opcode, data in sorted(report['opcodes'].items(), key=lambda item: (-item[1]['time'], item[0])):
+            if data['count'] > 0:
+                stream.write('{:<12} {:>12} {:>12.6f} {:>7.2f}\n'.format(
+                    opcode, data['count'], data['time'], 100 * data['time'] / total_time))
+
+        stream.write('\n{:<8} {:<12} {:>12} {:>12} {:>7}\n'.format('order', 'opcode', 'count', 'time [s]', 'time %'))
+        for data in sorted(report['instructions'], key=lambda item: (-item['time'], item['order'])):
+            if data['count'] > 0:
+                stream.write('{:<8} {:<12} {:>12} {:>12.6f} {:>7.2f}\n'.format(
+                    data['order'], data['opcode'], data['count'], data['time'], 100 * data['time'] / total_time))
+
+
+class CallTreeProfiler:
+    """
+    Tracks calls of functions (CALL targets) and collects their inclusive and exclusive instruction counts and times.
+    Code executed outside of any function belongs to MAIN_NAME. Recursive calls add to inclusive values only once
+    """
+    MAIN_NAME = '<main>'
+
+    def __init__(self, clock: callable = time.perf_counter):
+        """
+        Initialize profiler
+        :param clock: function returning time in seconds
+        """
+        self.clock = clock
+        self.functions = dict()  # Statistics by function name
+        self.stacks = dict()  # Exclusive instruction counts by call stack string
+        self.spans = list()  # (name, start, duration, instructions) of finished calls
+        self._stack = list()  # [name, start count, start time, children count, children time] of active calls
+        self._start_time = 0.0
+
+    def start(self):
+        """
+        Start profiling, program start enters main
+        """
+        self._start_time = self.clock()
+        self._stack = [[CallTreeProfiler.MAIN_NAME, 0, self._start_time, 0, 0.0]]
+
+    def enter(self, name: str, count: int):
+        """
+        Record function call
+        :param name: called label
+        :param count: number of instructions executed so far, including the CALL
+        """
+        self._stack.append([name, count, self.clock(), 0, 0.0])
+
+    def leave(self, count: int):
+        """
+        Record return from function
+        :param count: number of instructions executed so far, including the RETURN
+        """
+        now = self.clock()
+        name, start_count, start_time, children_count, children_time = self._stack[-1]
+        path = ';'.join(frame[0] for frame in self._stack)
+        self._stack.pop()
+
+        inclusive_count = count - start_count
+        inclusive_time = now - start_time
+        stats = self.functions.get(name)
+        if stats is None:
+            stats = self.functions[name] = {'calls': 0, 'inclusive_count': 0, 'exclusive_count': 0,
+                                            'inclusive_time': 0.0, 'exclusive_time': 0.0}
+        stats['calls'] += 1
+        stats['exclusive_count'] += inclusive_count - children_count
+        stats['exclusive_time'] += inclusive_time - children_time
+        if all(frame[0] != name for frame in self._stack):  # Outermost active call of the function
+            stats['inclusive_count'] += inclusive_count
+            stats['inclusive_time'] += inclusive_time
+        self.stacks[path] = self.stacks.get(path, 0) + inclusive_count - children_count
+        self.spans.append((name, start_time - self._start_time, inclusive_time, inclusive_count))
+
+        if self._stack:
+            self._stack[-1][3] += inclusive_count
+            self._stack[-1][4] += inclusive_time
+
+    def finish(self, count: int):
+        """
+        Stop profiling, calls active at program end are left
+        :param count: number of instructions executed
+        """
+        while self._stack:
+            self.leave(count)
+
+    def write_json(self, stream):
+        """
+        Write function statistics as JSON
+        :param stream: text stream
+        """
+        json.dump({'functions': self.functions}, stream, indent=2)
+        stream.write('\n')
+
+    def write_collapsed(self, stream):
+        """
+        Write exclusive instruction counts of call stacks in collapsed stack format of flamegraph.pl
+        :param stream: text stream
+        """
+        for path, count in sorted(self.stacks.items()):
+            if count > 0:
+                stream.write('{} {}\n'.format(path, count))
+
+    def write_chrome_trace(self, stream):
+        """
+        Write calls as complete events of Chrome trace event format
+        :param stream: text stream
+        """
+        events = [{'name': name, 'cat': 'call', 'ph': 'X', 'ts': start * 1e6, 'dur': duration * 1e6,
+                   'pid': 1, 'tid': 1, 'args': {'instructions': count}}
+                  for name, start, duration, count in self.spans]
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ns'}, stream)
+        stream.write('\n')
@@ -1,20 +1,28 @@
-from xml.etree.ElementTree import Element
-
 import sys
 
 from classes.python.instruction import Instruction
 from classes.python.exceptions import SemanticError, UndefinedVar, UndefinedFrame, MissingValue
 from classes.python.frame import Frame
+from classes.python.output_buffer import OutputBuffer
+from classes.python.input_reader import InputReader
+from classes.python.control_flow import UNCONDITIONAL_JUMPS, CONDITIONAL_JUMPS
 
 __author__ = "Martin Omacht"
 __copyright__ = "Copyright 2018"
 __credits__ = ["Martin Omacht"]
 
+# Frame types bound to module names, avoids Enum class attribute lookups on hot paths
+_GF = Frame.GF
+_LF = Frame.LF
+_TF = Frame.TF
+
 
 class Variable:
     """
     Class representing program variable
     """
+    __slots__ = ('type', 'value')
+
     def __init__(self, var_type=None, value=None):
         """
         Initialize new variable, without arguments creates uninitialized variable
@@ -52,33 +60,173 @@ class Program:
     """
     Class representing IPPcode18 program
     """
-    def __init__(self, xml_dom: Element):
+    # Instructions with label operand as first argument which transfer control
+    BRANCH_OPCODES = ('JUMP', 'JUMPIFEQ', 'JUMPIFNEQ', 'CALL')
+    # Instructions without effect, they are skipped instead of being executed
+    SKIPPED_OPCODES = ('LABEL', 'NOP')
+
+    def __init__(self, xml_dom: 'Element' = None):
         """
         Initialize program
         :param xml_dom: valid XML DOM element
         """
         self._xml_dom = xml_dom
+        self._loaded = None  # Instructions loaded without XML DOM
         self._inst_list = None
-        self._frames = {
-            Frame.GF: dict(),
-            Frame.LF: list(),
-            Frame.TF: None
-        }
+        self._code = None
+        self._global_slots = dict()  # GF variable name to slot mapping
+        self._local_slots = dict()  # LF and TF variable name to slot mapping, shared as TF becomes LF
+        self._global_frame = list()
+        self._local_frames = list()
+        self._tmp_frame = None
         self.labels = dict()
         self.call_stack = list()
         self._curr_inst = 0
         self._data_stack = list()
+        self.output = OutputBuffer(sys.stdout)
+        self.debug_output = OutputBuffer(sys.stderr)
+        self.input = InputReader()
+        self.interactive_input = sys.stdin is not None and sys.stdin.isatty()
+
+    def analyze(self, optimize: bool = False):
+        """
+        Analyze program, finds all labels and checks label duplicity, resolves jump targets, prunes unreachable code,
+        infers variable types, fuses instruction pairs and binds instructions. Has to ba called before interpretation
+        :param optimize: run dataflow optimizer (copy propagation, constant folding, dead store removal)
+        """
+        # Analysis passes are not needed by programs loaded from cache, they are imported only here
+        from classes.python.optimizer import DataflowOptimizer
+        from classes.python.peephole import PeepholeOptimizer
+        from classes.python.type_inference import TypeInference
+
+        if self._xml_dom is not None:
+            ordered_inst = sorted(self._xml_dom, key=lambda i: int(i.attrib['order']))
+            self._loaded = [Instruction.from_xml_dom(instruction) for instruction in ordered_inst]
+            self._xml_dom = None  # DOM is not needed anymore
+
+        self._inst_list = self._loaded
+        self._loaded = None
+        for addr, instruction in enumerate(self._inst_list):
+            if instruction.opcode == 'LABEL':
+                self._add_label(instruction, addr)
+        self._resolve_targets()
+        self._prune_unreachable()
+        self._resolve_slots()
+        if optimize:
+            DataflowOptimizer(self._inst_list).run()
+        TypeInference(self._inst_list).run()
+        PeepholeOptimizer(self._inst_list).run()
+        self._skip_labels()
+        self._link()
+
+    def _link(self):
+        """
+        Prepare analyzed program for interpretation, allocates global frame and binds instructions.
+        Instructions followed by skipped instructions jump over them after execution
+        """
+        self._global_frame = [None] * len(self._global_slots)
+        inst_list = self._inst_list
+        code = [(instruction.fused or instruction).bind(self) for instruction in inst_list]
+        skipped = self._skipped_runs()
+        for addr, instruction in enumerate(inst_list):
+            last = addr + 1 if instruction.fused is not None else addr  # Last instruction executed by the code
+            if last + 1 >= len(inst_list) or skipped[last + 1] == 0 or skipped[addr] > 0:
+                continue
+            opcode = inst_list[last].opcode
+            if opcode not in UNCONDITIONAL_JUMPS and opcode not in CONDITIONAL_JUMPS:
+                code[addr] = self._skipping(code[addr], skipped[last + 1])
+        self._code = code
+
+    def _skipping(self, run: callable, count: int) -> callable:
+        """
+        Extend instruction code to skip following instructions
+        :param run: bound instruction code
+        :param count: number of skipped instructions
+        :return: callable executing the instruction
+        """
+        def run_and_skip():
+            run()
+            self._curr_inst += count
+        return run_and_skip
+
+    def _skipped_runs(self) -> list:
+        """
+        Count skipped instructions in sequence starting at each address
+        :return: list of counts indexed by address
+        """
+        runs = [0] * (len(self._inst_list) + 1)
+        for addr in range(len(self._inst_list) - 1, -1, -1):
+            if self._inst_list[addr].opcode in Program.SKIPPED_OPCODES:
+                runs[addr] = runs[addr + 1] + 1
+        return runs
+
+    def _prune_unreachable(self):
+        """
+        Replace instructions of blocks unreachable from program start by one shared NOP,
+        addresses of remaining instructions are kept
+        """
+        from classes.python.control_flow import ControlFlowGraph
+        cfg = ControlFlowGraph(self._inst_list)
+        pruned = None
+        for block, reached in zip(cfg.blocks, cfg.reachable()):
+            if not reached:
+                if pruned is None:
+                    pruned = Instruction('NOP', [])
+                self._inst_list[block.start:block.end] = [pruned] * (block.end - block.start)
 
-    def analyze(self):
+    def _skip_labels(self):
         """
-        Analyze program, finds all labels and checks label duplicity. Has to ba called before interpretation
+        Retarget jumps and calls to the last of skipped instructions following their label,
+        so execution continues directly with the first effective instruction
         """
-        self._inst_list = list()
-        ordered_inst = sorted(self._xml_dom, key=lambda i: int(i.attrib['order']))
-        for instruction in ordered_inst:
-            self._inst_list.append(Instruction.from_xml_dom(instruction))
-            if self._inst_list[-1].opcode == 'LABEL':
-                self._add_label(self._inst_list[-1], len(self._inst_list) - 1)
+        skipped = self._skipped_runs()
+        for inst in self._inst_list:
+            if inst.opcode in Program.BRANCH_OPCODES and inst.args[0].target is not None:
+                target = inst.args[0].target
+                inst.args[0].target = target + skipped[target] - 1
+
+    def get_analysis(self) -> tuple:
+        """
+        Get result of analysis, can be serialized and passed to from_analysis
+        :return: (instructions, labels, GF slots, LF/TF slots) tuple
+        """
+        assert self._inst_list is not None
+        return self._inst_list, self.labels, self._global_slots, self._local_slots
+
+    def run_inputs(self, input_files: list, jobs: int = None, engine: str = 'interpret') -> list:
+        """
+        Run analyzed program against many input files on pool of forked processes,
+        every run starts from fresh state and has its own outputs
+        :param input_files: list of files with program input
+        :param jobs: number of worker processes, number of CPUs if None
+        :param engine: 'interpret' or 'python'
+        :return: list of (input file, RunResult) pairs in order of input files
+        """
+        from classes.python.batch import run_inputs
+        return run_inputs(self.get_analysis(), input_files, jobs, engine)
+
+    @staticmethod
+    def from_analysis(analysis: tuple):
+        """
+        Create program ready for interpretation from result of analysis
+        :param analysis: tuple returned by get_analysis
+        :return: new Program instance
+        """
+        program = Program()
+        program._inst_list, program.labels, program._global_slots, program._local_slots = analysis
+        program._link()
+        return program
+
+    @staticmethod
+    def from_instructions(instructions: list):
+        """
+        Create program from already loaded instructions
+        :param instructions: list of Instruction instances ordered by their order
+        :return: new Program instance
+        """
+        program = Program()
+        program._loaded = instructions
+        return program
 
     def _add_label(self, inst: Instruction, inst_addr: int):
         """
@@ -91,89 +239,256 @@ class Program:
             raise SemanticError("Pokus o redefinici návěstí {}".format(label))
         self.labels[label] = inst_addr
 
-    def interpret(self):
+    def _resolve_targets(self):
+        """
+        Resolve label operands of jumps and calls to instruction addresses, undefined labels resolve to None
+        """
+        for inst in self._inst_list:
+            if inst.opcode in Program.BRANCH_OPCODES:
+                inst.args[0].target = self.labels.get(inst.args[0].value)
+
+    def _resolve_slots(self):
+        """
+        Assign frame slots to variable arguments. Local frames grow only up to their highest defined slot,
+        so LF/TF names are numbered by functions from the one with the fewest names to keep frames of small
+        (typically recursive) functions small
+        """
+        from classes.python.control_flow import ControlFlowGraph
+        inst_list = self._inst_list
+        bodies = list()
+        for body in ControlFlowGraph(inst_list).function_bodies().values():
+            names = [arg.value for addr in body for arg in inst_list[addr].args
+                     if arg.is_var() and arg.frame is not _GF]
+            bodies.append((len(set(names)), body[0], names))
+        for _, _, names in sorted(bodies):
+            for name in names:
+                self._local_slots.setdefault(name, len(self._local_slots))
+
+        for inst in inst_list:
+            for arg in inst.args:
+                if arg.is_var():
+                    slots = self._global_slots if arg.frame is _GF else self._local_slots
+                    arg.slot = slots.setdefault(arg.value, len(slots))
+
+    def interpret(self, profiler=None, call_profiler=None, trace=None):
         """
         Interpret program, analyze method has to be called before this one
+        :param profiler: Profiler collecting execution counts and times, profiling dispatch loop is used if given
+        :param call_profiler: CallTreeProfiler tracking function calls, call tracking dispatch loop is used if given
+        :param trace: ExecutionTrace recording last executed instructions, tracing dispatch loop is used if given
+        """
+        assert self._code is not None
+        if profiler is not None:
+            self._interpret_profiled(profiler)
+            return
+        if call_profiler is not None:
+            self._interpret_call_tree(call_profiler)
+            return
+        if trace is not None:
+            self._interpret_traced(trace)
+            return
+        code = self._code
+        code_len = len(code)
+        self._curr_inst = 0
+        try:
+            while self._curr_inst < code_len:
+                code[self._curr_inst]()
+                self._curr_inst += 1
+        finally:
+            self.flush_output()
+
+    def _interpret_traced(self, trace):
         """
-        assert self._inst_list is not None
+        Interpret program recording address of each dispatched instruction to trace ring buffer
+        :param trace: ExecutionTrace instance
+        """
+        code = self._code
+        code_len = len(code)
+        trace.start(self._inst_list)
+        record = trace.buffer.append
+        self._curr_inst = 0
+        try:
+            while self._curr_inst < code_len:
+                addr = self._curr_inst
+                record(addr)
+                code[addr]()
+                self._curr_inst += 1
+        finally:
+            self.flush_output()
+
+    def _interpret_profiled(self, profiler):
+        """
+        Interpret program measuring each instruction, instructions are not fused so they are measured separately
+        :param profiler: Profiler instance
+        """
+        code = [instruction.bind(self) for instruction in self._inst_list]
+        code_len = len(code)
+        profiler.start(self._inst_list)
+        counts = profiler.counts
+        times = profiler.times
+        clock = profiler.clock
         self._curr_inst = 0
-        while self._curr_inst < len(self._inst_list):
-            self._inst_list[self._curr_inst].run(self)
-            self._curr_inst += 1
+        try:
+            while self._curr_inst < code_len:
+                addr = self._curr_inst
+                counts[addr] += 1
+                start = clock()
+                code[addr]()
+                times[addr] += clock() - start
+                self._curr_inst += 1
+        finally:
+            self.flush_output()
+
+    def _interpret_call_tree(self, call_profiler):
+        """
+        Interpret program reporting successfully executed CALL and RETURN instructions to call profiler
+        :param call_profiler: CallTreeProfiler instance
+        """
+        code = [instruction.bind(self) for instruction in self._inst_list]
+        code_len = len(code)
+        calls = {addr: inst.args[0].value for addr, inst in enumerate(self._inst_list) if inst.opcode == 'CALL'}
+        hooks = set(calls)
+        hooks.update(addr for addr, inst in enumerate(self._inst_list) if inst.opcode == 'RETURN')
+        count = 0
+        call_profiler.start()
+        self._curr_inst = 0
+        try:
+            while self._curr_inst < code_len:
+                addr = self._curr_inst
+                code[addr]()
+                count += 1
+                if addr in hooks:
+                    if addr in calls:
+                        call_profiler.enter(calls[addr], count)
+                    else:
+                        call_profiler.leave(count)
+                self._curr_inst += 1
+        finally:
+            call_profiler.finish(count)
+            self.flush_output()
+
+    def set_output(self, stream):
+        """
+        Redirect program output (WRITE) to given stream
+        :param stream: text stream
+        """
+        self.output.flush()
+        self.output = OutputBuffer(stream)
+
+    def set_debug_output(self, stream):
+        """
+        Redirect debug output (DPRINT, BREAK) to given stream
+        :param stream: text stream
+        """
+        self.debug_output.flush()
+        self.debug_output = OutputBuffer(stream)
 
-    def jump_to_label(self, label: str):
+    def set_input(self, reader: InputReader):
+        """
+        Read program input (READ) from given reader
+        :param reader: InputReader instance
+        """
+        self.input = reader
+        self.interactive_input = False
+
+    def flush_output(self):
+        """
+        Write buffered program and debug output to their streams
+        """
+        self.output.flush()
+        self.debug_output.flush()
+
+    def jump_to_label(self, label):
         """
         Jump to given label
-        :param label: label name
+        :param label: Arg of type label with resolved target
+        """
+        target = label.target
+        if target is None:
+            raise SemanticError("Skok na neexistující návěstí {}".format(label.value))
+        self._curr_inst = target
+
+    def advance(self):
+        """
+        Move to next instruction, used by superinstructions executing more instructions at once
         """
-        if label not in self.labels:
-            raise SemanticError("Skok na neexistující návěstí {}".format(label))
-        self._curr_inst = self.labels[label]
+        self._curr_inst += 1
 
-    def get_frame(self, frame: Frame):
+    def get_frame(self, frame: Frame) -> list:
         """
         Get frame variables from given frame type
         :param frame: frame type
-        :return: list of variables
+        :return: list of variables indexed by slot, None in place of undefined variable,
+            local frames end after their highest defined slot
         """
-        if frame == Frame.LF:
-            if len(self._frames[frame]) == 0:
+        if frame is _GF:
+            return self._global_frame
+        if frame is _LF:
+            if len(self._local_frames) == 0:
                 raise UndefinedFrame("Pokus o přístup k prázdnému zásobníku lokálních rámců")
-            return self._frames[frame][-1]
-        if frame == Frame.TF and self._frames[frame] is None:
+            return self._local_frames[-1]
+        if self._tmp_frame is None:
             raise UndefinedFrame("Přístup k nedefinovanému rámci {}".format(frame))
-        return self._frames[frame]
+        return self._tmp_frame
 
-    def get_var(self, frame: Frame, var: str):
+    def get_var(self, var):
         """
-        Get variable from given frame
-        :param frame: frame type
-        :param var: variable name
+        Get variable given by variable argument
+        :param var: Arg of type var
         :return: Variable instance
         """
-        frame_vars = self.get_frame(frame)
-        if var not in frame_vars:
-            raise UndefinedVar("Přístup k nedefinované proměnné '{}' na rámci {}".format(var, frame))
-        return frame_vars[var]
+        try:
+            variable = self.get_frame(var.frame)[var.slot]
+        except IndexError:  # Local frames grow on definition of variable
+            variable = None
+        if variable is None:
+            raise UndefinedVar("Přístup k nedefinované proměnné '{}' na rámci {}".format(var.value, var.frame))
+        return variable
 
     def create_tmp_frame(self):
         """
         Create temporary frame, overrides previous one
         """
-        self._frames[Frame.TF] = dict()
+        self._tmp_frame = list()
 
     def push_tmp_frame(self):
         """
         Push temporary frame to stack of local frames, temporary frame becomes undefined
         """
-        self._frames[Frame.LF].append(self.get_frame(Frame.TF))
-        self._frames[Frame.TF] = None
+        self._local_frames.append(self.get_frame(_TF))
+        self._tmp_frame = None
 
     def pop_to_tmp_frame(self):
         """
         Pop local frame from stack to temporary frame, temporary frame is overridden
         """
-        if len(self._frames[Frame.LF]) == 0:
+        if len(self._local_frames) == 0:
             raise UndefinedFrame("Pokus o přístup k prázdnému zásobníku lokálních rámců")
-        self._frames[Frame.TF] = self._frames[Frame.LF].pop()
+        self._tmp_frame = self._local_frames.pop()
 
-    def create_var(self, frame: Frame, name: str):
+    def create_var(self, frame: Frame, slot: int):
         """
         Create uninitialized variable in given frame
         :param frame: frame type
-        :param name: variable name
-        """
-        self.get_frame(frame)[name] = Variable()
+        :param slot: variable slot
+        """
+        variables = self.get_frame(frame)
+        if slot < len(variables):
+            variables[slot] = Variable()
+        else:  # Local frame grows up to the defined slot
+            variables.extend([None] * (slot - len(variables)))
+            variables.append(Variable())
 
-    def call(self, label: str):
+    def call(self, label):
         """
         Call given label as function
-        :param label: label name
+        :param label: Arg of type label with resolved target
         """
-        if label not in self.labels:
-            raise SemanticError("Volání nedefinované funkce {}".format(label))
+        target = label.target
+        if target is None:
+            raise SemanticError("Volání nedefinované funkce {}".format(label.value))
         self.call_stack.append(self._curr_inst)
-        self._curr_inst = self.labels[label]
+        self._curr_inst = target
 
     def ret(self):
         """
@@ -211,13 +526,35 @@ class Program:
         Get current Instruction
         :return: Instruction instance
         """
-        return self._inst_list[self._curr_inst]
+        inst = self._inst_list[self._curr_inst]
+        return inst if inst.origin is None else inst.origin
+
+    def error_message(self, err) -> str:
+        """
+        Get message of error raised during interpretation
+        :param err: raised ApplicationError
+        :return: message with number and opcode of failed instruction
+        """
+        return "Chyba instukce {} ({}): ".format(self.get_inst_number(), self.get_current_inst().opcode) \
+            + err.get_message()
 
     def print_debug(self):
         """
-        Print current program state to stderr
+        Print current program state to debug output (stderr)
+        """
+        write = self.debug_output.write
+        write('Current instruction: {}\n'.format(self._curr_inst))
+        write('Global frame: {}\n'.format(self._frame_repr(self.get_frame(_GF), self._global_slots)))
+        write('Temporary frame: {}\n'.format(self._frame_repr(self.get_frame(_TF), self._local_slots)))
+        write('Local frame: {}\n'.format(self._frame_repr(self.get_frame(_LF), self._local_slots)))
+
+    @staticmethod
+    def _frame_repr(frame: list, slots: dict) -> str:
+        """
+        Representation of frame variables by name
+        :param frame: list of variables indexed by slot
+        :param slots: variable name to slot mapping
+        :return: frame representation
         """
-        print('Current instruction: {}'.format(self._curr_inst), file=sys.stderr)
-        print('Global frame: {}'.format(repr(self.get_frame(Frame.GF))), file=sys.stderr)
-        print('Temporary frame: {}'.format(repr(self.get_frame(Frame.TF))), file=sys.stderr)
-        print('Local frame: {}'.format(repr(self.get_frame(Frame.LF))), file=sys.stderr)
+        return repr({name: frame[slot] for name, slot in slots.items()
+                     if slot < len(frame) and frame[slot] is not None})
@@ -0,0 +1,151 @@
+from classes.python.program import Program
+from classes.python import __version__
+import gc
+import hashlib
+import os
+import pickle
+import sys
+
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024  # Cache size limit in bytes
+_CACHE_SUFFIX = '.pickle'
+
+# Modules whose code determines analysis result and its pickled form, their sources are part of the cache key,
+# so changed analysis never serves entries of older code
+ANALYSIS_MODULES = ('program', 'instruction', 'arg', 'frame', 'control_flow', 'type_inference', 'optimizer',
+                    'peephole', 'lexical_analyzer', 'ipp_parser', 'source_parser')
+_code_digest = None
+
+
+def code_digest() -> bytes:
+    """
+    Get digest of analysis modules sources, computed once per process
+    :return: digest bytes
+    """
+    global _code_digest
+    if _code_digest is None:
+        digest = hashlib.sha256()
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for module in ANALYSIS_MODULES:
+            with open(os.path.join(directory, module + '.py'), 'rb') as file:
+                digest.update(file.read())
+        _code_digest = digest.digest()
+    return _code_digest
+
+
+def default_cache_dir() -> str:
+    """
+    Get default cache directory
+    :return: directory path
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'ipp-interpret')
+
+
+class ProgramCache:
+    """
+    Content addressed cache of analyzed programs, entries are keyed by hash of XML source,
+    interpreter version and sources of analysis modules. Least recently used entries are evicted when cache exceeds its size limit.
+    Cache failures are never fatal, broken or unreadable entry is treated as a miss.
+    """
+    def __init__(self, cache_dir: str = None, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Initialize cache
+        :param cache_dir: cache directory, created on first store
+        :param max_size: size limit in bytes
+        """
+        self._dir = cache_dir if cache_dir is not None else default_cache_dir()
+        self._max_size = max_size
+
+    @staticmethod
+    def key(xml: bytes, optimize: bool = False) -> str:
+        """
+        Get cache key of XML source
+        :param xml: XML source bytes
+        :param optimize: program is analyzed with optimizations
+        :return: key string
+        """
+        digest = hashlib.sha256()
+        digest.update('{}/{}.{}/{}/{}\0'.format(__version__, sys.version_info[0], sys.version_info[1],
+                                                pickle.HIGHEST_PROTOCOL, int(optimize)).encode())
+        digest.update(code_digest())
+        digest.update(xml)
+        return digest.hexdigest()
+
+    def load(self, key: str):
+        """
+        Load analyzed program from cache
+        :param key: cache key
+        :return: Program ready for interpretation or None on cache miss
+        """
+        path = self._path(key)
+        gc_enabled = gc.isenabled()
+        gc.disable()  # Loading creates many objects but no garbage, collections would only slow it down
+        try:
+            with open(path, 'rb') as file:
+                analysis = pickle.load(file)
+            os.utime(path)  # Mark entry as recently used
+            return Program.from_analysis(analysis)
+        except Exception:
+            return None
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def store(self, key: str, program: Program):
+        """
+        Store analyzed program to cache and evict least recently used entries over size limit
+        :param key: cache key
+        :param program: analyzed program
+        """
+        path = self._path(key)
+        tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+        try:
+            os.makedirs(self._dir, exist_ok=True)
+            with open(tmp_path, 'wb') as file:
+                pickle.dump(program.get_analysis(), file, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            self._evict()
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _evict(self):
+        """
+        Remove least recently used entries until cache fits its size limit
+        """
+        entries = list()
+        total = 0
+        for entry in os.scandir(self._dir):
+            if not entry.name.endswith(_CACHE_SUFFIX):
+                continue
+            try:
+                info = entry.stat()
+            except OSError:
+                continue
+            entries.append((info.st_mtime, info.st_size, entry.path))
+            total += info.st_size
+
+        entries.sort()
+        for mtime, size, path in entries:
+            if total <= self._max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def _path(self, key: str) -> str:
+        """
+        Get path of cache entry
+        :param key: cache key
+        :return: file path
+        """
+        return os.path.join(self._dir, key + _CACHE_SUFFIX)
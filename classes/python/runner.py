@@ -0,0 +1,106 @@
+from classes.python.exceptions import ApplicationError, InternalError
+from classes.python.exit_codes import EXIT_SUCCESS, INTERN_ERROR
+from classes.python.input_reader import InputReader
+from classes.python.ipp_parser import IPPParser
+from classes.python.program import Program
+from classes.python.source_parser import load_instructions
+import io
+
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+class RunResult:
+    """
+    Result of program run with captured outputs
+    """
+    __slots__ = ('stdout', 'stderr', 'exit_code')
+
+    def __init__(self, stdout: bytes, stderr: bytes, exit_code: int):
+        """
+        Initialize result
+        :param stdout: program output
+        :param stderr: debug output and error message
+        :param exit_code: exit code the interpreter would exit with
+        """
+        self.stdout = stdout
+        self.stderr = stderr
+        self.exit_code = exit_code
+
+    @staticmethod
+    def from_error(err: ApplicationError):
+        """
+        Create result of run which failed before the program was started
+        :param err: raised error
+        :return: new RunResult instance
+        """
+        return RunResult(b'', (err.get_message() + '\n').encode(), err.get_exit_code())
+
+
+def analyze(parser: IPPParser, xml: bytes, optimize: bool = False) -> tuple:
+    """
+    Load and analyze program from IPPcode18 source or its XML representation
+    :param parser: XML parser
+    :param xml: source or XML bytes
+    :param optimize: analyze program with optimizations
+    :return: result of analysis, Program.from_analysis creates runnable program from it
+    :raise ApplicationError: on invalid program, other failures are raised as InternalError
+    """
+    try:
+        program = Program.from_instructions(load_instructions(xml, parser))
+        program.analyze(optimize)
+    except ApplicationError:
+        raise
+    except Exception as err:  # Failed load must not affect other programs
+        raise InternalError('{}: {}'.format(type(err).__name__, err))
+    return program.get_analysis()
+
+
+def execute(analysis: tuple, stdin: bytes, engine: str = 'interpret') -> RunResult:
+    """
+    Run fresh program created from analysis with isolated input and outputs,
+    errors are reported by exit code and message instead of being raised
+    :param analysis: result of analysis
+    :param stdin: program input
+    :param engine: 'interpret' or 'python'
+    :return: run result
+    """
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    program = Program.from_analysis(analysis)
+    program.set_input(InputReader(io.BytesIO(stdin)))
+    program.set_output(stdout)
+    program.set_debug_output(stderr)
+    exit_code = EXIT_SUCCESS
+    try:
+        run = program.interpret
+        if engine == 'python':
+            from classes.python.transpiler import Transpiler
+            run = Transpiler(program).compile()
+        run()
+    except ApplicationError as err:
+        stderr.write(program.error_message(err) + '\n')
+        exit_code = err.get_exit_code()
+    except Exception as err:  # Failed run must not affect others
+        stderr.write('{}: {}\n'.format(type(err).__name__, err))
+        exit_code = INTERN_ERROR
+    return RunResult(stdout.getvalue().encode(), stderr.getvalue().encode(), exit_code)
+
+
+def run_source(parser: IPPParser, xml: bytes, stdin: bytes, optimize: bool = False,
+               engine: str = 'interpret') -> RunResult:
+    """
+    Load, analyze and run program from IPPcode18 source or its XML representation
+    :param parser: XML parser
+    :param xml: source or XML bytes
+    :param stdin: program input
+    :param optimize: analyze program with optimizations
+    :param engine: 'interpret' or 'python'
+    :return: run result, errors of loading are reported by exit code and message too
+    """
+    try:
+        analysis = analyze(parser, xml, optimize)
+    except ApplicationError as err:
+        return RunResult.from_error(err)
+    return execute(analysis, stdin, engine)
@@ -0,0 +1,167 @@
+from classes.python.ipp_parser import IPPParser
+from classes.python.runner import RunResult, run_source
+import gc
+import os
+import signal
+import socket
+import stat
+import struct
+
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+# Request is XML source and program input, both prefixed by their length
+REQUEST_HEADER = struct.Struct('!II')
+# Response is exit code and lengths of stdout and stderr followed by them
+RESPONSE_HEADER = struct.Struct('!iII')
+
+DEFAULT_MAX_REQUESTS = 1000  # Requests served by worker before it is replaced by a fresh one
+
+
+def _receive(conn: socket.socket, size: int) -> bytes:
+    """
+    Receive exactly given number of bytes
+    :param conn: connected socket
+    :param size: number of bytes
+    :return: received bytes
+    """
+    parts = list()
+    while size > 0:
+        part = conn.recv(min(size, 1 << 20))
+        if not part:
+            raise ConnectionError('Connection closed')
+        parts.append(part)
+        size -= len(part)
+    return b''.join(parts)
+
+
+def request(path: str, xml: bytes, stdin: bytes) -> RunResult:
+    """
+    Run program by server listening on given socket
+    :param path: Unix domain socket path
+    :param xml: XML source
+    :param stdin: program input
+    :return: run result
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(path)
+        conn.sendall(REQUEST_HEADER.pack(len(xml), len(stdin)) + xml + stdin)
+        exit_code, stdout_len, stderr_len = RESPONSE_HEADER.unpack(_receive(conn, RESPONSE_HEADER.size))
+        stdout = _receive(conn, stdout_len)
+        return RunResult(stdout, _receive(conn, stderr_len), exit_code)
+
+
+class Server:
+    """
+    Interpreter daemon listening on Unix domain socket. Everything is imported once in the main process,
+    which then forks workers accepting connections on the shared socket. Each connection carries one request.
+    Workers are replaced when they exit, after serving max_requests requests or on crash
+    """
+    def __init__(self, path: str, workers: int = None, optimize: bool = False, engine: str = 'interpret',
+                 max_requests: int = DEFAULT_MAX_REQUESTS):
+        """
+        Initialize server
+        :param path: Unix domain socket path
+        :param workers: number of worker processes, number of CPUs if None
+        :param optimize: analyze programs with optimizations
+        :param engine: 'interpret' or 'python'
+        :param max_requests: number of requests served by one worker
+        """
+        self.path = path
+        self.workers = workers or os.cpu_count() or 1
+        self.optimize = optimize
+        self.engine = engine
+        self.max_requests = max_requests
+        self._children = set()
+
+    def serve_forever(self):
+        """
+        Listen and keep workers running until SIGTERM or SIGINT, socket file is removed afterwards
+        """
+        self._remove_socket()
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        previous_handler = signal.signal(signal.SIGTERM, self._terminate)
+        try:
+            listener.bind(self.path)
+            listener.listen(128)
+            if hasattr(gc, 'freeze'):  # Keep objects created so far out of collections, so workers share their pages
+                gc.freeze()
+            while True:
+                while len(self._children) < self.workers:
+                    self._fork_worker(listener)
+                pid, status = os.wait()
+                self._children.discard(pid)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            signal.signal(signal.SIGTERM, previous_handler)
+            for pid in self._children:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                    os.waitpid(pid, 0)
+                except OSError:
+                    pass
+            self._children.clear()
+            listener.close()
+            self._remove_socket()
+
+    @staticmethod
+    def _terminate(signum, frame):
+        """
+        SIGTERM handler of main process, stops serving
+        """
+        raise KeyboardInterrupt()
+
+    def _fork_worker(self, listener: socket.socket):
+        """
+        Start worker process
+        :param listener: listening socket
+        """
+        pid = os.fork()
+        if pid != 0:
+            self._children.add(pid)
+            return
+
+        code = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            self._work(listener)
+        except BaseException:
+            code = 1
+        finally:
+            os._exit(code)  # Never return to the main process code
+
+    def _work(self, listener: socket.socket):
+        """
+        Serve requests in worker process
+        :param listener: listening socket
+        """
+        parser = IPPParser()
+        for _ in range(self.max_requests):
+            conn, address = listener.accept()
+            with conn:
+                try:
+                    xml_len, stdin_len = REQUEST_HEADER.unpack(_receive(conn, REQUEST_HEADER.size))
+                    xml = _receive(conn, xml_len)
+                    stdin = _receive(conn, stdin_len)
+                except OSError:
+                    continue
+                result = run_source(parser, xml, stdin, self.optimize, self.engine)
+                try:
+                    conn.sendall(RESPONSE_HEADER.pack(result.exit_code, len(result.stdout), len(result.stderr))
+                                 + result.stdout + result.stderr)
+                except OSError:
+                    pass
+
+    def _remove_socket(self):
+        """
+        Remove socket file left by previous server, other files are never removed
+        """
+        try:
+            if stat.S_ISSOCK(os.stat(self.path).st_mode):
+                os.remove(self.path)
+        except OSError:
+            pass
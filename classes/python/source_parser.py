@@ -0,0 +1,157 @@
+from classes.python.exceptions import SourceError, ApplicationError
+from classes.python.exit_codes import INPUT_FILE_ERROR
+from classes.python.instruction import Instruction
+from classes.python.arg import Arg, ArgType
+from classes.python import lexical_analyzer
+
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+HEADER = '.ippcode18'
+COMMENT_SEPARATOR = '#'
+
+
+def is_source(data) -> bool:
+    """
+    Check if data is IPPcode18 source text instead of its XML representation. Everything which does not start
+    with XML markup is source text, so invalid sources are reported by the source parser
+    :param data: string or bytes
+    :return: True if data is source text
+    """
+    if isinstance(data, bytes):
+        return not data.lstrip(b'\xef\xbb\xbf \t\r\n').startswith(b'<')
+    return not data.lstrip('\ufeff \t\r\n').startswith('<')
+
+
+def load_instructions(data, xml_parser=None) -> list:
+    """
+    Load instructions from IPPcode18 source text or its XML representation
+    :param data: string or bytes with source or XML
+    :param xml_parser: IPPParser used for XML, new one is created if None
+    :return: list of Instruction instances ordered by their order
+    """
+    if is_source(data):
+        return SourceParser().load_from_string(data)
+    if xml_parser is None:
+        from classes.python.ipp_parser import IPPParser
+        xml_parser = IPPParser()
+    return xml_parser.load_from_string(data)
+
+
+class SourceParser:
+    """
+    Parse IPPcode18 source text directly to instructions, accepts the same sources as parse.php.
+    Values which parse.php passes to XML unchecked (int constants) are checked like XML arguments
+    """
+    # Argument kinds of parse.php by argument checkers of Instruction.INSTRUCTION_ARGS
+    _VAR = 'var'
+    _SYMB = 'symb'
+    _LABEL = 'label'
+    _TYPE = 'type'
+    _ARG_KINDS = {
+        ArgType.arg_dest: _VAR,
+        ArgType.arg_label: _LABEL,
+        ArgType.arg_type: _TYPE
+    }
+
+    def __init__(self):
+        """
+        Initialize parser
+        """
+        self.line_num = 0
+        self._opcode_kinds = {opcode: [self._ARG_KINDS.get(checker, self._SYMB) for checker in checkers]
+                              for opcode, checkers in Instruction.INSTRUCTION_ARGS.items()}
+
+    def load_from_file(self, file: str) -> list:
+        """
+        Load instructions from given source file
+        :param file: file with source code
+        :return: list of Instruction instances
+        """
+        try:
+            with open(file, 'rb') as stream:
+                source = stream.read()
+        except OSError:
+            raise ApplicationError("Nepodařilo se otevřít vstupní soubor '{}'".format(file), INPUT_FILE_ERROR)
+        return self.load_from_string(source)
+
+    def load_from_string(self, source) -> list:
+        """
+        Load instructions from given source text
+        :param source: string or UTF-8 bytes with source code
+        :return: list of Instruction instances
+        """
+        if isinstance(source, bytes):
+            try:
+                source = source.decode('utf-8')
+            except UnicodeDecodeError:
+                raise SourceError('Zdrojový kód není v kódování UTF-8')
+
+        lines = source.split('\n')
+        self.line_num = 1
+        header = self._strip(lines[0])
+        if header.lower() != HEADER:
+            raise self._error('Očekávána hlavička {}, nalezeno "{}"'.format(HEADER, header))
+
+        instructions = list()
+        for line in lines[1:]:
+            self.line_num += 1
+            tokens = self._strip(line).split()
+            if tokens:
+                instructions.append(self._build_instruction(tokens, len(instructions) + 1))
+        return instructions
+
+    @staticmethod
+    def _strip(line: str) -> str:
+        """
+        Remove comment and surrounding whitespace from line
+        :param line: source line
+        :return: stripped line
+        """
+        return line.partition(COMMENT_SEPARATOR)[0].strip()
+
+    def _error(self, message: str) -> SourceError:
+        """
+        Create error of current line
+        :param message: error description
+        :return: SourceError instance
+        """
+        return SourceError('Řádek {}: {}'.format(self.line_num, message))
+
+    def _build_instruction(self, tokens: list, order: int) -> Instruction:
+        """
+        Build instruction from line tokens
+        :param tokens: opcode and argument tokens
+        :param order: instruction order
+        :return: new Instruction instance
+        """
+        opcode = tokens[0].upper()
+        kinds = self._opcode_kinds.get(opcode)
+        if kinds is None:
+            raise self._error('Neplatný operační kód "{}"'.format(tokens[0]))
+        if len(tokens) - 1 != len(kinds):
+            raise self._error('Instrukce {} očekává {} argumentů, nalezeno {}'.format(
+                opcode, len(kinds), len(tokens) - 1))
+        return Instruction(opcode, [self._build_arg(kind, token) for kind, token in zip(kinds, tokens[1:])], order)
+
+    def _build_arg(self, kind: str, token: str) -> Arg:
+        """
+        Build argument from token
+        :param kind: argument kind of parse.php
+        :param token: argument token
+        :return: new Arg instance
+        """
+        if kind == self._SYMB and not lexical_analyzer.is_valid('var', token):
+            arg_type, sep, value = token.partition('@')
+            if arg_type == 'int' and value:
+                lexical_analyzer.check_validity(arg_type, value)
+            elif arg_type not in ('bool', 'string') or not sep or not lexical_analyzer.is_valid(arg_type, value):
+                raise self._error('Neplatný argument "{}"'.format(token))
+            return Arg(arg_type, value)
+        if kind == self._SYMB:
+            kind = self._VAR
+        if not lexical_analyzer.is_valid(kind, token):
+            raise self._error('Neplatný argument "{}"'.format(token))
+        return Arg(kind, token)
@@ -0,0 +1,280 @@
+from classes.python.exit_codes import EXIT_SUCCESS
+from concurrent.futures import ProcessPoolExecutor
+import os
+import subprocess
+import sys
+import tempfile
+
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+# Extensions and default contents of test files
+TEST_FILES = {
+    'src': '',
+    'in': '',
+    'out': '',
+    'rc': str(EXIT_SUCCESS)
+}
+
+
+class TesterConfig:
+    """
+    Scripts and interpreters used by tests
+    """
+    def __init__(self, parse_script: str = './parse.php', int_script: str = './interpret.py',
+                 php_int: str = 'php', py_int: str = sys.executable, temp_dir: str = None):
+        """
+        Initialize configuration
+        :param parse_script: parse script path
+        :param int_script: interpret script path
+        :param php_int: PHP interpreter running parse script
+        :param py_int: Python interpreter running interpret script
+        :param temp_dir: directory for temporary files, system one if None
+        """
+        self.parse_script = parse_script
+        self.int_script = int_script
+        self.php_int = php_int
+        self.py_int = py_int
+        self.temp_dir = temp_dir
+
+
+class TestResult:
+    """
+    Holds test result information
+    """
+    # Test error types
+    ERROR_PARSE_RETURN_CODE = 0
+    ERROR_INT_RETURN_CODE = 1
+    ERROR_OUT_DIFF = 2
+
+    def __init__(self, name: str):
+        """
+        Initialize successful result
+        :param name: test name with subdirectories
+        """
+        self.name = name
+        self.error = None
+
+    def set_error(self, error_type: int, details: dict, stderr: str):
+        """
+        Set test error
+        :param error_type: test error type
+        :param details: error details depending on type
+        :param stderr: standard error output of tested script
+        """
+        self.error = {'type': error_type, 'details': details, 'stderr': stderr}
+
+    def has_error(self) -> bool:
+        """
+        Check if test failed
+        :return: True if result has error
+        """
+        return self.error is not None
+
+
+class TestCase:
+    """
+    Test given by .src file and .in, .out and .rc files of the same name
+    """
+    def __init__(self, src_path: str, directory: str):
+        """
+        Initialize test, missing test files are generated with default content
+        :param src_path: source file path
+        :param directory: tested directory, test name is relative to it
+        """
+        self.base_path = src_path[:-len('.src')]
+        self.name = os.path.relpath(self.base_path, directory)
+        for extension, default in TEST_FILES.items():
+            path = self.path(extension)
+            if not os.path.exists(path):
+                with open(path, 'w') as file:
+                    file.write(default)
+
+    def path(self, extension: str) -> str:
+        """
+        Get path of test file
+        :param extension: file extension without dot
+        :return: file path
+        """
+        return '{}.{}'.format(self.base_path, extension)
+
+    def run(self, config: TesterConfig) -> TestResult:
+        """
+        Run test, source is parsed by parse script and the result is interpreted
+        :param config: tester configuration
+        :return: test result
+        """
+        result = TestResult(self.name)
+        expected_rc = self._expected_rc()
+        with open(self.path('src'), 'rb') as src, tempfile.TemporaryFile(dir=config.temp_dir) as stderr:
+            parse = subprocess.run([config.php_int, config.parse_script], stdin=src, stdout=subprocess.PIPE,
+                                   stderr=stderr)
+            if parse.returncode != EXIT_SUCCESS:
+                if parse.returncode != expected_rc:
+                    result.set_error(TestResult.ERROR_PARSE_RETURN_CODE,
+                                     {'expected': expected_rc, 'actual': parse.returncode}, self._read(stderr))
+                return result
+
+        with tempfile.NamedTemporaryFile(dir=config.temp_dir, suffix='.xml', delete=False) as xml:
+            xml.write(parse.stdout)
+        try:
+            self._test_interpret(config, xml.name, expected_rc, result)
+        finally:
+            os.remove(xml.name)
+        return result
+
+    def _test_interpret(self, config: TesterConfig, xml_path: str, expected_rc: int, result: TestResult):
+        """
+        Run interpret script comparing its output with expected one while it is produced
+        :param config: tester configuration
+        :param xml_path: file with parsed source
+        :param expected_rc: expected return code or invalid .rc file content
+        :param result: test result to set error to
+        """
+        with open(self.path('in'), 'rb') as stdin, open(self.path('out'), 'rb') as expected, \
+                tempfile.TemporaryFile(dir=config.temp_dir) as stderr:
+            process = subprocess.Popen([config.py_int, config.int_script, '--source=' + xml_path],
+                                       stdin=stdin, stdout=subprocess.PIPE, stderr=stderr)
+            with process.stdout:
+                difference = self._compare(expected, process.stdout)
+            rc = process.wait()
+
+            if rc != expected_rc:
+                result.set_error(TestResult.ERROR_INT_RETURN_CODE, {'expected': expected_rc, 'actual': rc},
+                                 self._read(stderr))
+            elif expected_rc == EXIT_SUCCESS and difference is not None:
+                result.set_error(TestResult.ERROR_OUT_DIFF, difference, self._read(stderr))
+
+    @staticmethod
+    def _compare(expected, actual):
+        """
+        Compare streams line by line, actual stream is always read to its end
+        :param expected: binary stream with expected output
+        :param actual: binary stream with actual output
+        :return: None if streams are equal, dictionary with first different line otherwise
+        """
+        line_number = 0
+        difference = None
+        for actual_line in actual:
+            line_number += 1
+            if difference is None:
+                expected_line = expected.readline()
+                if expected_line != actual_line:
+                    difference = TestCase._difference(line_number, expected_line, actual_line)
+        if difference is None:
+            expected_line = expected.readline()
+            if expected_line:
+                difference = TestCase._difference(line_number + 1, expected_line, b'')
+        return difference
+
+    @staticmethod
+    def _difference(line_number: int, expected_line: bytes, actual_line: bytes) -> dict:
+        """
+        Describe different line in diff notation
+        :param line_number: line number
+        :param expected_line: expected line, empty if expected output ended
+        :param actual_line: actual line, empty if actual output ended
+        :return: dictionary with diff key
+        """
+        if not actual_line:
+            lines = ['{}d{}'.format(line_number, line_number - 1)]
+        elif not expected_line:
+            lines = ['{}a{}'.format(line_number - 1, line_number)]
+        else:
+            lines = ['{}c{}'.format(line_number, line_number)]
+        if expected_line:
+            lines.append('< ' + expected_line.decode(errors='replace').rstrip('\n'))
+        if expected_line and actual_line:
+            lines.append('---')
+        if actual_line:
+            lines.append('> ' + actual_line.decode(errors='replace').rstrip('\n'))
+        return {'diff': '\n'.join(lines)}
+
+    def _expected_rc(self):
+        """
+        Get expected return code from .rc file
+        :return: return code, raw file content if it is not a number, so no return code matches it
+        """
+        with open(self.path('rc')) as file:
+            content = file.read().strip()
+        try:
+            return int(content) if content else EXIT_SUCCESS
+        except ValueError:
+            return content
+
+    @staticmethod
+    def _read(stream) -> str:
+        """
+        Read whole temporary file
+        :param stream: binary file
+        :return: decoded content
+        """
+        stream.seek(0)
+        return stream.read().decode(errors='replace')
+
+
+def find_tests(directory: str, recursive: bool = False) -> list:
+    """
+    Find test source files
+    :param directory: searched directory
+    :param recursive: search subdirectories too
+    :return: sorted list of .src file paths
+    """
+    sources = list()
+    for root, dirs, files in os.walk(directory):
+        sources.extend(os.path.join(root, file) for file in files if file.lower().endswith('.src'))
+        if not recursive:
+            break
+    return sorted(sources)
+
+
+def _run_test(test: TestCase, config: TesterConfig) -> TestResult:
+    """
+    Run test in worker process
+    :param test: test case
+    :param config: tester configuration
+    :return: test result
+    """
+    return test.run(config)
+
+
+def run_tests(tests: list, config: TesterConfig, jobs: int = None) -> list:
+    """
+    Run tests on pool of processes
+    :param tests: list of TestCase instances
+    :param config: tester configuration
+    :param jobs: number of worker processes, number of CPUs if None
+    :return: list of results in order of tests
+    """
+    if jobs == 1:
+        return [test.run(config) for test in tests]
+    with ProcessPoolExecutor(jobs) as executor:
+        return list(executor.map(_run_test, tests, [config] * len(tests)))
+
+
+def write_text_output(results: list, stream):
+    """
+    Write errors of failed tests and summary in text form
+    :param results: list of TestResult instances
+    :param stream: text stream
+    """
+    messages = {
+        TestResult.ERROR_PARSE_RETURN_CODE: 'Unexpected parse return code',
+        TestResult.ERROR_INT_RETURN_CODE: 'Unexpected interpret return code',
+        TestResult.ERROR_OUT_DIFF: 'Different interpret output'
+    }
+    for result in results:
+        if not result.has_error():
+            continue
+        error = result.error
+        stream.write('{}:\n{}\n'.format(result.name, messages[error['type']]))
+        if error['type'] == TestResult.ERROR_OUT_DIFF:
+            stream.write(error['details']['diff'] + '\n')
+        else:
+            stream.write('Expected: {}\nActual: {}\n\n'.format(error['details']['expected'],
+                                                              error['details']['actual']))
+        stream.write('STDERR:\n{}\n\n'.format(error['stderr']))
+    successful = sum(1 for result in results if not result.has_error())
+    stream.write('{}/{} Successful tests.'.format(successful, len(results)))
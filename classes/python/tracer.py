@@ -0,0 +1,89 @@
+from classes.python.exceptions import ApplicationError
+from classes.python.program import Variable
+from collections import deque
+
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+DEFAULT_SIZE = 64  # Number of recorded instructions
+
+
+class ExecutionTrace:
+    """
+    Ring buffer of addresses of last executed instructions, filled by Program.interpret when trace is given.
+    Buffer is a deque of fixed length prefilled with None, appending to it is the cheapest way of recording.
+    Only addresses are recorded during execution to keep the overhead low, so operand values of earlier
+    instructions are not known when the trace is written, only the failing instruction is shown with its operands
+    """
+    def __init__(self, size: int = DEFAULT_SIZE):
+        """
+        Initialize trace with preallocated buffer
+        :param size: number of recorded instructions
+        """
+        assert size > 0
+        self.size = size
+        self.buffer = deque([None] * size, size)  # Instruction addresses from the oldest one, None in unused places
+        self._inst_list = list()
+
+    def start(self, inst_list: list):
+        """
+        Prepare trace for program run
+        :param inst_list: analyzed instruction list of traced program
+        """
+        self._inst_list = inst_list
+        self.buffer = deque([None] * self.size, self.size)
+
+    def entries(self, context) -> list:
+        """
+        Get recorded instructions, superinstructions are expanded to their executed parts
+        :param context: traced Program
+        :return: list of at most size Instruction instances from the oldest one
+        """
+        addresses = [addr for addr in self.buffer if addr is not None]
+        last_addr = context.get_inst_number() - 1
+        entries = list()
+        for i, addr in enumerate(addresses):
+            inst = self._inst_list[addr]
+            if inst.fused is None:
+                entries.append(inst)
+                continue
+            for part_addr in range(addr, addr + len(inst.fused.parts)):
+                if i + 1 == len(addresses) and part_addr > last_addr:  # Superinstruction failed in earlier part
+                    break
+                entries.append(self._inst_list[part_addr])
+        return [inst if inst.origin is None else inst.origin for inst in entries[-self.size:]]
+
+    def write(self, stream, context):
+        """
+        Write order and opcode of recorded instructions from the oldest one, the last one is the failing instruction
+        and its operands are written with values variables have at the time of the error
+        :param stream: text stream
+        :param context: traced Program
+        """
+        stream.write('Posledních {} provedených instrukcí:\n'.format(self.size))
+        entries = self.entries(context)
+        for inst in entries[:-1]:
+            stream.write('{:>8} {}\n'.format(inst.order, inst.opcode))
+        for inst in entries[-1:]:
+            stream.write('{:>8} {:<12} {}\n'.format(
+                inst.order, inst.opcode, ', '.join(self._arg_repr(arg, context) for arg in inst.args)))
+
+    @staticmethod
+    def _arg_repr(arg, context) -> str:
+        """
+        Representation of instruction argument, variables are shown with their current values
+        :param arg: Arg instance
+        :param context: traced Program
+        :return: argument representation
+        """
+        if arg.is_var():
+            try:
+                variable = context.get_frame(arg.frame)[arg.slot]
+            except (ApplicationError, IndexError):
+                variable = None
+            return '{}@{}: {}'.format(arg.frame, arg.value, 'undefined' if variable is None else repr(variable))
+        if arg.type in ('label', 'type'):
+            return '{}@{}'.format(arg.type, arg.value)
+        return repr(Variable(arg.type, arg.value))
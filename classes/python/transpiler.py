@@ -0,0 +1,455 @@
+from classes.python.arg import Arg, ArgType
+from classes.python.frame import Frame
+from classes.python.instruction import Instruction
+from classes.python.program import Program, Variable
+
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+class _Undefined:
+    """
+    Value of undefined global variable in translated program
+    """
+    def __repr__(self):
+        return 'UNDEF'
+
+
+_UNDEF = _Undefined()
+
+# Data type names by Python type of value
+_TYPE_NAMES = {
+    int: 'int',
+    bool: 'bool',
+    str: 'string',
+    type(None): ''
+}
+
+# Python types of literal argument types
+_LITERAL_TYPES = {
+    'int': 'int',
+    'bool': 'bool',
+    'string': 'str'
+}
+
+# Guards of argument checks on global variable, {} is replaced by variable name
+_CHECK_GUARDS = {
+    ArgType.arg_int: 'type({}) is int',
+    ArgType.arg_bool: 'type({}) is bool',
+    ArgType.arg_string: 'type({}) is str',
+    ArgType.arg_any: '{0} is not None and {0} is not UNDEF'
+}
+
+# Expressions of binary instructions, {0} and {1} are replaced by operands
+_BINARY_OPS = {
+    'ADD': '{0} + {1}',
+    'SUB': '{0} - {1}',
+    'MUL': '{0} * {1}',
+    'IDIV': '{0} // {1}',
+    'LT': '{0} < {1}',
+    'GT': '{0} > {1}',
+    'EQ': '{0} == {1}',
+    'AND': '{0} & {1}',
+    'OR': '{0} | {1}',
+    'CONCAT': '{0} + {1}',
+    'STRI2INT': 'ord({0}[{1}])',
+    'GETCHAR': '{0}[{1}]'
+}
+
+# Expressions of unary instructions, {0} is replaced by operand
+_UNARY_OPS = {
+    'NOT': 'not {0}',
+    'INT2CHAR': 'chr({0})',
+    'STRLEN': 'len({0})'
+}
+
+# Opcodes writing variable given by first argument
+_WRITING_OPCODES = ('MOVE', 'DEFVAR', 'POPS', 'READ', 'TYPE', 'SETCHAR') + tuple(_BINARY_OPS) + tuple(_UNARY_OPS)
+
+
+def _variable(value) -> Variable:
+    """
+    Convert value of global variable in translated program to program frame variable
+    :param value: variable value
+    :return: Variable instance or None if variable is undefined
+    """
+    if value is _UNDEF:
+        return None
+    if value is None:
+        return Variable()
+    return Variable(_TYPE_NAMES[type(value)], value)
+
+
+def _value(variable: Variable):
+    """
+    Convert program frame variable to value of global variable in translated program
+    :param variable: Variable instance or None
+    :return: variable value
+    """
+    if variable is None:
+        return _UNDEF
+    return variable.value
+
+
+def _str(value) -> str:
+    """
+    Convert value to string as WRITE does
+    :param value: int, bool or str value
+    :return: string representation
+    """
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    return str(value)
+
+
+class Transpiler:
+    """
+    Translates analyzed program to Python function, so instructions are executed by Python virtual machine.
+    Code following jump targets and return sites forms regions, which are selected by binary tree of ifs
+    inside a loop. Global variables are function locals, their type is given by type of Python value.
+    Each instruction is executed by inlined code guarded by conditions under which it can not fail.
+    If guard does not hold or instruction works with other frames, its bound code is run on program state
+    instead, so errors and their instruction numbers are the same as in Program.interpret.
+    """
+    def __init__(self, program: Program):
+        """
+        Initialize transpiler
+        :param program: analyzed program
+        """
+        self._program = program
+        self._inst_list, _, global_slots, _ = program.get_analysis()
+        self._slot_count = len(global_slots)
+        self._fallbacks = dict()  # Bound instruction code by address
+        self._returns = dict()  # Region of return site by CALL address
+        self._regions = dict()  # Region index by address of its first instruction
+        self._defined = set()  # Slots of global variables known to be defined at current point of region
+        self._lines = list()
+
+    def source(self) -> str:
+        """
+        Get Python source of translated program
+        :return: source code defining function run()
+        """
+        if len(self._lines) == 0:
+            self._translate()
+        return '\n'.join(self._lines) + '\n'
+
+    def compile(self) -> callable:
+        """
+        Compile translated program
+        :return: callable executing program
+        """
+        source = self.source()
+        namespace = {
+            'P': self._program,
+            'F': self._fallbacks,
+            'RET': self._returns,
+            'TN': _TYPE_NAMES,
+            '_UNDEF': _UNDEF,
+            '_variable': _variable,
+            '_str': _str
+        }
+        frame = self._program._global_frame
+        program = self._program
+        fallbacks = self._fallbacks
+
+        def fallback(addr: int, read: tuple, values: tuple, written: int = None):
+            for slot, value in zip(read, values):
+                frame[slot] = _variable(value)
+            program._curr_inst = addr
+            fallbacks[addr]()
+            if written is not None:
+                return _value(frame[written])
+        namespace['FB'] = fallback
+        exec(compile(source, '<IPPcode18>', 'exec'), namespace)
+        main = namespace['run']
+
+        def run():
+            try:
+                main()
+            finally:
+                program.flush_output()
+        return run
+
+    def _translate(self):
+        """
+        Translate instruction list to lines of Python source
+        """
+        inst_list = self._inst_list
+        entries = {0, len(inst_list)}
+        for addr, inst in enumerate(inst_list):
+            if inst.opcode in Program.BRANCH_OPCODES and inst.args[0].target is not None:
+                entries.add(inst.args[0].target + 1)
+            if inst.opcode == 'CALL':
+                entries.add(addr + 1)
+        starts = sorted(entries)
+        self._regions = {start: region for region, start in enumerate(starts)}
+        for addr, inst in enumerate(inst_list):
+            if inst.opcode == 'CALL':
+                self._returns[addr] = self._regions[addr + 1]
+
+        global_vars = ', '.join(self._global(slot) for slot in range(self._slot_count))
+        lines = self._lines
+        lines.append('def run():')
+        lines.append('    UNDEF = _UNDEF')
+        lines.append('    GFR = P._global_frame')
+        lines.append('    DS = P._data_stack')
+        lines.append('    CS = P.call_stack')
+        lines.append('    OUT = P.output.write')
+        lines.append('    DBG = P.debug_output.write')
+        if self._slot_count > 0:
+            lines.append('    {}, = [UNDEF if var is None else var.value for var in GFR]'.format(global_vars))
+        lines.append('    b = 0')
+        lines.append('    try:')
+        lines.append('        while True:')
+        regions = [self._region(start, starts[i + 1] if i + 1 < len(starts) else None)
+                   for i, start in enumerate(starts)]
+        self._dispatch(regions, 0, len(regions), 3)
+        lines.append('    finally:')
+        if self._slot_count > 0:
+            lines.append('        GFR[:] = [_variable(value) for value in ({},)]'.format(global_vars))
+        else:
+            lines.append('        pass')
+
+    def _dispatch(self, regions: list, low: int, high: int, indent: int):
+        """
+        Emit binary tree of ifs selecting region by its index
+        :param regions: list of region lines
+        :param low: first region index
+        :param high: index after last region
+        :param indent: indentation level
+        """
+        if high - low == 1:
+            self._lines.extend('    ' * indent + line for line in regions[low])
+            return
+        middle = (low + high) // 2
+        self._lines.append('    ' * indent + 'if b < {}:'.format(middle))
+        self._dispatch(regions, low, middle, indent + 1)
+        self._lines.append('    ' * indent + 'else:')
+        self._dispatch(regions, middle, high, indent + 1)
+
+    def _region(self, start: int, end) -> list:
+        """
+        Translate region of instructions executed from its start until jump or start of next region
+        :param start: address of first instruction
+        :param end: address of next region or None for region after program end
+        :return: list of lines
+        """
+        if end is None:
+            return ['return']
+        lines = list()
+        self._defined = set()
+        for addr in range(start, end):
+            inst = self._inst_list[addr]
+            lines.extend(self._instruction(addr, inst))
+            if inst.opcode in ('JUMP', 'CALL', 'RETURN'):
+                return lines
+            # Instruction which did not fail accessed all its variables
+            self._defined.update(arg.slot for arg in inst.args if arg.is_var() and arg.frame is Frame.GF)
+        lines.append('b = {}'.format(self._regions[end]))
+        return lines
+
+    def _instruction(self, addr: int, inst: Instruction) -> list:
+        """
+        Translate instruction
+        :param addr: instruction address
+        :param inst: instruction
+        :return: list of lines
+        """
+        opcode = inst.opcode
+        if opcode in ('LABEL', 'NOP'):
+            return []
+        if opcode in Program.BRANCH_OPCODES and (inst.args[0].target is None or inst.args[0].type != 'label'):
+            return self._guarded(addr, inst, [False], [])  # Fails if executed
+        if opcode == 'JUMP':
+            return [self._jump(inst)]
+        if opcode == 'CALL':
+            return ['CS.append({})'.format(addr), self._jump(inst)]
+        if opcode == 'RETURN':
+            return self._guarded(addr, inst, ['CS'], ['b = RET[CS.pop()]', 'continue'])
+        if opcode == 'BREAK':
+            return self._fallback(addr, inst, range(self._slot_count), None)
+        if opcode in ('CREATEFRAME', 'PUSHFRAME', 'POPFRAME', 'READ') or any(
+                arg.is_var() and arg.frame is not Frame.GF for arg in inst.args):
+            return self._guarded(addr, inst, [False], [])
+
+        guards = self._check_guards(inst)
+        args = inst.args
+        operands = [self._operand(arg) for arg in args]
+        if opcode in ('JUMPIFEQ', 'JUMPIFNEQ'):
+            guards.append(self._same_type_guard(args[1], args[2]))
+            compare = '==' if opcode == 'JUMPIFEQ' else '!='
+            return self._guarded(addr, inst, guards, ['if {} {} {}:'.format(operands[1], compare, operands[2]),
+                                                      '    ' + self._jump(inst)])
+        if opcode == 'WRITE':
+            return self._guarded(addr, inst, guards, ['OUT({} + "\\n")'.format(self._to_str(args[0]))])
+        if opcode == 'DPRINT':
+            guards.append(self._defined_guard(args[0]))
+            return self._guarded(addr, inst, guards, ['DBG({} + "\\n")'.format(self._to_str(args[0]))])
+        if opcode == 'PUSHS':
+            return self._guarded(addr, inst, guards, ['DS.append({})'.format(operands[0])])
+        if not args[0].is_var():
+            return self._guarded(addr, inst, [False], [])
+        if opcode == 'DEFVAR':
+            return ['{} = None'.format(operands[0])]
+
+        dest = operands[0]
+        guards.append(self._defined_guard(args[0]))
+        if opcode == 'MOVE':
+            value = operands[1]
+        elif opcode == 'POPS':
+            guards.append('DS')
+            value = 'DS.pop()'
+        elif opcode == 'TYPE':
+            guards.append(self._defined_guard(args[1]))
+            value = 'TN[type({})]'.format(operands[1]) if args[1].is_var() else repr(args[1].type)
+        elif opcode in _UNARY_OPS:
+            if opcode == 'INT2CHAR':
+                guards.append('0 <= {} <= 0x10FFFF'.format(operands[1]))
+            value = _UNARY_OPS[opcode].format(operands[1])
+        elif opcode in _BINARY_OPS:
+            if opcode == 'IDIV':
+                guards.append('{} != 0'.format(operands[2]))
+            elif opcode in ('LT', 'GT', 'EQ'):
+                guards.append(self._same_type_guard(args[1], args[2]))
+            elif opcode in ('STRI2INT', 'GETCHAR'):
+                guards.append('-len({0}) <= {1} < len({0})'.format(operands[1], operands[2]))
+            value = _BINARY_OPS[opcode].format(operands[1], operands[2])
+        elif opcode == 'SETCHAR':
+            guards.append('0 <= {1} < len({0}) and {2}'.format(*operands))
+            value = '{0}[:{1}] + {2}[0] + {0}[{1} + 1:]'.format(*operands)
+        else:
+            return self._guarded(addr, inst, [False], [])
+        return self._guarded(addr, inst, guards, ['{} = {}'.format(dest, value)])
+
+    def _guarded(self, addr: int, inst: Instruction, guards: list, lines: list) -> list:
+        """
+        Emit inlined code executed when all guards hold, instruction code is run on program state otherwise
+        :param addr: instruction address
+        :param inst: instruction
+        :param guards: list of guard expressions or booleans known at translation time
+        :param lines: inlined code lines
+        :return: list of lines
+        """
+        if False in guards:
+            lines = None
+        guards = [guard for guard in guards if guard is not True]
+        if lines is not None and len(guards) == 0:
+            return lines
+
+        read = [arg.slot for arg in inst.args if arg.is_var() and arg.frame is Frame.GF]
+        written = [inst.args[0].slot] if inst.opcode in _WRITING_OPCODES and inst.args[0].is_var() \
+            and inst.args[0].frame is Frame.GF else []
+        fallback = self._fallback(addr, inst, sorted(set(read)), written[0] if written else None)
+        if lines is None:
+            return fallback
+        result = ['if {}:'.format(' and '.join('({})'.format(guard) for guard in guards))]
+        result.extend('    ' + line for line in lines)
+        result.append('else:')
+        result.extend('    ' + line for line in fallback)
+        return result
+
+    def _fallback(self, addr: int, inst: Instruction, read, written) -> list:
+        """
+        Emit execution of bound instruction code on program state
+        :param addr: instruction address
+        :param inst: instruction
+        :param read: slots of global variables stored to program frame before execution
+        :param written: slot of global variable loaded from program frame after execution or None
+        :return: list of lines
+        """
+        self._fallbacks[addr] = inst.bind(self._program)
+        call = 'FB({}, ({}), ({}){})'.format(addr, ''.join('{}, '.format(slot) for slot in read),
+                                            ''.join('{}, '.format(self._global(slot)) for slot in read),
+                                            '' if written is None else ', {}'.format(written))
+        if written is not None:
+            call = '{} = {}'.format(self._global(written), call)
+        lines = [call]
+        if inst.opcode in Program.BRANCH_OPCODES and inst.args[0].target is not None:
+            lines.append('if P._curr_inst != {}:'.format(addr))
+            lines.append('    ' + self._jump(inst))
+        return lines
+
+    def _jump(self, inst: Instruction) -> str:
+        """
+        Emit transfer of control to jump target
+        :param inst: jump instruction with resolved target
+        :return: line
+        """
+        return 'b = {}; continue'.format(self._regions[inst.args[0].target + 1])
+
+    @staticmethod
+    def _check_guards(inst: Instruction) -> list:
+        """
+        Get guards under which runtime argument checks pass
+        :param inst: instruction
+        :return: list of guards
+        """
+        guards = list()
+        for checker, arg in inst._runtime_checks():
+            if not arg.is_var() or checker not in _CHECK_GUARDS:
+                return [False]
+            guards.append(_CHECK_GUARDS[checker].format(Transpiler._global(arg.slot)))
+        return guards
+
+    @staticmethod
+    def _same_type_guard(arg1: Arg, arg2: Arg):
+        """
+        Get guard under which operands have the same data type
+        :param arg1: checked operand
+        :param arg2: checked operand
+        :return: guard
+        """
+        for arg in (arg1, arg2):
+            if not arg.is_var() and arg.type not in _LITERAL_TYPES:
+                return False
+        if not arg1.is_var() and not arg2.is_var():
+            return arg1.type == arg2.type
+        if not arg1.is_var() or not arg2.is_var():
+            var, literal = (arg1, arg2) if arg1.is_var() else (arg2, arg1)
+            return 'type({}) is {}'.format(Transpiler._global(var.slot), _LITERAL_TYPES[literal.type])
+        return 'type({}) is type({})'.format(Transpiler._global(arg1.slot), Transpiler._global(arg2.slot))
+
+    def _defined_guard(self, arg: Arg):
+        """
+        Get guard under which variable is defined
+        :param arg: argument
+        :return: guard
+        """
+        if not arg.is_var() or arg.slot in self._defined:
+            return True
+        return '{} is not UNDEF'.format(Transpiler._global(arg.slot))
+
+    @staticmethod
+    def _to_str(arg: Arg) -> str:
+        """
+        Get expression converting argument to string
+        :param arg: checked argument
+        :return: expression
+        """
+        if arg.is_var():
+            return '_str({})'.format(Transpiler._global(arg.slot))
+        return repr(_str(arg.value))
+
+    @staticmethod
+    def _operand(arg: Arg) -> str:
+        """
+        Get expression of argument value
+        :param arg: argument
+        :return: expression
+        """
+        if arg.is_var():
+            return Transpiler._global(arg.slot)
+        return repr(arg.value)
+
+    @staticmethod
+    def _global(slot: int) -> str:
+        """
+        Get name of local holding global variable
+        :param slot: variable slot
+        :return: local name
+        """
+        return 'g{}'.format(slot)
@@ -0,0 +1,180 @@
+from classes.python.arg import Arg, ArgType
+from classes.python.control_flow import ControlFlowGraph
+from classes.python.frame import Frame
+from classes.python.instruction import Instruction
+
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+# Data type of destination variable after successful instruction execution
+RESULT_TYPES = {
+    'ADD': 'int',
+    'SUB': 'int',
+    'MUL': 'int',
+    'IDIV': 'int',
+    'LT': 'bool',
+    'GT': 'bool',
+    'EQ': 'bool',
+    'AND': 'bool',
+    'OR': 'bool',
+    'NOT': 'bool',
+    'INT2CHAR': 'string',
+    'STRI2INT': 'int',
+    'CONCAT': 'string',
+    'STRLEN': 'int',
+    'GETCHAR': 'string',
+    'SETCHAR': 'string',
+    'TYPE': 'string'
+}
+
+# Instructions writing their first argument
+DEST_OPCODES = frozenset(RESULT_TYPES) | {'MOVE', 'READ', 'DEFVAR', 'POPS'}
+
+# Data type guaranteed by successful argument check
+CHECKED_TYPES = {
+    ArgType.arg_int: 'int',
+    ArgType.arg_bool: 'bool',
+    ArgType.arg_string: 'string'
+}
+
+
+def var_key(arg: Arg):
+    """
+    Get key identifying variable in type state
+    :param arg: variable argument
+    :return: (frame, name) tuple
+    """
+    return arg.frame, arg.value
+
+
+class TypeInference:
+    """
+    Dataflow analysis inferring data types of variables at each program point.
+    State maps (frame, name) to data type, missing variable has unknown type or may be undefined.
+    Instruction arguments whose check always passes are marked in Instruction.proven_args.
+    """
+    def __init__(self, inst_list: list):
+        """
+        Initialize analysis
+        :param inst_list: list of analyzed instructions with resolved jump targets
+        """
+        self._inst_list = inst_list
+        self._cfg = ControlFlowGraph(inst_list)
+
+    def run(self):
+        """
+        Run analysis and mark proven instruction arguments
+        """
+        entry_states = self._solve()
+        for block, state in zip(self._cfg.blocks, entry_states):
+            if state is None:  # Unreachable block, keep all checks
+                continue
+            state = dict(state)
+            for addr in range(block.start, block.end):
+                self._transfer(self._inst_list[addr], state, True)
+
+    def _solve(self) -> list:
+        """
+        Compute type states at entries of basic blocks
+        :return: list of states indexed by block, None for unreachable blocks
+        """
+        blocks = self._cfg.blocks
+        states = [None] * len(blocks)
+        if len(blocks) == 0:
+            return states
+        states[0] = dict()
+        worklist = [0]
+        queued = {0}
+        while worklist:
+            block_idx = worklist.pop()
+            queued.discard(block_idx)
+            block = blocks[block_idx]
+            state = dict(states[block_idx])
+            for addr in range(block.start, block.end):
+                self._transfer(self._inst_list[addr], state, False)
+
+            for succ in block.successors:
+                merged = self._join(states[succ], state)
+                if merged is not None:
+                    states[succ] = merged
+                    if succ not in queued:
+                        queued.add(succ)
+                        worklist.append(succ)
+        return states
+
+    @staticmethod
+    def _join(old, new):
+        """
+        Join new state into old one
+        :param old: previous state or None
+        :param new: incoming state
+        :return: joined state or None if old state did not change
+        """
+        if old is None:
+            return dict(new)
+        joined = {key: data_type for key, data_type in old.items() if new.get(key) == data_type}
+        if len(joined) == len(old):
+            return None
+        return joined
+
+    @staticmethod
+    def _transfer(inst: Instruction, state: dict, mark: bool):
+        """
+        Apply instruction effect on type state
+        :param inst: instruction
+        :param state: type state, modified in place
+        :param mark: mark proven arguments of instruction
+        """
+        proven = set()
+        for i, (checker, arg) in enumerate(zip(Instruction.get_arg_checkers(inst.opcode), inst.args)):
+            if not arg.is_var() or checker not in ArgType.VALUE_CHECKERS:
+                continue
+            key = var_key(arg)
+            if state.get(key) in ArgType.ACCEPTED_TYPES[checker]:
+                proven.add(i)
+            elif checker in CHECKED_TYPES:
+                state[key] = CHECKED_TYPES[checker]
+        if mark:
+            inst.proven_args = frozenset(proven)
+
+        opcode = inst.opcode
+        if opcode in DEST_OPCODES:
+            dest = inst.args[0]
+            if not dest.is_var():  # Such instruction fails its runtime check, so it has no effect on state
+                return
+            if opcode in RESULT_TYPES:
+                state[var_key(dest)] = RESULT_TYPES[opcode]
+            elif opcode == 'MOVE':
+                src = inst.args[1]
+                src_type = state.get(var_key(src)) if src.is_var() else src.type
+                if src_type is None:
+                    state.pop(var_key(dest), None)
+                else:
+                    state[var_key(dest)] = src_type
+            elif opcode == 'READ':
+                state[var_key(dest)] = inst.args[1].value
+            else:
+                state.pop(var_key(dest), None)
+        elif opcode == 'CREATEFRAME':
+            TypeInference._move_frame(state, Frame.TF, None)
+        elif opcode == 'PUSHFRAME':
+            TypeInference._move_frame(state, Frame.LF, None)
+            TypeInference._move_frame(state, Frame.TF, Frame.LF)
+        elif opcode == 'POPFRAME':
+            TypeInference._move_frame(state, Frame.TF, None)
+            TypeInference._move_frame(state, Frame.LF, Frame.TF)
+
+    @staticmethod
+    def _move_frame(state: dict, src: Frame, dest):
+        """
+        Move known types of variables from one frame to another
+        :param state: type state, modified in place
+        :param src: source frame
+        :param dest: destination frame or None to forget source frame variables
+        """
+        for key in [key for key in state if key[0] is src]:
+            data_type = state.pop(key)
+            if dest is not None:
+                state[(dest, key[1])] = data_type
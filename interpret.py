@@ -1,73 +1,280 @@
-from classes.python.ipp_parser import IPPParser
-from classes.python.program import Program
+# Only modules needed by every run are imported here, the rest is imported by the code path which needs it
 from classes.python.exceptions import ApplicationError
-from classes.python.exit_codes import ARGUMENT_ERROR
-import argparse
-from sys import stderr, argv
-import subprocess
+from classes.python.exit_codes import EXIT_SUCCESS, ARGUMENT_ERROR, INPUT_FILE_ERROR, OUTPUT_FILE_ERROR
+from classes.python.options import Option, OptionParser
+from sys import stdout, stderr, argv
 
 __author__ = "Martin Omacht"
 __copyright__ = "Copyright 2018"
 __credits__ = ["Martin Omacht"]
 
 
-def exec_parser(src_file: str):
+def read_source(src_file: str) -> bytes:
     """
-    Parse given file with parse.php
+    Read source file
+    :param src_file: file with IPPcode18 source code or its XML representation
+    :return: file content
+    """
+    try:
+        with open(src_file, 'rb') as file:
+            return file.read()
+    except OSError:
+        raise ApplicationError("Nepodařilo se otevřít vstupní soubor '{}'".format(src_file), INPUT_FILE_ERROR)
+
+
+def exec_parser(src_file: str) -> list:
+    """
+    Parse given file with parse.php, its output is loaded while it is being produced
     :param src_file: file with source code
-    :return: source code XML representation
+    :return: list of Instruction instances
     """
-    stdin = open(src_file)
-    result = subprocess.run(['php', 'parse.php'], check=True, stdout=subprocess.PIPE, stdin=stdin)
-    return result.stdout
+    import os
+    from classes.python.ipp_parser import IPPParser
+    try:
+        stdin = open(src_file, 'rb')
+    except OSError:
+        raise ApplicationError("Nepodařilo se otevřít vstupní soubor '{}'".format(src_file), INPUT_FILE_ERROR)
+    with stdin:
+        return IPPParser().load_from_command(['php', os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                  'parse.php')], stdin)
 
 
-argparser = argparse.ArgumentParser(description='Interprets XML representaion of IPPcode18.', add_help=False)
-argparser.add_argument('--source', required=True, help='Source file to interpret')
-argparser.add_argument('--parse', action='store_const', const=True, default=False,
-                       help='Interpret asks for file name to parse and then interpret (for dev purposes)')
+def load_source(src_file: str, source: bytes, frontend: str) -> list:
+    """
+    Load instructions of source file, source code is parsed by given front end
+    :param src_file: file with IPPcode18 source code or its XML representation
+    :param source: file content
+    :param frontend: 'python' or 'php'
+    :return: list of Instruction instances
+    """
+    from classes.python.source_parser import is_source, load_instructions
+    if frontend == 'php' and is_source(source):
+        return exec_parser(src_file)
+    return load_instructions(source)
 
-if len(argv) == 2 and argv[1] in ('-h', '--help'):  # Argparse returns code 1 on help, have to do it manually
-    argparser.print_help()
+
+def load_cached(src_file: str, cache, optimize: bool, frontend: str):
+    """
+    Load analyzed program from cache, on cache miss the program is loaded, analyzed and stored to cache
+    :param src_file: file with IPPcode18 source code or its XML representation
+    :param cache: ProgramCache instance
+    :param optimize: analyze program with optimizations
+    :param frontend: front end parsing source code, 'python' or 'php'
+    :return: analyzed Program
+    """
+    source = read_source(src_file)
+    key = cache.key(source, optimize)
+    program = cache.load(key)
+    if program is None:
+        from classes.python.program import Program
+        program = Program.from_instructions(load_source(src_file, source, frontend))
+        program.analyze(optimize)
+        cache.store(key, program)
+    return program
+
+
+argparser = OptionParser('Interprets XML representaion of IPPcode18.', [
+    Option('source', 'Source file to interpret, IPPcode18 source code or its XML representation'),
+    Option('parse', 'Interpret asks for file name to parse and then interpret (for dev purposes)', flag=True),
+    Option('frontend', 'Parse IPPcode18 source code in Python or by parse.php streamed to XML parser '
+                       '(python by default)', choices=('python', 'php'), default='python'),
+    Option('input', 'File to read program input from (standard input by default)'),
+    Option('output', 'File to write program output to (standard output by default)'),
+    Option('no-cache', 'Do not use cache of analyzed programs', flag=True),
+    Option('optimize', 'Optimize program before interpretation (constant folding, copy propagation)', flag=True),
+    Option('engine', 'Execute program by interpreter or translate it to Python (interpret by default)',
+           choices=('interpret', 'python'), default='interpret'),
+    Option('profile', 'File to write JSON profile of executed instructions to'),
+    Option('profile-table', 'File to write profile of executed instructions as text table to'),
+    Option('call-profile', 'File to write JSON statistics of called functions (CALL targets) to'),
+    Option('flamegraph', 'File to write call stacks in collapsed format of flamegraph.pl to'),
+    Option('chrome-trace', 'File to write calls in Chrome trace event format to'),
+    Option('trace', 'Record last N executed instructions and print their order and opcode on error exit, '
+                    'operand values are printed for the failing instruction only', value_type=int, metavar='N'),
+    Option('batch', 'Run jobs of JSON manifest in this process and write JSON report of their results',
+           metavar='MANIFEST'),
+    Option('serve', 'Serve requests of interpret_client.py on Unix domain socket by pool of worker processes',
+           metavar='SOCKET'),
+    Option('inputs', 'Run program against every file of directory as its input and write JSON report of results',
+           metavar='DIR'),
+    Option('jobs', 'Number of worker processes of --inputs (number of CPUs by default)', value_type=int),
+    Option('workers', 'Number of worker processes of --serve (number of CPUs by default)', value_type=int),
+    Option('cache-dir', 'Directory with cache of analyzed programs (~/.cache/ipp-interpret by default)')
+])
+
+if len(argv) == 2 and argv[1] in ('-h', '--help'):
+    stdout.write(argparser.help('interpret.py'))
     exit(0)
 
 # Parse arguments
 args = None
 try:
-    args = argparser.parse_args()
-except SystemExit:
+    args = argparser.parse(argv[1:])
+except ValueError as err:
+    print('interpret.py: error: {}'.format(err), file=stderr)
+    exit(ARGUMENT_ERROR)
+
+if [args.source, args.batch, args.serve].count(None) != 2:
+    print("Musí být zadán právě jeden z parametrů --source, --batch a --serve", file=stderr)
+    exit(ARGUMENT_ERROR)
+
+profiler = None
+call_profiler = None
+if args.profile is not None or args.profile_table is not None:
+    from classes.python.profiler import Profiler
+    profiler = Profiler()
+if args.call_profile is not None or args.flamegraph is not None or args.chrome_trace is not None:
+    from classes.python.profiler import CallTreeProfiler
+    call_profiler = CallTreeProfiler()
+if (profiler is not None or call_profiler is not None) and args.engine != 'interpret':
+    print("Profilování je možné jen s --engine=interpret", file=stderr)
+    exit(ARGUMENT_ERROR)
+if profiler is not None and call_profiler is not None:
+    print("Profilování instrukcí a volání nelze kombinovat", file=stderr)
     exit(ARGUMENT_ERROR)
+trace = None
+if args.trace is not None:
+    if args.trace <= 0:
+        print("Délka trasování musí být kladná", file=stderr)
+        exit(ARGUMENT_ERROR)
+    if args.engine != 'interpret' or profiler is not None or call_profiler is not None:
+        print("Trasování je možné jen s --engine=interpret a bez profilování", file=stderr)
+        exit(ARGUMENT_ERROR)
+    from classes.python.tracer import ExecutionTrace
+    trace = ExecutionTrace(args.trace)
 
-# Parse XML
-parser = IPPParser()
-xml_dom = None
-if args.parse:  # Mainly for debugging
-    file = input('File to parse: ')
-    xml = exec_parser(file)
+# Run batch of jobs or serve requests, each job is isolated and reported separately
+if args.batch is not None or args.serve is not None:
+    if args.parse or args.input is not None or profiler is not None or call_profiler is not None or trace is not None:
+        print("Dávku ani server nelze kombinovat s --parse, --input, profilováním ani trasováním", file=stderr)
+        exit(ARGUMENT_ERROR)
+if args.serve is not None:
+    if args.workers is not None and args.workers < 1:
+        print("Počet procesů musí být kladný", file=stderr)
+        exit(ARGUMENT_ERROR)
+    from classes.python.server import Server
     try:
-        xml_dom = parser.parse_from_string(xml)
+        Server(args.serve, args.workers, args.optimize, args.engine).serve_forever()
+    except OSError as err:
+        print("Nepodařilo se spustit server na '{}': {}".format(args.serve, err.strerror), file=stderr)
+        exit(OUTPUT_FILE_ERROR)
+    exit(EXIT_SUCCESS)
+if args.batch is not None:
+    from classes.python.batch import load_manifest, run_batch, write_report
+    try:
+        jobs = load_manifest(args.batch)
     except ApplicationError as err:
         print(err.get_message(), file=stderr)
         exit(err.get_exit_code())
-else:  # Parse --source XML
+    report_file = stdout
+    if args.output is not None:
+        try:
+            report_file = open(args.output, 'w')
+        except OSError:
+            print("Nepodařilo se otevřít výstupní soubor '{}'".format(args.output), file=stderr)
+            exit(OUTPUT_FILE_ERROR)
+    write_report(run_batch(jobs, args.optimize, args.engine), report_file)
+    report_file.close()
+    exit(EXIT_SUCCESS)
+
+# Run program against every input file of directory, results are reported separately
+input_files = None
+if args.inputs is not None:
+    if args.source is None or args.parse or args.input is not None or profiler is not None \
+            or call_profiler is not None or trace is not None:
+        print("Adresář vstupů lze použít jen s --source a bez --parse, --input, profilování a trasování", file=stderr)
+        exit(ARGUMENT_ERROR)
+    if args.jobs is not None and args.jobs < 1:
+        print("Počet procesů musí být kladný", file=stderr)
+        exit(ARGUMENT_ERROR)
+    from classes.python.batch import list_inputs
     try:
-        xml_dom = parser.parse_from_file(args.source)
+        input_files = list_inputs(args.inputs)
     except ApplicationError as err:
         print(err.get_message(), file=stderr)
         exit(err.get_exit_code())
+elif args.jobs is not None:
+    print("Parametr --jobs lze použít jen s --inputs", file=stderr)
+    exit(ARGUMENT_ERROR)
 
-# Analyze program
-program = Program(xml_dom)
+# Open input and output files
+input_reader = None
+if args.input is not None:
+    from classes.python.input_reader import InputReader
+    try:
+        input_reader = InputReader.from_file(args.input)
+    except OSError:
+        print("Nepodařilo se otevřít vstupní soubor '{}'".format(args.input), file=stderr)
+        exit(INPUT_FILE_ERROR)
+
+output_file = None
+if args.output is not None:
+    try:
+        output_file = open(args.output, 'w')
+    except OSError:
+        print("Nepodařilo se otevřít výstupní soubor '{}'".format(args.output), file=stderr)
+        exit(OUTPUT_FILE_ERROR)
+
+profile_files = list()
+for profile_file, write in ((args.profile, 'write_json'), (args.profile_table, 'write_table'),
+                            (args.call_profile, 'write_json'), (args.flamegraph, 'write_collapsed'),
+                            (args.chrome_trace, 'write_chrome_trace')):
+    if profile_file is not None:
+        try:
+            profile_files.append((open(profile_file, 'w'), write))
+        except OSError:
+            print("Nepodařilo se otevřít výstupní soubor '{}'".format(profile_file), file=stderr)
+            exit(OUTPUT_FILE_ERROR)
+
+# Load and analyze program
+program = None
 try:
-    program.analyze()
+    if args.parse:  # Mainly for debugging
+        from classes.python.source_parser import SourceParser
+        from classes.python.program import Program
+        file = input('File to parse: ')
+        instructions = exec_parser(file) if args.frontend == 'php' else SourceParser().load_from_file(file)
+        program = Program.from_instructions(instructions)
+        program.analyze(args.optimize)
+    elif args.no_cache:
+        from classes.python.program import Program
+        program = Program.from_instructions(load_source(args.source, read_source(args.source), args.frontend))
+        program.analyze(args.optimize)
+    else:
+        from classes.python.program_cache import ProgramCache
+        program = load_cached(args.source, ProgramCache(args.cache_dir), args.optimize, args.frontend)
 except ApplicationError as err:
     print(err.get_message(), file=stderr)
     exit(err.get_exit_code())
 
+if input_files is not None:
+    from classes.python.batch import write_inputs_report
+    write_inputs_report(args.source, program.run_inputs(input_files, args.jobs, args.engine), output_file or stdout)
+    if output_file is not None:
+        output_file.close()
+    exit(EXIT_SUCCESS)
+
+if input_reader is not None:
+    program.set_input(input_reader)
+if output_file is not None:
+    program.set_output(output_file)
+
 # Interpret
+run = program.interpret
+if args.engine == 'python':
+    from classes.python.transpiler import Transpiler
+    run = Transpiler(program).compile()
+if profiler is not None or call_profiler is not None or trace is not None:
+    run = lambda: program.interpret(profiler, call_profiler, trace)
+
 try:
-    program.interpret()
+    run()
 except ApplicationError as err:
-    print("Chyba instukce {} ({}): "
-          .format(program.get_inst_number(), program.get_current_inst().opcode) + err.get_message(), file=stderr)
+    print(program.error_message(err), file=stderr)
+    if trace is not None:
+        trace.write(stderr, program)
     exit(err.get_exit_code())
+finally:
+    for file, write in profile_files:  # Profile is written on error exits too
+        getattr(profiler or call_profiler, write)(file)
+        file.close()
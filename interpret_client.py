@@ -0,0 +1,87 @@
+import socket
+import struct
+import sys
+
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+# Thin client of interpret.py --serve, it imports nothing from classes.python to start fast,
+# so the protocol of classes/python/server.py is repeated here
+REQUEST_HEADER = struct.Struct('!II')
+RESPONSE_HEADER = struct.Struct('!iII')
+
+ARGUMENT_ERROR = 10
+INPUT_FILE_ERROR = 11
+INTERN_ERROR = 99
+
+USAGE = 'Použití: interpret_client.py --socket=SOCKET --source=SOUBOR [--input=SOUBOR]\n'
+
+
+def receive(conn: socket.socket, size: int) -> bytes:
+    """
+    Receive exactly given number of bytes
+    :param conn: connected socket
+    :param size: number of bytes
+    :return: received bytes
+    """
+    parts = list()
+    while size > 0:
+        part = conn.recv(min(size, 1 << 20))
+        if not part:
+            raise ConnectionError('Connection closed')
+        parts.append(part)
+        size -= len(part)
+    return b''.join(parts)
+
+
+def main(argv: list) -> int:
+    """
+    Send program to server and print its outputs
+    :param argv: command line arguments without program name
+    :return: exit code of the program
+    """
+    options = dict()
+    for arg in argv:
+        name, sep, value = arg.partition('=')
+        if name not in ('--socket', '--source', '--input') or not sep or name in options:
+            sys.stderr.write(USAGE)
+            return ARGUMENT_ERROR
+        options[name] = value
+    if '--socket' not in options or '--source' not in options:
+        sys.stderr.write(USAGE)
+        return ARGUMENT_ERROR
+
+    try:
+        with open(options['--source'], 'rb') as file:
+            xml = file.read()
+        if '--input' in options:
+            with open(options['--input'], 'rb') as file:
+                stdin = file.read()
+        elif sys.stdin is not None and not sys.stdin.isatty():
+            stdin = sys.stdin.buffer.read()
+        else:
+            stdin = b''
+    except OSError as err:
+        sys.stderr.write("Nepodařilo se otevřít vstupní soubor '{}'\n".format(err.filename))
+        return INPUT_FILE_ERROR
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.connect(options['--socket'])
+            conn.sendall(REQUEST_HEADER.pack(len(xml), len(stdin)) + xml + stdin)
+            exit_code, stdout_len, stderr_len = RESPONSE_HEADER.unpack(receive(conn, RESPONSE_HEADER.size))
+            stdout = receive(conn, stdout_len)
+            stderr = receive(conn, stderr_len)
+    except OSError as err:
+        sys.stderr.write("Spojení se serverem '{}' selhalo: {}\n".format(options['--socket'], err))
+        return INTERN_ERROR
+
+    sys.stdout.buffer.write(stdout)
+    sys.stderr.buffer.write(stderr)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
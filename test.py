@@ -0,0 +1,49 @@
+from classes.python.tester import TesterConfig, TestCase, find_tests, run_tests, write_text_output
+from classes.python.exit_codes import EXIT_SUCCESS, ARGUMENT_ERROR, INPUT_FILE_ERROR, SCRIPT_NOT_FOUND_ERROR
+import argparse
+import os
+import sys
+
+__author__ = "Martin Omacht"
+__copyright__ = "Copyright 2018"
+__credits__ = ["Martin Omacht"]
+
+
+argparser = argparse.ArgumentParser(description='Tests parse and interpret scripts with .src/.in/.out/.rc tests '
+                                                'in parallel.', add_help=False)
+argparser.add_argument('-d', '--directory', default='.', help='Directory with tests (current directory by default)')
+argparser.add_argument('-r', '--recursive', action='store_true', help='Search tests in subdirectories too')
+argparser.add_argument('-p', '--parse-script', default='./parse.php', help='Parse script (./parse.php by default)')
+argparser.add_argument('-i', '--int-script', default='./interpret.py', help='Interpret script (./interpret.py by default)')
+argparser.add_argument('--php-int', default='php', help='PHP interpreter (php by default)')
+argparser.add_argument('--py-int', default=sys.executable, help='Python interpreter (this one by default)')
+argparser.add_argument('-t', '--temp-dir', help='Directory for temporary files (system one by default)')
+argparser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                       help='Number of tests run in parallel (number of CPUs by default)')
+
+if len(sys.argv) == 2 and sys.argv[1] in ('-h', '--help'):
+    argparser.print_help()
+    exit(EXIT_SUCCESS)
+
+args = None
+try:
+    args = argparser.parse_args()
+except SystemExit:
+    exit(ARGUMENT_ERROR)
+
+if args.jobs is None or args.jobs < 1:
+    args.jobs = 1
+for script in (args.parse_script, args.int_script):
+    if not os.path.exists(script):
+        print("Skript '{}' neexistuje".format(script), file=sys.stderr)
+        exit(SCRIPT_NOT_FOUND_ERROR)
+
+try:
+    tests = [TestCase(source, args.directory) for source in find_tests(args.directory, args.recursive)]
+except OSError as err:
+    print("Nepodařilo se vytvořit soubor testu: {}".format(err), file=sys.stderr)
+    exit(INPUT_FILE_ERROR)
+
+config = TesterConfig(args.parse_script, args.int_script, args.php_int, args.py_int, args.temp_dir)
+write_text_output(run_tests(tests, config, args.jobs), sys.stdout)
+exit(EXIT_SUCCESS)
@@ -0,0 +1,115 @@
+from unittest.case import TestCase
+from unittest import mock
+from io import StringIO
+import json
+import os
+import tempfile
+
+from classes.python.batch import load_manifest, run_batch, write_report, list_inputs, write_inputs_report
+from classes.python.ipp_parser import IPPParser
+from classes.python import runner
+from classes.python.program import Program
+
+PROGRAM = """<?xml version="1.0" encoding="UTF-8"?>
+<program language="IPPcode18">
+    <instruction order="1" opcode="DEFVAR">
+        <arg1 type="var">GF@x</arg1>
+    </instruction>
+    <instruction order="2" opcode="READ">
+        <arg1 type="var">GF@x</arg1>
+        <arg2 type="type">int</arg2>
+    </instruction>
+    <instruction order="3" opcode="WRITE">
+        <arg1 type="var">GF@x</arg1>
+    </instruction>
+    <instruction order="4" opcode="IDIV">
+        <arg1 type="var">GF@x</arg1>
+        <arg2 type="int">10</arg2>
+        <arg3 type="var">GF@x</arg3>
+    </instruction>
+</program>
+"""
+
+
+class TestBatch(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        files = {'prog.xml': PROGRAM, 'five.in': '5\n', 'zero.in': '0\n', 'five.out': '5\n', 'bad.xml': '<program'}
+        for name, content in files.items():
+            with open(os.path.join(self.dir.name, name), 'w') as file:
+                file.write(content)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_batch(self):
+        manifest = os.path.join(self.dir.name, 'manifest.json')
+        with open(manifest, 'w') as file:
+            json.dump({'jobs': [
+                {'source': 'prog.xml', 'input': 'five.in', 'expected': 'five.out'},
+                {'source': 'prog.xml', 'input': 'zero.in', 'rc': 57},
+                {'source': 'prog.xml', 'input': 'five.in', 'expected': 'five.out', 'rc': 57},
+                {'source': 'bad.xml'},
+                {'source': 'prog.xml'}
+            ]}, file)
+
+        results = run_batch(load_manifest(manifest))
+        self.assertEqual([result.exit_code for job, result in results], [0, 57, 0, 31, 57])
+        self.assertEqual(results[0][1].stdout, b'5\n')
+        self.assertTrue(results[1][1].stderr.startswith('Chyba instukce 4 (IDIV)'.encode()))
+
+        output = StringIO()
+        write_report(results, output)
+        report = json.loads(output.getvalue())
+        self.assertEqual([item['passed'] for item in report['results']], [True, True, False, None, None])
+        self.assertEqual((report['passed'], report['failed']), (2, 1))
+
+    def test_failed_analysis(self):
+        with open(os.path.join(self.dir.name, 'crash.xml'), 'w') as file:
+            file.write('crash')
+        manifest = os.path.join(self.dir.name, 'manifest.json')
+        with open(manifest, 'w') as file:
+            json.dump([{'source': 'crash.xml'}, {'source': 'prog.xml', 'input': 'five.in'}], file)
+
+        load_instructions = runner.load_instructions
+
+        def crashing_load(data, parser=None):
+            if data == b'crash':
+                raise RuntimeError('unexpected')
+            return load_instructions(data, parser)
+
+        with mock.patch.object(runner, 'load_instructions', crashing_load):
+            results = run_batch(load_manifest(manifest))
+            self.assertEqual(99, runner.run_source(IPPParser(), b'crash', b'').exit_code)
+        self.assertEqual([99, 0], [result.exit_code for job, result in results])
+        self.assertEqual(b'RuntimeError: unexpected\n', results[0][1].stderr)
+        self.assertEqual(b'5\n', results[1][1].stdout)
+
+    def test_inputs(self):
+        inputs = os.path.join(self.dir.name, 'inputs')
+        os.mkdir(inputs)
+        for number in range(20):
+            with open(os.path.join(inputs, '{:02}.in'.format(number)), 'w') as file:
+                file.write('{}\n'.format(number))
+        os.mkdir(os.path.join(inputs, 'subdirectory'))
+        input_files = list_inputs(inputs)
+        self.assertEqual(20, len(input_files))
+
+        program = Program.from_instructions(IPPParser().load_from_string(PROGRAM))
+        program.analyze()
+        sequential = program.run_inputs(input_files, jobs=1)
+        self.assertEqual([input_file for input_file, result in sequential], input_files)
+        self.assertEqual([57] + [0] * 19, [result.exit_code for input_file, result in sequential])
+        self.assertEqual(b'7\n', sequential[7][1].stdout)
+
+        parallel = program.run_inputs(input_files + [os.path.join(inputs, 'missing.in')], jobs=3)
+        self.assertEqual([(result.stdout, result.stderr, result.exit_code) for input_file, result in sequential],
+                         [(result.stdout, result.stderr, result.exit_code) for input_file, result in parallel[:-1]])
+        self.assertEqual(11, parallel[-1][1].exit_code)
+
+        output = StringIO()
+        write_inputs_report('prog.xml', sequential, output)
+        report = json.loads(output.getvalue())
+        self.assertEqual(1, report['failed'])
+        self.assertEqual('3\n', report['results'][3]['stdout'])
@@ -0,0 +1,39 @@
+from unittest.case import TestCase
+from io import BytesIO
+import os
+import tempfile
+
+from classes.python.input_reader import InputReader
+
+
+class TestInputReader(TestCase):
+
+    def read_all(self, reader):
+        lines = list()
+        try:
+            while True:
+                lines.append(reader.read_line())
+        except EOFError:
+            return lines
+
+    def test_lines_across_chunks(self):
+        reader = InputReader(BytesIO(b'first line\nsecond\r\n\nlast'), chunk_size=3)
+        self.assertEqual(self.read_all(reader), ['first line', 'second', '', 'last'])
+
+    def test_empty_input(self):
+        reader = InputReader(BytesIO(b''))
+        self.assertRaises(EOFError, reader.read_line)
+
+    def test_utf8(self):
+        reader = InputReader(BytesIO('žluťoučký\nkůň\n'.encode('utf-8')), chunk_size=4)
+        self.assertEqual(self.read_all(reader), ['žluťoučký', 'kůň'])
+
+    def test_mapped_file(self):
+        fd, path = tempfile.mkstemp()
+        try:
+            os.write(fd, b'42\ntrue\nlast')
+            os.close(fd)
+            reader = InputReader.from_file(path)
+            self.assertEqual(self.read_all(reader), ['42', 'true', 'last'])
+        finally:
+            os.remove(path)
@@ -1,7 +1,10 @@
 from unittest.case import TestCase
+from io import BytesIO
+import subprocess
+import sys
 
 from classes.python.ipp_parser import IPPParser
-from classes.python.exceptions import XMLFormatError, SrcSyntaxError, LexicalError, SemanticError
+from classes.python.exceptions import XMLFormatError, SrcSyntaxError, LexicalError, SemanticError, ApplicationError
 
 
 class TestIPPParser(TestCase):
@@ -574,3 +577,83 @@ class TestIPPParser(TestCase):
                     </instruction>
             </program>"""
         )
+
+    def test_load_ordered(self):
+        instructions = self.parser.load_from_string(
+            """<?xml version="1.0" encoding="UTF-8" ?>
+            <program language="IPPcode18">
+                <instruction order="3" opcode="WRITE">
+                    <arg1 type="var">GF@var</arg1>
+                </instruction>
+                <instruction order="1" opcode="DEFVAR">
+                    <arg1 type="var">GF@var</arg1>
+                </instruction>
+                <instruction order="2" opcode="MOVE">
+                    <arg1 type="var">GF@var</arg1>
+                    <arg2 type="string">a\\032b</arg2>
+                </instruction>
+            </program>"""
+        )
+        self.assertEqual([inst.opcode for inst in instructions], ['DEFVAR', 'MOVE', 'WRITE'])
+        self.assertEqual([inst.order for inst in instructions], [1, 2, 3])
+        self.assertEqual(instructions[1].args[1].value, 'a b')
+
+    def test_load_invalid_instruction(self):
+        self.assertRaises(
+            SrcSyntaxError,
+            self.parser.load_from_string,
+            """<?xml version="1.0" encoding="UTF-8" ?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="CREATEFRAME"></instruction>
+                <instruction order="2" opcode="INVALID"></instruction>
+                <instruction order="3" opcode="CREATEFRAME"></instruction>
+            </program>"""
+        )
+
+    def test_load_malformed_after_invalid_instruction(self):
+        self.assertRaises(
+            XMLFormatError,
+            self.parser.load_from_string,
+            """<?xml version="1.0" encoding="UTF-8" ?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="INVALID"></instruction>
+                <instruction order="2" opcode="CREATEFRAME">
+            </program>"""
+        )
+
+    def test_load_args_by_number(self):
+        instructions = self.parser.load_from_string(
+            """<?xml version="1.0" encoding="UTF-8" ?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="MOVE">
+                    <arg2 type="int">1</arg2>
+                    <arg1 type="var">GF@var</arg1>
+                </instruction>
+            </program>"""
+        )
+        self.assertEqual([arg.type for arg in instructions[0].args], ['var', 'int'])
+
+    def test_load_from_stream(self):
+        xml = b"""<?xml version="1.0" encoding="UTF-8" ?>
+            <program language="IPPcode18">
+                <instruction order="2" opcode="WRITE"><arg1 type="string">\xc5\xbelu\xc5\xa5ou\xc4\x8dk\xc3\xbd</arg1></instruction>
+                <instruction order="1" opcode="CREATEFRAME"></instruction>
+            </program>"""
+        instructions = self.parser.load_from_stream(BytesIO(xml), chunk_size=7)
+        self.assertEqual(['CREATEFRAME', 'WRITE'], [inst.opcode for inst in instructions])
+        self.assertEqual('žluťoučký', instructions[1].args[0].value)
+
+    def test_load_from_command(self):
+        program = ('import sys; sys.stdout.write(\'<program language="IPPcode18">\' '
+                   '+ \'<instruction order="1" opcode="CREATEFRAME"/>\' * 1000 + \'</program>\')')
+        instructions = self.parser.load_from_command([sys.executable, '-c', program], subprocess.DEVNULL)
+        self.assertEqual(1000, len(instructions))
+
+        program = 'import sys; sys.stdout.write(\'<program language="IPPcode18">\'); sys.exit(21)'
+        with self.assertRaises(ApplicationError) as context:
+            self.parser.load_from_command([sys.executable, '-c', program], subprocess.DEVNULL)
+        self.assertEqual(21, context.exception.get_exit_code())
+
+        program = 'import sys; sys.stdout.write(\'<program language="IPPcode18"><instruction>\')'
+        with self.assertRaises(XMLFormatError):
+            self.parser.load_from_command([sys.executable, '-c', program], subprocess.DEVNULL)
@@ -0,0 +1,131 @@
+from unittest.case import TestCase
+from io import StringIO
+
+from classes.python.ipp_parser import IPPParser
+from classes.python.program import Program
+from classes.python.exceptions import *
+
+
+class TestOptimizer(TestCase):
+
+    def setUp(self):
+        self.parser = IPPParser()
+
+    def analyze(self, xml_string):
+        program = Program(self.parser.parse_from_string(xml_string))
+        program.analyze(optimize=True)
+        return program
+
+    def test_fold_and_propagate(self):
+        program = self.analyze(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="DEFVAR">
+                    <arg1 type="var">GF@x</arg1>
+                </instruction>
+                <instruction order="2" opcode="DEFVAR">
+                    <arg1 type="var">GF@unused</arg1>
+                </instruction>
+                <instruction order="3" opcode="ADD">
+                    <arg1 type="var">GF@unused</arg1>
+                    <arg2 type="int">2</arg2>
+                    <arg3 type="int">3</arg3>
+                </instruction>
+                <instruction order="4" opcode="CONCAT">
+                    <arg1 type="var">GF@x</arg1>
+                    <arg2 type="string">a</arg2>
+                    <arg3 type="string">b</arg3>
+                </instruction>
+                <instruction order="5" opcode="WRITE">
+                    <arg1 type="var">GF@x</arg1>
+                </instruction>
+            </program>"""
+        )
+        inst_list = program.get_analysis()[0]
+        self.assertEqual(inst_list[2].opcode, 'NOP')  # Variable is never read
+        self.assertEqual(inst_list[3].opcode, 'MOVE')
+        self.assertEqual(inst_list[4].args[0].value, 'ab')
+
+        output = StringIO()
+        program.set_output(output)
+        program.interpret()
+        self.assertEqual(output.getvalue(), 'ab\n')
+
+    def test_failing_instruction_not_folded(self):
+        program = self.analyze(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="DEFVAR">
+                    <arg1 type="var">GF@x</arg1>
+                </instruction>
+                <instruction order="2" opcode="MOVE">
+                    <arg1 type="var">GF@x</arg1>
+                    <arg2 type="int">0</arg2>
+                </instruction>
+                <instruction order="3" opcode="IDIV">
+                    <arg1 type="var">GF@x</arg1>
+                    <arg2 type="int">1</arg2>
+                    <arg3 type="var">GF@x</arg3>
+                </instruction>
+            </program>"""
+        )
+        self.assertEqual(program.get_analysis()[0][2].opcode, 'IDIV')
+        self.assertRaises(
+            DivisionByZeroError,
+            program.interpret
+        )
+        self.assertEqual(program.get_inst_number(), 3)
+
+    def test_error_reports_original_instruction(self):
+        program = self.analyze(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="CREATEFRAME">
+                </instruction>
+                <instruction order="2" opcode="STRLEN">
+                    <arg1 type="var">TF@x</arg1>
+                    <arg2 type="string">abc</arg2>
+                </instruction>
+            </program>"""
+        )
+        self.assertEqual(program.get_analysis()[0][1].opcode, 'MOVE')
+        self.assertRaises(
+            UndefinedVar,
+            program.interpret
+        )
+        self.assertEqual(program.get_current_inst().opcode, 'STRLEN')
+
+    def test_type_of_label_not_folded(self):
+        program = self.analyze(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="DEFVAR">
+                    <arg1 type="var">GF@x</arg1>
+                </instruction>
+                <instruction order="2" opcode="TYPE">
+                    <arg1 type="var">GF@x</arg1>
+                    <arg2 type="label">foo</arg2>
+                </instruction>
+                <instruction order="3" opcode="WRITE">
+                    <arg1 type="var">GF@x</arg1>
+                </instruction>
+            </program>"""
+        )
+        self.assertEqual(program._inst_list[1].opcode, 'TYPE')
+        program.set_output(StringIO())
+        with self.assertRaises(OperandTypeError):
+            program.interpret()
+
+    def test_literal_destination(self):
+        program = self.analyze(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="ADD">
+                    <arg1 type="int">1</arg1>
+                    <arg2 type="int">2</arg2>
+                    <arg3 type="int">3</arg3>
+                </instruction>
+            </program>"""
+        )
+        with self.assertRaises(OperandTypeError):
+            program.interpret()
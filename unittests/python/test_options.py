@@ -0,0 +1,53 @@
+from unittest.case import TestCase
+import os
+import tempfile
+
+from classes.python.options import Option, OptionParser
+from benchmarks import startup
+
+
+class TestOptions(TestCase):
+
+    def setUp(self):
+        self.parser = OptionParser('Test program.', [
+            Option('source', 'Source file'),
+            Option('no-cache', 'Do not use cache', flag=True),
+            Option('engine', 'Engine', choices=('interpret', 'python'), default='interpret'),
+            Option('trace', 'Trace length', value_type=int, metavar='N'),
+            Option('trace-file', 'Trace file')
+        ])
+
+    def test_parse(self):
+        args = self.parser.parse(['--source=a.xml', '--no-cache', '--engine', 'python', '--trace=5'])
+        self.assertEqual('a.xml', args.source)
+        self.assertTrue(args.no_cache)
+        self.assertEqual('python', args.engine)
+        self.assertEqual(5, args.trace)
+        self.assertIsNone(args.trace_file)
+
+        args = self.parser.parse(['--source=a.xml', '--source=b.xml', '--no', '--trace-f', 'f'])
+        self.assertEqual('b.xml', args.source)
+        self.assertTrue(args.no_cache)
+        self.assertEqual('interpret', args.engine)
+        self.assertEqual('f', args.trace_file)
+
+    def test_errors(self):
+        for argv in (['source.xml'], ['--unknown'], ['--tr=5'], ['--no-cache=1'], ['--source'],
+                     ['--trace=x'], ['--engine=java'], ['--']):
+            with self.assertRaises(ValueError, msg=argv):
+                self.parser.parse(argv)
+
+    def test_help(self):
+        text = self.parser.help('test.py')
+        self.assertTrue(text.startswith('usage: test.py [--source SOURCE] [--no-cache]'))
+        self.assertIn('--engine {interpret,python}', text)
+        self.assertIn('--trace N', text)
+
+    def test_startup_imports(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'source.xml')
+            with open(source, 'w') as file:
+                file.write(startup.SOURCE)
+            for scenario in startup.SCENARIOS:
+                result = startup.run_scenario(scenario, source, os.path.join(directory, 'cache'), 1)
+                self.assertEqual([], result['forbidden'], scenario.name)
@@ -0,0 +1,28 @@
+from unittest.case import TestCase
+from io import StringIO
+
+from classes.python.output_buffer import OutputBuffer
+
+
+class TestOutputBuffer(TestCase):
+
+    def setUp(self):
+        self.stream = StringIO()
+
+    def test_buffered_until_flush(self):
+        buffer = OutputBuffer(self.stream)
+        buffer.write('a\n')
+        buffer.write('b\n')
+        self.assertEqual(self.stream.getvalue(), '')
+        buffer.flush()
+        self.assertEqual(self.stream.getvalue(), 'a\nb\n')
+
+    def test_flush_when_full(self):
+        buffer = OutputBuffer(self.stream, 4)
+        buffer.write('ab')
+        self.assertEqual(self.stream.getvalue(), '')
+        buffer.write('cd')
+        self.assertEqual(self.stream.getvalue(), 'abcd')
+        buffer.write('e')
+        buffer.flush()
+        self.assertEqual(self.stream.getvalue(), 'abcde')
@@ -0,0 +1,128 @@
+from unittest.case import TestCase
+from io import StringIO
+import json
+
+from classes.python.ipp_parser import IPPParser
+from classes.python.program import Program
+from classes.python.profiler import Profiler, CallTreeProfiler
+from classes.python.exceptions import *
+
+
+class TestProfiler(TestCase):
+
+    def setUp(self):
+        self.parser = IPPParser()
+
+    def test_counts(self):
+        xml_dom = self.parser.parse_from_string(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="DEFVAR">
+                    <arg1 type="var">GF@i</arg1>
+                </instruction>
+                <instruction order="2" opcode="MOVE">
+                    <arg1 type="var">GF@i</arg1>
+                    <arg2 type="int">0</arg2>
+                </instruction>
+                <instruction order="3" opcode="LABEL">
+                    <arg1 type="label">loop</arg1>
+                </instruction>
+                <instruction order="4" opcode="ADD">
+                    <arg1 type="var">GF@i</arg1>
+                    <arg2 type="var">GF@i</arg2>
+                    <arg3 type="int">1</arg3>
+                </instruction>
+                <instruction order="5" opcode="JUMPIFNEQ">
+                    <arg1 type="label">loop</arg1>
+                    <arg2 type="var">GF@i</arg2>
+                    <arg3 type="int">5</arg3>
+                </instruction>
+            </program>"""
+        )
+        program = Program(xml_dom)
+        program.analyze()
+        profiler = Profiler()
+        program.interpret(profiler)
+
+        report = profiler.report()
+        self.assertEqual(report['opcodes']['ADD']['count'], 5)
+        self.assertEqual(report['opcodes']['WRITE']['count'], 0)
+        self.assertEqual([inst['count'] for inst in report['instructions']], [1, 1, 1, 5, 5])
+        self.assertEqual(report['total']['count'], 13)
+
+        output = StringIO()
+        profiler.write_json(output)
+        self.assertEqual(json.loads(output.getvalue())['instructions'][3]['order'], 4)
+
+    def test_error_exit(self):
+        xml_dom = self.parser.parse_from_string(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="PUSHS">
+                    <arg1 type="int">1</arg1>
+                </instruction>
+                <instruction order="2" opcode="POPS">
+                    <arg1 type="var">GF@x</arg1>
+                </instruction>
+            </program>"""
+        )
+        program = Program(xml_dom)
+        program.analyze()
+        profiler = Profiler()
+        self.assertRaises(
+            UndefinedVar,
+            program.interpret,
+            profiler
+        )
+        self.assertEqual(profiler.counts, [1, 1])
+        self.assertEqual(program.get_inst_number(), 2)
+
+    def test_call_tree(self):
+        xml_dom = self.parser.parse_from_string(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="CALL">
+                    <arg1 type="label">f</arg1>
+                </instruction>
+                <instruction order="2" opcode="CALL">
+                    <arg1 type="label">f</arg1>
+                </instruction>
+                <instruction order="3" opcode="JUMP">
+                    <arg1 type="label">end</arg1>
+                </instruction>
+                <instruction order="4" opcode="LABEL">
+                    <arg1 type="label">f</arg1>
+                </instruction>
+                <instruction order="5" opcode="CALL">
+                    <arg1 type="label">g</arg1>
+                </instruction>
+                <instruction order="6" opcode="RETURN">
+                </instruction>
+                <instruction order="7" opcode="LABEL">
+                    <arg1 type="label">g</arg1>
+                </instruction>
+                <instruction order="8" opcode="RETURN">
+                </instruction>
+                <instruction order="9" opcode="LABEL">
+                    <arg1 type="label">end</arg1>
+                </instruction>
+            </program>"""
+        )
+        program = Program(xml_dom)
+        program.analyze()
+        profiler = CallTreeProfiler()
+        program.interpret(call_profiler=profiler)
+
+        self.assertEqual(profiler.functions['g']['calls'], 2)
+        self.assertEqual(profiler.functions['f']['inclusive_count'], 6)
+        self.assertEqual(profiler.functions['f']['exclusive_count'], 4)
+        self.assertEqual(profiler.functions[CallTreeProfiler.MAIN_NAME]['inclusive_count'], 9)
+
+        output = StringIO()
+        profiler.write_collapsed(output)
+        self.assertEqual(output.getvalue(), '<main> 3\n<main>;f 4\n<main>;f;g 2\n')
+
+        output = StringIO()
+        profiler.write_chrome_trace(output)
+        events = json.loads(output.getvalue())['traceEvents']
+        self.assertEqual([event['name'] for event in events], ['g', 'f', 'g', 'f', '<main>'])
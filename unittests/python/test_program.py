@@ -2,7 +2,9 @@ from unittest.case import TestCase
 
 from classes.python.ipp_parser import IPPParser
 from classes.python.program import Program
+from classes.python.source_parser import SourceParser
 from classes.python.exceptions import *
+from classes.python.frame import Frame
 
 
 class TestProgram(TestCase):
@@ -74,3 +76,189 @@ class TestProgram(TestCase):
             program.interpret
         )
 
+    def test_invalid_literal_operand(self):
+        xml_dom = self.parser.parse_from_string(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="DEFVAR">
+                    <arg1 type="var">GF@x</arg1>
+                </instruction>
+                <instruction order="2" opcode="ADD">
+                    <arg1 type="var">GF@x</arg1>
+                    <arg2 type="int">1</arg2>
+                    <arg3 type="string">a</arg3>
+                </instruction>
+            </program>"""
+        )
+
+        program = Program(xml_dom)
+        program.analyze()
+        self.assertRaises(
+            OperandTypeError,
+            program.interpret
+        )
+        self.assertEqual(program.get_inst_number(), 2)
+
+    def test_uninitialized_operand(self):
+        xml_dom = self.parser.parse_from_string(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="DEFVAR">
+                    <arg1 type="var">GF@x</arg1>
+                </instruction>
+                <instruction order="2" opcode="ADD">
+                    <arg1 type="var">GF@x</arg1>
+                    <arg2 type="var">GF@x</arg2>
+                    <arg3 type="int">1</arg3>
+                </instruction>
+            </program>"""
+        )
+
+        program = Program(xml_dom)
+        program.analyze()
+        self.assertRaises(
+            MissingValue,
+            program.interpret
+        )
+
+    def test_frame_slots(self):
+        xml_dom = self.parser.parse_from_string(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="DEFVAR">
+                    <arg1 type="var">GF@x</arg1>
+                </instruction>
+                <instruction order="2" opcode="CREATEFRAME">
+                </instruction>
+                <instruction order="3" opcode="DEFVAR">
+                    <arg1 type="var">TF@y</arg1>
+                </instruction>
+                <instruction order="4" opcode="PUSHFRAME">
+                </instruction>
+                <instruction order="5" opcode="MOVE">
+                    <arg1 type="var">LF@y</arg1>
+                    <arg2 type="int">1</arg2>
+                </instruction>
+                <instruction order="6" opcode="MOVE">
+                    <arg1 type="var">LF@x</arg1>
+                    <arg2 type="int">1</arg2>
+                </instruction>
+            </program>"""
+        )
+
+        program = Program(xml_dom)
+        program.analyze()
+        self.assertRaises(
+            UndefinedVar,
+            program.interpret
+        )
+        self.assertEqual(program.get_inst_number(), 6)
+
+    def test_fused_compare_jump(self):
+        xml_dom = self.parser.parse_from_string(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="DEFVAR">
+                    <arg1 type="var">GF@x</arg1>
+                </instruction>
+                <instruction order="2" opcode="LT">
+                    <arg1 type="var">GF@x</arg1>
+                    <arg2 type="int">1</arg2>
+                    <arg3 type="int">2</arg3>
+                </instruction>
+                <instruction order="3" opcode="JUMPIFEQ">
+                    <arg1 type="label">end</arg1>
+                    <arg2 type="var">GF@x</arg2>
+                    <arg3 type="bool">true</arg3>
+                </instruction>
+                <instruction order="4" opcode="MOVE">
+                    <arg1 type="var">GF@x</arg1>
+                    <arg2 type="int">1</arg2>
+                </instruction>
+                <instruction order="5" opcode="LABEL">
+                    <arg1 type="label">end</arg1>
+                </instruction>
+            </program>"""
+        )
+
+        program = Program(xml_dom)
+        program.analyze()
+        self.assertEqual(program.get_analysis()[0][1].fused.opcode, 'COMPARE_JUMP')
+        program.interpret()
+        self.assertIs(program.get_frame(Frame.GF)[0].value, True)
+
+    def test_fused_error_number(self):
+        xml_dom = self.parser.parse_from_string(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="PUSHS">
+                    <arg1 type="int">1</arg1>
+                </instruction>
+                <instruction order="2" opcode="POPS">
+                    <arg1 type="var">GF@x</arg1>
+                </instruction>
+            </program>"""
+        )
+
+        program = Program(xml_dom)
+        program.analyze()
+        self.assertEqual(program.get_analysis()[0][0].fused.opcode, 'PUSHS_POPS')
+        self.assertRaises(
+            UndefinedVar,
+            program.interpret
+        )
+        self.assertEqual(program.get_inst_number(), 2)
+        self.assertEqual(program.get_current_inst().opcode, 'POPS')
+
+    def test_unreachable_code_pruned(self):
+        xml_dom = self.parser.parse_from_string(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="JUMP">
+                    <arg1 type="label">end</arg1>
+                </instruction>
+                <instruction order="2" opcode="WRITE">
+                    <arg1 type="string">unreachable</arg1>
+                </instruction>
+                <instruction order="3" opcode="LABEL">
+                    <arg1 type="label">end</arg1>
+                </instruction>
+                <instruction order="4" opcode="LABEL">
+                    <arg1 type="label">end2</arg1>
+                </instruction>
+                <instruction order="5" opcode="IDIV">
+                    <arg1 type="var">GF@x</arg1>
+                    <arg2 type="int">1</arg2>
+                    <arg3 type="int">0</arg3>
+                </instruction>
+            </program>"""
+        )
+
+        program = Program(xml_dom)
+        program.analyze()
+        inst_list = program.get_analysis()[0]
+        self.assertEqual(inst_list[1].opcode, 'NOP')
+        self.assertEqual(inst_list[0].args[0].target, 3)  # Labels are jumped over
+        self.assertRaises(
+            DivisionByZeroError,
+            program.interpret
+        )
+        self.assertEqual(program.get_inst_number(), 5)
+
+    def test_recursive_frame_size(self):
+        source = '\n'.join(['.IPPcode18', 'DEFVAR GF@n', 'MOVE GF@n int@0', 'CALL big', 'CALL rec',
+                            'LABEL big', 'CREATEFRAME', 'PUSHFRAME'] +
+                           ['DEFVAR LF@v{}'.format(i) for i in range(1000)] +
+                           ['POPFRAME', 'RETURN',
+                            'LABEL rec', 'CREATEFRAME', 'PUSHFRAME', 'DEFVAR LF@depth', 'MOVE LF@depth GF@n',
+                            'ADD GF@n GF@n int@1', 'JUMPIFNEQ rec_next GF@n int@100', 'WRITE LF@missing',
+                            'LABEL rec_next', 'CALL rec'])
+
+        program = Program.from_instructions(SourceParser().load_from_string(source))
+        program.analyze()
+        self.assertRaises(
+            UndefinedVar,
+            program.interpret
+        )
+        # Frames of the recursive function do not hold slots of variables defined in the other function
+        self.assertLessEqual(len(program.get_frame(Frame.LF)), 2)
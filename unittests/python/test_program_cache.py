@@ -0,0 +1,97 @@
+from unittest.case import TestCase
+from unittest import mock
+from io import StringIO
+import os
+import tempfile
+import shutil
+import time
+
+from classes.python.ipp_parser import IPPParser
+from classes.python.program import Program
+from classes.python import program_cache
+from classes.python.program_cache import ProgramCache
+
+
+PROGRAM_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<program language="IPPcode18">
+    <instruction order="1" opcode="DEFVAR">
+        <arg1 type="var">GF@x</arg1>
+    </instruction>
+    <instruction order="2" opcode="MOVE">
+        <arg1 type="var">GF@x</arg1>
+        <arg2 type="string">cached\\032value</arg2>
+    </instruction>
+    <instruction order="3" opcode="JUMP">
+        <arg1 type="label">end</arg1>
+    </instruction>
+    <instruction order="4" opcode="WRITE">
+        <arg1 type="string">skipped</arg1>
+    </instruction>
+    <instruction order="5" opcode="LABEL">
+        <arg1 type="label">end</arg1>
+    </instruction>
+    <instruction order="6" opcode="WRITE">
+        <arg1 type="var">GF@x</arg1>
+    </instruction>
+</program>"""
+
+
+class TestProgramCache(TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = ProgramCache(self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def store(self, xml):
+        program = Program.from_instructions(IPPParser().load_from_string(xml))
+        program.analyze()
+        key = self.cache.key(xml)
+        self.cache.store(key, program)
+        return key
+
+    def test_miss(self):
+        self.assertIsNone(self.cache.load(self.cache.key(PROGRAM_XML)))
+
+    def test_roundtrip(self):
+        key = self.store(PROGRAM_XML)
+        program = self.cache.load(key)
+        self.assertIsNotNone(program)
+
+        output = StringIO()
+        program.set_output(output)
+        program.interpret()
+        self.assertEqual(output.getvalue(), 'cached value\n')
+
+    def test_key_depends_on_content(self):
+        self.assertNotEqual(self.cache.key(PROGRAM_XML), self.cache.key(PROGRAM_XML + b' '))
+
+    def test_key_depends_on_analysis_code(self):
+        key = self.cache.key(PROGRAM_XML)
+        with mock.patch.object(program_cache, '_code_digest', b'changed analysis'):
+            self.assertNotEqual(key, self.cache.key(PROGRAM_XML))
+        self.assertEqual(key, self.cache.key(PROGRAM_XML))
+
+    def test_broken_entry(self):
+        key = self.store(PROGRAM_XML)
+        with open(os.path.join(self.cache_dir, key + '.pickle'), 'wb') as file:
+            file.write(b'broken')
+        self.assertIsNone(self.cache.load(key))
+
+    def test_lru_eviction(self):
+        first = self.store(PROGRAM_XML)
+        entry_size = os.path.getsize(os.path.join(self.cache_dir, first + '.pickle'))
+        self.cache = ProgramCache(self.cache_dir, entry_size * 2)
+
+        old_time = time.time() - 100
+        os.utime(os.path.join(self.cache_dir, first + '.pickle'), (old_time, old_time))
+        second = self.store(PROGRAM_XML + b'\n')
+        os.utime(os.path.join(self.cache_dir, second + '.pickle'), (old_time - 10, old_time - 10))
+        self.assertIsNotNone(self.cache.load(first))  # Used recently, second is now least recently used
+
+        third = self.store(PROGRAM_XML + b'\n\n')
+        self.assertIsNotNone(self.cache.load(first))
+        self.assertIsNone(self.cache.load(second))
+        self.assertIsNotNone(self.cache.load(third))
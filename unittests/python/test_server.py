@@ -0,0 +1,57 @@
+from unittest.case import TestCase
+import os
+import signal
+import tempfile
+import time
+
+from classes.python.server import Server, request
+
+PROGRAM = b"""<?xml version="1.0" encoding="UTF-8"?>
+<program language="IPPcode18">
+    <instruction order="1" opcode="DEFVAR">
+        <arg1 type="var">GF@x</arg1>
+    </instruction>
+    <instruction order="2" opcode="READ">
+        <arg1 type="var">GF@x</arg1>
+        <arg2 type="type">string</arg2>
+    </instruction>
+    <instruction order="3" opcode="WRITE">
+        <arg1 type="var">GF@x</arg1>
+    </instruction>
+    <instruction order="4" opcode="POPFRAME">
+    </instruction>
+</program>
+"""
+
+
+class TestServer(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'ipp.sock')
+        self.pid = os.fork()
+        if self.pid == 0:
+            try:
+                Server(self.path, 2).serve_forever()
+            finally:
+                os._exit(0)
+        for _ in range(100):
+            if os.path.exists(self.path):
+                break
+            time.sleep(0.05)
+
+    def tearDown(self):
+        os.kill(self.pid, signal.SIGTERM)
+        os.waitpid(self.pid, 0)
+        self.assertFalse(os.path.exists(self.path))
+        self.dir.cleanup()
+
+    def test_requests(self):
+        for text in ('first', 'second', 'third'):
+            result = request(self.path, PROGRAM, text.encode() + b'\n')
+            self.assertEqual(result.stdout, text.encode() + b'\n')
+            self.assertEqual(result.exit_code, 55)
+            self.assertTrue(result.stderr.startswith('Chyba instukce 4 (POPFRAME)'.encode()))
+
+        result = request(self.path, b'<program', b'')
+        self.assertEqual(result.exit_code, 31)
@@ -0,0 +1,77 @@
+from unittest.case import TestCase
+
+from classes.python.ipp_parser import IPPParser
+from classes.python.source_parser import SourceParser, is_source, load_instructions
+from classes.python.exceptions import SourceError, LexicalError
+
+SOURCE = """.IPPcode18  # header
+# comment only line
+DEFVAR GF@a
+move GF@a int@-5
+  WRITE   string@a\\032b#comment
+JUMPIFEQ end GF@a bool@true
+
+READ GF@a int
+LABEL end
+WRITE string@
+"""
+
+XML = """<?xml version="1.0" encoding="UTF-8"?>
+<program language="IPPcode18">
+    <instruction order="1" opcode="DEFVAR"><arg1 type="var">GF@a</arg1></instruction>
+    <instruction order="2" opcode="MOVE"><arg1 type="var">GF@a</arg1><arg2 type="int">-5</arg2></instruction>
+    <instruction order="3" opcode="WRITE"><arg1 type="string">a\\032b</arg1></instruction>
+    <instruction order="4" opcode="JUMPIFEQ">
+        <arg1 type="label">end</arg1><arg2 type="var">GF@a</arg2><arg3 type="bool">true</arg3>
+    </instruction>
+    <instruction order="5" opcode="READ"><arg1 type="var">GF@a</arg1><arg2 type="type">int</arg2></instruction>
+    <instruction order="6" opcode="LABEL"><arg1 type="label">end</arg1></instruction>
+    <instruction order="7" opcode="WRITE"><arg1 type="string"></arg1></instruction>
+</program>
+"""
+
+
+class TestSourceParser(TestCase):
+    def setUp(self):
+        self.parser = SourceParser()
+
+    @staticmethod
+    def describe(instructions: list) -> list:
+        return [(inst.opcode, inst.order, [(arg.type, arg.value) for arg in inst.args]) for inst in instructions]
+
+    def test_same_as_xml(self):
+        self.assertEqual(self.describe(IPPParser().load_from_string(XML)),
+                         self.describe(self.parser.load_from_string(SOURCE)))
+        self.assertEqual(self.describe(IPPParser().load_from_string(XML)),
+                         self.describe(self.parser.load_from_string(SOURCE.encode())))
+
+    def test_sniff(self):
+        self.assertTrue(is_source(SOURCE))
+        self.assertTrue(is_source(b'\n  .ippcode18\n'))
+        self.assertFalse(is_source(XML.encode()))
+        self.assertFalse(is_source('\ufeff' + XML))
+        self.assertTrue(is_source(b'# comment\n.IPPcode18\n'))
+        self.assertTrue(is_source(b''))
+        with self.assertRaises(SourceError):
+            load_instructions(b'# comment\n.IPPcode18\n')
+        self.assertEqual(7, len(load_instructions(SOURCE.encode())))
+        self.assertEqual(7, len(load_instructions(XML.encode())))
+
+    def test_errors(self):
+        for source in ('', 'DEFVAR GF@a', '.IPPcode17', '.IPPcode18\nFOO', '.IPPcode18\nDEFVAR',
+                       '.IPPcode18\nDEFVAR GF@a GF@b', '.IPPcode18\nDEFVAR int@5', '.IPPcode18\nJUMP GF@a',
+                       '.IPPcode18\nREAD GF@a float', '.IPPcode18\nWRITE bool@True', '.IPPcode18\nWRITE int@',
+                       '.IPPcode18\nWRITE float@1', '.IPPcode18\nWRITE string@a\\1', '.IPPcode18\nWRITE a'):
+            with self.assertRaises(SourceError, msg=source):
+                self.parser.load_from_string(source)
+        with self.assertRaises(SourceError):
+            self.parser.load_from_string(b'.IPPcode18\nWRITE string@\xff')
+
+    def test_int_value(self):
+        with self.assertRaises(LexicalError):
+            self.parser.load_from_string('.IPPcode18\nWRITE int@abc')
+
+    def test_error_line(self):
+        with self.assertRaises(SourceError) as context:
+            self.parser.load_from_string('.IPPcode18\n\nCREATEFRAME\nPOPS')
+        self.assertTrue(context.exception.get_message().startswith('Řádek 4:'))
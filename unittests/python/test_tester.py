@@ -0,0 +1,63 @@
+from unittest.case import TestCase
+import os
+import sys
+import tempfile
+
+from classes.python import tester
+
+INTERPRET = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'interpret.py')
+
+PROGRAM = """<?xml version="1.0" encoding="UTF-8"?>
+<program language="IPPcode18">
+    <instruction order="1" opcode="WRITE">
+        <arg1 type="string">{}</arg1>
+    </instruction>
+</program>
+"""
+
+
+class TestTester(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        # Sources are already XML, parse script only copies them
+        self.parse_script = os.path.join(self.dir.name, 'cat.py')
+        with open(self.parse_script, 'w') as file:
+            file.write('import sys\nsys.stdout.buffer.write(sys.stdin.buffer.read())\n')
+        self.tests = os.path.join(self.dir.name, 'tests')
+        os.makedirs(os.path.join(self.tests, 'sub'))
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def add_test(self, name: str, source: str, out: str = None, rc: str = None):
+        files = {'src': source, 'out': out, 'rc': rc}
+        for extension, content in files.items():
+            if content is not None:
+                with open(os.path.join(self.tests, '{}.{}'.format(name, extension)), 'w') as file:
+                    file.write(content)
+
+    def test_run_tests(self):
+        self.add_test('ok', PROGRAM.format('hello'), 'hello\n')
+        self.add_test('sub/diff', PROGRAM.format('hello'), 'world\n')
+        self.add_test('sub/rc', PROGRAM.format('hello'), 'hello\n', '52\n')
+        self.add_test('xml_error', '<program', rc='31')
+        self.add_test('sub/bad_rc', PROGRAM.format('hello'), 'hello\n', 'zero\n')
+
+        sources = tester.find_tests(self.tests, True)
+        self.assertEqual(len(sources), 5)
+        self.assertEqual(len(tester.find_tests(self.tests)), 2)
+
+        tests = [tester.TestCase(source, self.tests) for source in sources]
+        self.assertTrue(os.path.exists(os.path.join(self.tests, 'ok.rc')))
+        config = tester.TesterConfig(self.parse_script, INTERPRET, sys.executable)
+        results = {result.name: result for result in tester.run_tests(tests, config, 2)}
+
+        self.assertFalse(results['ok'].has_error())
+        self.assertEqual(results[os.path.join('sub', 'diff')].error['type'], tester.TestResult.ERROR_OUT_DIFF)
+        self.assertEqual(results[os.path.join('sub', 'diff')].error['details']['diff'], '1c1\n< world\n---\n> hello')
+        self.assertEqual(results[os.path.join('sub', 'rc')].error['details'], {'expected': 52, 'actual': 0})
+        self.assertFalse(results['xml_error'].has_error())
+        self.assertEqual(results[os.path.join('sub', 'bad_rc')].error,
+                         {'type': tester.TestResult.ERROR_INT_RETURN_CODE, 'details': {'expected': 'zero', 'actual': 0},
+                          'stderr': ''})
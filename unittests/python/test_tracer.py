@@ -0,0 +1,60 @@
+from unittest.case import TestCase
+from io import StringIO
+
+from classes.python.ipp_parser import IPPParser
+from classes.python.program import Program
+from classes.python.tracer import ExecutionTrace
+from classes.python.exceptions import *
+
+
+class TestTracer(TestCase):
+
+    def setUp(self):
+        self.parser = IPPParser()
+
+    def test_error_trace(self):
+        xml_dom = self.parser.parse_from_string(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="DEFVAR">
+                    <arg1 type="var">GF@i</arg1>
+                </instruction>
+                <instruction order="2" opcode="MOVE">
+                    <arg1 type="var">GF@i</arg1>
+                    <arg2 type="int">0</arg2>
+                </instruction>
+                <instruction order="3" opcode="LABEL">
+                    <arg1 type="label">loop</arg1>
+                </instruction>
+                <instruction order="4" opcode="ADD">
+                    <arg1 type="var">GF@i</arg1>
+                    <arg2 type="var">GF@i</arg2>
+                    <arg3 type="int">1</arg3>
+                </instruction>
+                <instruction order="5" opcode="JUMPIFNEQ">
+                    <arg1 type="label">loop</arg1>
+                    <arg2 type="var">GF@i</arg2>
+                    <arg3 type="int">3</arg3>
+                </instruction>
+                <instruction order="6" opcode="IDIV">
+                    <arg1 type="var">GF@i</arg1>
+                    <arg2 type="var">GF@i</arg2>
+                    <arg3 type="int">0</arg3>
+                </instruction>
+            </program>"""
+        )
+        program = Program(xml_dom)
+        program.analyze()
+        trace = ExecutionTrace(4)
+        self.assertRaises(
+            DivisionByZeroError,
+            program.interpret,
+            trace=trace
+        )
+        self.assertEqual([inst.order for inst in trace.entries(program)], [5, 4, 5, 6])
+
+        output = StringIO()
+        trace.write(output, program)
+        lines = output.getvalue().splitlines()
+        self.assertEqual([line.split() for line in lines[1:-1]], [['5', 'JUMPIFNEQ'], ['4', 'ADD'], ['5', 'JUMPIFNEQ']])
+        self.assertEqual(lines[-1].split(), ['6', 'IDIV', 'GF@i:', '3', '(int),', 'GF@i:', '3', '(int),', '0', '(int)'])
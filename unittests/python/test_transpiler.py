@@ -0,0 +1,134 @@
+from unittest.case import TestCase
+from io import StringIO
+
+from classes.python.ipp_parser import IPPParser
+from classes.python.program import Program
+from classes.python.transpiler import Transpiler
+from classes.python.exceptions import *
+
+
+class TestTranspiler(TestCase):
+
+    def setUp(self):
+        self.parser = IPPParser()
+
+    def run_program(self, xml_string):
+        program = Program(self.parser.parse_from_string(xml_string))
+        program.analyze()
+        output = StringIO()
+        program.set_output(output)
+        Transpiler(program).compile()()
+        return program, output.getvalue()
+
+    def test_loop(self):
+        program, output = self.run_program(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="DEFVAR">
+                    <arg1 type="var">GF@i</arg1>
+                </instruction>
+                <instruction order="2" opcode="MOVE">
+                    <arg1 type="var">GF@i</arg1>
+                    <arg2 type="int">0</arg2>
+                </instruction>
+                <instruction order="3" opcode="LABEL">
+                    <arg1 type="label">loop</arg1>
+                </instruction>
+                <instruction order="4" opcode="ADD">
+                    <arg1 type="var">GF@i</arg1>
+                    <arg2 type="var">GF@i</arg2>
+                    <arg3 type="int">1</arg3>
+                </instruction>
+                <instruction order="5" opcode="WRITE">
+                    <arg1 type="var">GF@i</arg1>
+                </instruction>
+                <instruction order="6" opcode="JUMPIFNEQ">
+                    <arg1 type="label">loop</arg1>
+                    <arg2 type="var">GF@i</arg2>
+                    <arg3 type="int">3</arg3>
+                </instruction>
+            </program>"""
+        )
+        self.assertEqual(output, '1\n2\n3\n')
+        self.assertEqual(program.get_var(program.get_analysis()[0][0].args[0]).value, 3)
+
+    def test_local_frame(self):
+        program, output = self.run_program(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="DEFVAR">
+                    <arg1 type="var">GF@x</arg1>
+                </instruction>
+                <instruction order="2" opcode="CREATEFRAME">
+                </instruction>
+                <instruction order="3" opcode="DEFVAR">
+                    <arg1 type="var">TF@y</arg1>
+                </instruction>
+                <instruction order="4" opcode="MOVE">
+                    <arg1 type="var">TF@y</arg1>
+                    <arg2 type="string">local</arg2>
+                </instruction>
+                <instruction order="5" opcode="MOVE">
+                    <arg1 type="var">GF@x</arg1>
+                    <arg2 type="var">TF@y</arg2>
+                </instruction>
+                <instruction order="6" opcode="WRITE">
+                    <arg1 type="var">GF@x</arg1>
+                </instruction>
+            </program>"""
+        )
+        self.assertEqual(output, 'local\n')
+
+    def test_error_number(self):
+        xml_dom = self.parser.parse_from_string(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="DEFVAR">
+                    <arg1 type="var">GF@x</arg1>
+                </instruction>
+                <instruction order="2" opcode="WRITE">
+                    <arg1 type="string">before</arg1>
+                </instruction>
+                <instruction order="3" opcode="SUB">
+                    <arg1 type="var">GF@x</arg1>
+                    <arg2 type="var">GF@x</arg2>
+                    <arg3 type="int">1</arg3>
+                </instruction>
+            </program>"""
+        )
+        program = Program(xml_dom)
+        program.analyze()
+        output = StringIO()
+        program.set_output(output)
+        self.assertRaises(
+            MissingValue,
+            Transpiler(program).compile()
+        )
+        self.assertEqual(program.get_inst_number(), 3)
+        self.assertEqual(output.getvalue(), 'before\n')
+
+    def test_jump_string_operand(self):
+        for opcode in ('JUMP', 'CALL'):
+            with self.assertRaises(OperandTypeError):
+                self.run_program(
+                    """<?xml version="1.0" encoding="UTF-8"?>
+                    <program language="IPPcode18">
+                        <instruction order="1" opcode="{}">
+                            <arg1 type="string">foo</arg1>
+                        </instruction>
+                        <instruction order="2" opcode="LABEL">
+                            <arg1 type="label">foo</arg1>
+                        </instruction>
+                    </program>""".format(opcode)
+                )
+
+    def test_defvar_literal_operand(self):
+        with self.assertRaises(OperandTypeError):
+            self.run_program(
+                """<?xml version="1.0" encoding="UTF-8"?>
+                <program language="IPPcode18">
+                    <instruction order="1" opcode="DEFVAR">
+                        <arg1 type="int">3</arg1>
+                    </instruction>
+                </program>"""
+            )
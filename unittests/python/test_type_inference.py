@@ -0,0 +1,126 @@
+from unittest.case import TestCase
+
+from classes.python.ipp_parser import IPPParser
+from classes.python.program import Program
+from classes.python.exceptions import *
+
+
+class TestTypeInference(TestCase):
+
+    def setUp(self):
+        self.parser = IPPParser()
+
+    def analyze(self, xml_string):
+        program = Program(self.parser.parse_from_string(xml_string))
+        program.analyze()
+        return program
+
+    def test_loop_counter_proven(self):
+        program = self.analyze(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="DEFVAR">
+                    <arg1 type="var">GF@i</arg1>
+                </instruction>
+                <instruction order="2" opcode="MOVE">
+                    <arg1 type="var">GF@i</arg1>
+                    <arg2 type="int">0</arg2>
+                </instruction>
+                <instruction order="3" opcode="LABEL">
+                    <arg1 type="label">loop</arg1>
+                </instruction>
+                <instruction order="4" opcode="ADD">
+                    <arg1 type="var">GF@i</arg1>
+                    <arg2 type="var">GF@i</arg2>
+                    <arg3 type="int">1</arg3>
+                </instruction>
+                <instruction order="5" opcode="JUMPIFNEQ">
+                    <arg1 type="label">loop</arg1>
+                    <arg2 type="var">GF@i</arg2>
+                    <arg3 type="int">10</arg3>
+                </instruction>
+            </program>"""
+        )
+        self.assertEqual(program._inst_list[3].proven_args, {1})
+        self.assertEqual(program._inst_list[4].proven_args, {1})
+
+    def test_conflicting_paths_not_proven(self):
+        program = self.analyze(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="DEFVAR">
+                    <arg1 type="var">GF@x</arg1>
+                </instruction>
+                <instruction order="2" opcode="MOVE">
+                    <arg1 type="var">GF@x</arg1>
+                    <arg2 type="int">0</arg2>
+                </instruction>
+                <instruction order="3" opcode="LABEL">
+                    <arg1 type="label">loop</arg1>
+                </instruction>
+                <instruction order="4" opcode="ADD">
+                    <arg1 type="var">GF@x</arg1>
+                    <arg2 type="var">GF@x</arg2>
+                    <arg3 type="int">1</arg3>
+                </instruction>
+                <instruction order="5" opcode="MOVE">
+                    <arg1 type="var">GF@x</arg1>
+                    <arg2 type="string">a</arg2>
+                </instruction>
+                <instruction order="6" opcode="JUMP">
+                    <arg1 type="label">loop</arg1>
+                </instruction>
+            </program>"""
+        )
+        self.assertEqual(program._inst_list[3].proven_args, set())
+        self.assertRaises(
+            OperandTypeError,
+            program.interpret
+        )
+        self.assertEqual(program.get_inst_number(), 4)
+
+    def test_frames_forgotten(self):
+        program = self.analyze(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <program language="IPPcode18">
+                <instruction order="1" opcode="CREATEFRAME">
+                </instruction>
+                <instruction order="2" opcode="DEFVAR">
+                    <arg1 type="var">TF@x</arg1>
+                </instruction>
+                <instruction order="3" opcode="MOVE">
+                    <arg1 type="var">TF@x</arg1>
+                    <arg2 type="int">1</arg2>
+                </instruction>
+                <instruction order="4" opcode="PUSHFRAME">
+                </instruction>
+                <instruction order="5" opcode="WRITE">
+                    <arg1 type="var">LF@x</arg1>
+                </instruction>
+                <instruction order="6" opcode="CREATEFRAME">
+                </instruction>
+                <instruction order="7" opcode="PUSHFRAME">
+                </instruction>
+                <instruction order="8" opcode="WRITE">
+                    <arg1 type="var">LF@x</arg1>
+                </instruction>
+            </program>"""
+        )
+        self.assertEqual(program._inst_list[4].proven_args, {0})
+        self.assertEqual(program._inst_list[7].proven_args, set())
+
+    def test_literal_destination(self):
+        for instruction in ('<instruction order="1" opcode="ADD"><arg1 type="int">1</arg1>'
+                            '<arg2 type="int">2</arg2><arg3 type="int">3</arg3></instruction>',
+                            '<instruction order="1" opcode="MOVE"><arg1 type="int">1</arg1>'
+                            '<arg2 type="int">2</arg2></instruction>',
+                            '<instruction order="1" opcode="POPS"><arg1 type="int">1</arg1></instruction>'):
+            program = self.analyze(
+                """<?xml version="1.0" encoding="UTF-8"?>
+                <program language="IPPcode18">
+                    <instruction order="0" opcode="PUSHS"><arg1 type="int">1</arg1></instruction>
+                    {}
+                </program>""".format(instruction)
+            )
+            with self.assertRaises(OperandTypeError):
+                program.interpret()